@@ -9,6 +9,7 @@ import sys
 import time
 import logging
 from pathlib import Path
+from typing import Optional
 
 import streamlit as st
 
@@ -17,8 +18,10 @@ load_dotenv()
 ROOT = Path(__file__).resolve().parent
 sys.path.append(str(ROOT))
 
+from src.agents.calibration import Calibrator, get_calibrator  # noqa: E402
 from src.config import init_data_dirs, settings  # noqa: E402
 from src.graph.workflow import run_workflow       # noqa: E402
+from src.rag.store_manager import StoreManager    # noqa: E402
 from ui_components import (                       # noqa: E402
     inject_custom_css,
     render_header,
@@ -29,6 +32,8 @@ from ui_components import (                       # noqa: E402
     render_loading_skeleton,
     render_metrics,
     render_tabs,
+    render_store_status,
+    render_dashboard,
 )
 
 # ── Initialisation ──────────────────────────────────────────────────────────
@@ -55,6 +60,45 @@ if not logging.getLogger().handlers:
         ],
     )
 
+# ── Store warm-up ───────────────────────────────────────────────────────────
+@st.cache_resource(show_spinner=False)
+def _warm_stores() -> StoreManager:
+    """Start the store warm-up once per Streamlit server process."""
+    return StoreManager().warmup(background=True)
+
+
+stores = _warm_stores()
+
+
+@st.cache_resource(show_spinner=False)
+def _load_calibrator() -> Optional[Calibrator]:
+    """Load the confidence calibration artifact once per Streamlit server process."""
+    return get_calibrator()
+
+
+_load_calibrator()
+
+
+@st.cache_resource(show_spinner=False)
+def _start_metrics() -> bool:
+    """Expose the Prometheus endpoint once per Streamlit server process."""
+    if not settings.get("metrics", {}).get("enabled", False):
+        return False
+    from src.observability.metrics import start_metrics_server
+
+    return start_metrics_server() is not None
+
+
+_start_metrics()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _dashboard_stats() -> dict:
+    from src.analytics.eval_stats import compute_stats
+
+    return compute_stats(include_jsonl=True)
+
+
 # ── Session state defaults ──────────────────────────────────────────────────
 if "run_status" not in st.session_state:
     st.session_state["run_status"] = "idle"
@@ -74,71 +118,78 @@ inject_custom_css()
 render_header()
 
 provider, model = render_config(settings)
-render_predefined_prompts()
-question, run_pressed = render_query_input()
+render_store_status(stores.readiness())
+tab_verify, tab_dashboard = st.tabs(["Verify", "Dashboard"])
 
-# Status area (inline, no container wrapper)
-render_status(None)
+with tab_dashboard:
+    render_dashboard(_dashboard_stats())
 
-# ── Execute workflow (start on button press, run on subsequent rerun) ─────
-if run_pressed and question.strip():
-    logging.info(
-        f"User Question: {question.strip()} | Provider: {provider} | Model: {model}"
-    )
-    # Mark running and request a rerun so the header/status updates immediately
-    st.session_state["run_status"] = "running"
-    st.session_state["run_step"] = 0
-    st.session_state["last_result"] = None
-    st.session_state["last_elapsed"] = 0.0
-    st.session_state["_start_run"] = True
-    st.rerun()
-
-# Actual workflow execution happens when `_start_run` is set. This lets the
-# UI render the "running" state first, then perform the long-running LLM call
-# on the next script run so the status indicator is visible during execution.
-if st.session_state.get("_start_run", False):
-    # clear the flag immediately to avoid repeated execution
-    st.session_state["_start_run"] = False
-    try:
-        t0 = time.perf_counter()
-        result = run_workflow(
-            question.strip(),
-            llm_provider=provider,
-            llm_model=model,
-        )
-        elapsed = time.perf_counter() - t0
+with tab_verify:
+    render_predefined_prompts()
+    question, run_pressed = render_query_input()
 
-        st.session_state["run_status"] = "success"
-        st.session_state["run_step"] = 5
-        st.session_state["last_result"] = result
-        st.session_state["last_elapsed"] = elapsed
+    # Status area (inline, no container wrapper)
+    render_status(None)
 
-        logging.info(f"Response time: {elapsed:.2f}s")
+    # ── Execute workflow (start on button press, run on subsequent rerun) ─────
+    if run_pressed and question.strip():
+        logging.info(
+            f"User Question: {question.strip()} | Provider: {provider} | Model: {model}"
+        )
+        # Mark running and request a rerun so the header/status updates immediately
+        st.session_state["run_status"] = "running"
+        st.session_state["run_step"] = 0
+        st.session_state["last_result"] = None
+        st.session_state["last_elapsed"] = 0.0
+        st.session_state["_start_run"] = True
         st.rerun()
 
-    except Exception as e:
-        st.session_state["run_status"] = "failed"
-        logging.error(f"Workflow error: {e}")
-        st.error(f"Error: {e}")
-        st.exception(e)
-
-# ── Display results ─────────────────────────────────────────────────────────
-result = st.session_state.get("last_result")
-
-if result:
-    final = result.get("final_result", {})
-    render_metrics(final)
-    render_tabs(result)
-elif st.session_state.get("run_status") == "running":
-    render_loading_skeleton()
-else:
-    st.markdown("""
-    <div class="ui-card" style="text-align:center; padding:40px;">
-        <div style="font-size:1.1rem; color:#5a5e70; font-weight:500;">
-            Enter a question above and click <b style="color:#4A90D9;">⏵ Run</b> to start verification
-        </div>
-        <div style="font-size:0.75rem; color:#3a3d4a; margin-top:8px;">
-            The meta-agent will break the LLM response into claims and verify each against the IPC–BNS knowledge base.
+    # Actual workflow execution happens when `_start_run` is set. This lets the
+    # UI render the "running" state first, then perform the long-running LLM call
+    # on the next script run so the status indicator is visible during execution.
+    if st.session_state.get("_start_run", False):
+        # clear the flag immediately to avoid repeated execution
+        st.session_state["_start_run"] = False
+        try:
+            t0 = time.perf_counter()
+            result = run_workflow(
+                question.strip(),
+                llm_provider=provider,
+                llm_model=model,
+            )
+            elapsed = time.perf_counter() - t0
+
+            st.session_state["run_status"] = "success"
+            st.session_state["run_step"] = 5
+            st.session_state["last_result"] = result
+            st.session_state["last_elapsed"] = elapsed
+
+            logging.info(f"Response time: {elapsed:.2f}s")
+            st.rerun()
+
+        except Exception as e:
+            st.session_state["run_status"] = "failed"
+            logging.error(f"Workflow error: {e}")
+            st.error(f"Error: {e}")
+            st.exception(e)
+
+    # ── Display results ─────────────────────────────────────────────────────────
+    result = st.session_state.get("last_result")
+
+    if result:
+        final = result.get("final_result", {})
+        render_metrics(final)
+        render_tabs(result)
+    elif st.session_state.get("run_status") == "running":
+        render_loading_skeleton()
+    else:
+        st.markdown("""
+        <div class="ui-card" style="text-align:center; padding:40px;">
+            <div style="font-size:1.1rem; color:#5a5e70; font-weight:500;">
+                Enter a question above and click <b style="color:#4A90D9;">⏵ Run</b> to start verification
+            </div>
+            <div style="font-size:0.75rem; color:#3a3d4a; margin-top:8px;">
+                The meta-agent will break the LLM response into claims and verify each against the IPC–BNS knowledge base.
+            </div>
         </div>
-    </div>
-    """, unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
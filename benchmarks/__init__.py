@@ -0,0 +1,15 @@
+"""
+Offline performance benchmarks.
+
+Everything here runs without network access or API keys: the chat model
+is ``src.offline.ScriptedChatModel``, embeddings are
+``src.offline.HashingEmbeddings`` and all writes (eval log, review queue,
+Chroma index) go to a scratch directory. Each script writes a JSON result
+file under ``benchmarks/results/`` tagged with the git commit, so runs
+from different commits can be diffed.
+
+    python -m benchmarks.bench_workflow --concurrency 1,4,16 --requests 64
+    python -m benchmarks.bench_verifier
+    python -m benchmarks.load_test --concurrency 1,8,32 --quota gemini-2.5-flash=300
+    python -m benchmarks.compare <old.json> <new.json>
+"""
@@ -0,0 +1,163 @@
+"""
+Section extraction: legacy ``SECTION_RE`` vs ``src.rag.sections``.
+
+Runs both extractors over a corpus of answers and claims and reports, per
+extractor, how many texts yield a section, how many of those resolve to a
+row in the mapping table (what the verifier can check relationally
+instead of leaving to the vector store), and the cost per text.
+
+The corpus is every stored answer and claim found in the legacy review
+JSONL, the review queue and the evaluation log, plus ``VARIANT_CLAIMS``:
+the seed mappings written in each citation style seen in answers
+("u/s 302 IPC", "s. 302", "§302", "Sec. 120-B", "धारा ३०२", …), so the
+run is meaningful on a fresh checkout too. ``--corpus`` adds any JSONL
+with ``llm_answer`` / ``claims`` / ``answer`` fields.
+
+    python -m benchmarks.bench_sections
+    python -m benchmarks.bench_sections --corpus data/eval_log.jsonl --repeat 7
+"""
+
+import argparse
+import logging
+import re
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import orjson
+
+from benchmarks.bench_verifier import SEED_ROWS, memory_relational_store, time_per_call
+from benchmarks.harness import RESULTS_DIR, write_results
+from src.agents.utils import extract_text
+from src.config import paths
+from src.rag.sections import IPC, extract_sections
+from src.storage.review_queue import get_review_queue
+
+# The verifier's pattern before src.rag.sections.
+LEGACY_SECTION_RE = re.compile(r"(?:IPC|BNS)?\s*Section\s*(\d+[A-Z]?)", re.IGNORECASE)
+
+_DEVANAGARI = str.maketrans("0123456789", "०१२३४५६७८९")
+_VARIANT_TEMPLATES = [
+    "IPC Section {ipc} corresponds to BNS Section {bns}.",
+    "An offence u/s {ipc} IPC is now punishable under s. {bns} BNS.",
+    "s. {ipc} of the Indian Penal Code is replaced by s. {bns} of the Bharatiya Nyaya Sanhita.",
+    "§{ipc} IPC → §{bns} BNS.",
+    "Sec. {ipc_hyphen} IPC now maps to Sec. {bns} BNS.",
+    "{ipc} IPC ({notes}) is {bns} BNS.",
+    "IPC {ipc} is now BNS {bns}.",
+    "Under the BNS, {notes} falls under Section {bns}; it was Section {ipc} of the IPC.",
+    "भारतीय दंड संहिता की धारा {ipc_hi} अब भारतीय न्याय संहिता की धारा {bns_hi} है।",
+    "आईपीसी धारा {ipc} = बीएनएस धारा {bns}",
+]
+
+
+def _hyphenate(section: str) -> str:
+    return re.sub(r"(\d)([A-Z])$", r"\1-\2", section)
+
+
+VARIANT_CLAIMS = [
+    t.format(
+        ipc=ipc, bns=bns, notes=notes.lower(), ipc_hyphen=_hyphenate(ipc),
+        ipc_hi=ipc.translate(_DEVANAGARI), bns_hi=bns.translate(_DEVANAGARI),
+    )
+    for ipc, bns, notes in SEED_ROWS
+    for t in _VARIANT_TEMPLATES
+]
+
+
+def legacy_extract(text: str) -> List[str]:
+    return list(dict.fromkeys(m.group(1) for m in LEGACY_SECTION_RE.finditer(text)))
+
+
+def new_extract(text: str) -> List[str]:
+    return extract_sections(text, IPC)
+
+
+# ── Corpus ───────────────────────────────────────────────────────────────────
+
+
+def _texts(rec: Dict[str, Any]) -> Iterator[str]:
+    for key in ("llm_answer", "answer"):
+        if rec.get(key):
+            yield extract_text(rec[key])
+    for claim in rec.get("claims") or []:
+        yield claim
+    for v in rec.get("verifications") or []:
+        if v.get("claim"):
+            yield v["claim"]
+
+
+def _jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+    except FileNotFoundError:
+        return
+
+
+def load_corpus(extra: List[str]) -> Dict[str, List[str]]:
+    """Stored answers and claims (de-duplicated), plus the alias variants."""
+    stored: List[str] = []
+    for path in [paths.HUMAN_REVIEW_QUEUE, paths.EVAL_LOG, *extra]:
+        for rec in _jsonl(path):
+            stored.extend(_texts(rec))
+    for item in get_review_queue().iter_items(include_payload=True):
+        stored.extend(_texts(item))
+    return {"stored": list(dict.fromkeys(t for t in stored if t)), "variants": VARIANT_CLAIMS}
+
+
+# ── Measurement ──────────────────────────────────────────────────────────────
+
+
+def measure(
+    extract: Callable[[str], List[str]], texts: List[str], known: set, number: int, repeat: int
+) -> Dict[str, Any]:
+    found = [extract(t) for t in texts]
+    with_section = sum(1 for s in found if s)
+    resolved = sum(1 for s in found if s and s[0] in known)
+    return {
+        "texts": len(texts),
+        "with_section": with_section,
+        "resolved": resolved,
+        "resolved_share": round(resolved / len(texts), 3) if texts else None,
+        **(time_per_call(extract, texts, number, repeat) if texts else {}),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Section extraction benchmark (legacy regex vs alias index).")
+    parser.add_argument("--corpus", action="append", default=[], help="Extra JSONL of answers/claims.")
+    parser.add_argument("--number", type=int, default=20, help="Passes over the corpus per sample.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    rel = memory_relational_store()
+    known = set(rel.get_many_by_ipc([ipc for ipc, _, _ in SEED_ROWS]))
+    rel.close()
+
+    corpus = load_corpus(args.corpus)
+    result: Dict[str, Any] = {"config": vars(args), "corpus": {}}
+    for name, texts in corpus.items():
+        result["corpus"][name] = {
+            "legacy": measure(legacy_extract, texts, known, args.number, args.repeat),
+            "sections": measure(new_extract, texts, known, args.number, args.repeat),
+        }
+    path = write_results("sections", result, args.out)
+    for name, rows in result["corpus"].items():
+        for extractor, row in rows.items():
+            if not row["texts"]:
+                print(f"[bench_sections] {name:<8} {extractor:<8} (empty)")
+                continue
+            print(f"[bench_sections] {name:<8} {extractor:<8} {row['with_section']:>4}/{row['texts']} with a section, "
+                  f"{row['resolved']:>4} resolved in the mapping table, {row['best_ns']:>8.0f} ns/text")
+    print(f"[bench_sections] results → {path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Micro-benchmarks for the verifier's per-claim hot path.
+
+Measures ``_extract_sections``, ``_score_relational``, ``_score_vector``
+and ``_fuse`` in isolation, then ``verifier_node`` end to end at 1, 10,
+100 and 1000 claims. The relational store is the real
+``IPCBNSRelationalStore`` over an in-memory SQLite database seeded like
+``src/rag/seed_db.py``; the vector store is a stub returning canned hits
+(no embeddings), so the numbers are pure verifier cost.
+
+Timings are timeit-style (GC disabled, best of ``--repeat``); allocations
+are tracemalloc peak bytes and retained blocks. Compare two runs with
+``python -m benchmarks.compare``.
+
+    python -m benchmarks.bench_verifier
+    python -m benchmarks.bench_verifier --sizes 1,10,100,1000,10000 --repeat 7
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.harness import RESULTS_DIR, write_results
+from src.agents.verifier import (
+    _extract_sections,
+    _fuse,
+    _score_relational,
+    _score_vector,
+    verifier_node,
+)
+from src.offline import _stable_hash
+from src.rag.store_manager import StoreManager
+from src.rag.vectorstore import IPCBNSRelationalStore
+
+SEED_ROWS = [
+    ("302", "101", "Murder"),
+    ("307", "109", "Attempt to murder"),
+    ("376", "64", "Rape"),
+    ("379", "303", "Theft"),
+    ("420", "318", "Cheating"),
+    ("499", "356", "Defamation"),
+    ("120B", "61", "Criminal conspiracy"),
+    ("143", "189", "Unlawful assembly"),
+]
+
+# Claim shapes seen in practice: correct / wrong / unknown mappings,
+# section-free statements and a long multi-section sentence.
+_TEMPLATES = [
+    "IPC Section {ipc} corresponds to BNS Section {bns}.",
+    "Under the BNS, IPC Section {ipc} is now BNS Section 999.",
+    "IPC Section 9{ipc} has no direct BNS counterpart.",
+    "The BNS replaced the IPC with effect from 1 July 2024.",
+    "IPC Section {ipc} ({notes}) was renumbered as BNS Section {bns}, and the punishment "
+    "under Section {ipc} remains the same as before, subject to Section 34 on common intention.",
+]
+
+
+def make_claims(n: int) -> List[str]:
+    """Deterministic mix of ``n`` claims cycling through ``_TEMPLATES``."""
+    claims = []
+    for i in range(n):
+        ipc, bns, notes = SEED_ROWS[i % len(SEED_ROWS)]
+        claims.append(_TEMPLATES[i % len(_TEMPLATES)].format(ipc=ipc, bns=bns, notes=notes))
+    return claims
+
+
+def memory_relational_store() -> IPCBNSRelationalStore:
+    """``IPCBNSRelationalStore`` on in-memory SQLite, seeded like seed_db."""
+    store = IPCBNSRelationalStore(":memory:")
+    for ipc, bns, notes in SEED_ROWS:
+        store.upsert_mapping(ipc, bns, notes)
+    return store
+
+
+class StubVectorStore:
+    """Returns three canned hits per query; relevance varies by query hash."""
+
+    _TEXTS = [
+        f"IPC Section {ipc} ({notes}) corresponds to BNS Section {bns}. " * 8
+        for ipc, bns, notes in SEED_ROWS
+    ]
+
+    def query(self, query: str, k: int = 5) -> List[Tuple[str, Dict[str, Any], float]]:
+        h = _stable_hash(query)
+        dist = (h % 100) / 100.0  # spreads claims over all three status bands
+        return [
+            (self._TEXTS[(h + j) % len(self._TEXTS)], {"page": j}, dist + 0.05 * j)
+            for j in range(k)
+        ]
+
+    def close(self) -> None:
+        pass
+
+
+# ── Measurement ──────────────────────────────────────────────────────────────
+
+
+def time_per_call(fn: Callable[[Any], Any], inputs: Sequence[Any], number: int, repeat: int) -> Dict[str, float]:
+    """ns per call over ``number`` passes of ``inputs``; best and median of ``repeat``."""
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter_ns()
+            for _ in range(number):
+                for x in inputs:
+                    fn(x)
+            samples.append((time.perf_counter_ns() - t0) / (number * len(inputs)))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {"best_ns": round(min(samples), 1), "median_ns": round(statistics.median(samples), 1)}
+
+
+def allocations(fn: Callable[[Any], Any], inputs: Sequence[Any]) -> Dict[str, float]:
+    """tracemalloc peak bytes for one pass and blocks still live afterwards."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    results = [fn(x) for x in inputs]
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del results
+    blocks = sum(s.count_diff for s in after.compare_to(before, "filename"))
+    return {
+        "peak_bytes_per_call": round((peak - base) / len(inputs), 1),
+        "live_blocks_per_call": round(blocks / len(inputs), 2),
+    }
+
+
+def bench_functions(number: int, repeat: int) -> Dict[str, Any]:
+    rel, vec = memory_relational_store(), StubVectorStore()
+    claims = make_claims(len(_TEMPLATES) * len(SEED_ROWS))
+    pairs = [(_score_relational(c, rel), _score_vector(c, vec)) for c in claims]
+
+    cases: Dict[str, Tuple[Callable[[Any], Any], Sequence[Any]]] = {
+        "_extract_sections": (_extract_sections, claims),
+        "_score_relational": (lambda c: _score_relational(c, rel), claims),
+        "_score_vector": (lambda c: _score_vector(c, vec), claims),
+        "_fuse": (lambda p: _fuse(*p), pairs),
+    }
+    out = {}
+    for name, (fn, inputs) in cases.items():
+        out[name] = {
+            "inputs": len(inputs),
+            **time_per_call(fn, inputs, number, repeat),
+            **allocations(fn, inputs),
+        }
+    rel.close()
+    return out
+
+
+def bench_verifier_node(sizes: Sequence[int], repeat: int) -> List[Dict[str, Any]]:
+    stores = StoreManager()
+    stores.close()
+    stores.install(relational=memory_relational_store(), vector=StubVectorStore())
+    rows = []
+    try:
+        for n in sizes:
+            state = {"route": "verify", "claims": make_claims(n)}
+            samples = []
+            for _ in range(repeat):
+                t0 = time.perf_counter_ns()
+                asyncio.run(verifier_node(state))
+                samples.append(time.perf_counter_ns() - t0)
+
+            gc.collect()
+            tracemalloc.start()
+            asyncio.run(verifier_node(state))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            best = min(samples)
+            rows.append({
+                "claims": n,
+                "best_ms": round(best / 1e6, 3),
+                "median_ms": round(statistics.median(samples) / 1e6, 3),
+                "per_claim_us": round(best / n / 1e3, 2),
+                "peak_kib": round(peak / 1024, 1),
+            })
+    finally:
+        stores.close()
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Verifier micro-benchmarks.")
+    parser.add_argument("--number", type=int, default=50, help="Passes over the claim corpus per sample.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sizes", default="1,10,100,1000", help="Claim counts for verifier_node.")
+    parser.add_argument("--out", default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    result = {
+        "functions": bench_functions(args.number, args.repeat),
+        "verifier_node": bench_verifier_node(sizes, args.repeat),
+        "config": vars(args),
+    }
+    path = write_results("verifier", result, args.out)
+    for name, row in result["functions"].items():
+        print(f"[bench_verifier] {name:<18} {row['best_ns']:>10.0f} ns/call "
+              f"{row['peak_bytes_per_call']:>8.0f} B peak/call")
+    for row in result["verifier_node"]:
+        print(f"[bench_verifier] verifier_node n={row['claims']:<5} {row['best_ms']:>9.3f} ms "
+              f"({row['per_claim_us']} µs/claim, peak {row['peak_kib']} KiB)")
+    print(f"[bench_verifier] results → {path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+End-to-end benchmark of the verification graph.
+
+Runs ``_run_workflow_async`` against the scripted offline model and
+reports, as JSON:
+
+* ``latency``     – end-to-end and per-node latency (from
+                    ``metadata["nodes"]``) for sequential runs;
+* ``throughput``  – requests/s and latency percentiles at each
+                    concurrency level (one event loop, N in flight);
+* ``memory``      – tracemalloc peak per request, retained growth over
+                    a batch of runs, and process max RSS.
+
+Request coalescing is off so repeated questions each run the graph;
+``--coalescing`` measures with it on. The mode is recorded as
+``config.coalescing``.
+
+    python -m benchmarks.bench_workflow
+    python -m benchmarks.bench_workflow --llm-latency 0.2 --concurrency 1,8,32 --requests 128
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import resource
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from benchmarks.harness import QUESTIONS, RESULTS_DIR, offline_environment, summarize, write_results
+from src.graph.workflow import _run_workflow_async
+
+PROVIDER = "offline"
+MODEL = "offline-scripted"
+
+
+async def _run(question: str) -> Dict[str, Any]:
+    return await _run_workflow_async(question, PROVIDER, MODEL)
+
+
+async def bench_latency(requests: int) -> Dict[str, Any]:
+    """Sequential runs: end-to-end and per-node latency distributions."""
+    total: List[float] = []
+    per_node: Dict[str, List[float]] = defaultdict(list)
+    routes: Dict[str, int] = defaultdict(int)
+    for i in range(requests):
+        t0 = time.perf_counter()
+        state = await _run(QUESTIONS[i % len(QUESTIONS)])
+        total.append(time.perf_counter() - t0)
+        routes[state.get("route", "unknown")] += 1
+        for node, stats in state.get("metadata", {}).get("nodes", {}).items():
+            per_node[node].append(stats["duration_s"])
+    return {
+        "total": summarize(total),
+        "nodes": {node: summarize(v) for node, v in sorted(per_node.items())},
+        "routes": dict(routes),
+    }
+
+
+async def bench_throughput(concurrency: int, requests: int) -> Dict[str, Any]:
+    """``requests`` runs with at most ``concurrency`` in flight."""
+    sem = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                await _run(QUESTIONS[i % len(QUESTIONS)])
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - t0
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_s": round(wall, 4),
+        "throughput_rps": round(requests / wall, 3) if wall else None,
+        "latency": summarize(latencies),
+    }
+
+
+async def bench_memory(requests: int) -> Dict[str, Any]:
+    """tracemalloc peak per request and retained growth across the batch."""
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    peaks: List[int] = []
+    for i in range(requests):
+        tracemalloc.reset_peak()
+        await _run(QUESTIONS[i % len(QUESTIONS)])
+        peaks.append(tracemalloc.get_traced_memory()[1])
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "requests": requests,
+        "peak_per_request_kib": summarize([(p - baseline) / 1024 for p in peaks]),
+        "retained_growth_kib": round((current - baseline) / 1024, 1),
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+async def run_suite(concurrency: List[int], requests: int) -> Dict[str, Any]:
+    await _run(QUESTIONS[0])  # compile the graph and warm the stores
+    result: Dict[str, Any] = {"latency": await bench_latency(requests)}
+    result["throughput"] = [await bench_throughput(c, requests) for c in concurrency]
+    result["memory"] = await bench_memory(min(requests, 32))
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="End-to-end workflow benchmark (offline).")
+    parser.add_argument("--requests", type=int, default=32, help="Runs per measurement.")
+    parser.add_argument("--concurrency", default="1,4,16",
+                        help="Comma-separated in-flight levels for the throughput sweep.")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Mean fake-LLM latency (s).")
+    parser.add_argument("--llm-jitter", type=float, default=0.01, help="± uniform jitter (s).")
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="Fake embedding latency (s).")
+    parser.add_argument("--coalescing", action="store_true",
+                        help="Keep request coalescing on (duplicate in-flight questions share one run).")
+    parser.add_argument("--out", default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    concurrency = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    with offline_environment(
+        llm_latency_s=args.llm_latency,
+        llm_jitter_s=args.llm_jitter,
+        embed_latency_s=args.embed_latency,
+        coalescing=args.coalescing,
+    ):
+        result = asyncio.run(run_suite(concurrency, args.requests))
+
+    result["config"] = vars(args)
+    path = write_results("workflow", result, args.out)
+    lat = result["latency"]["total"]
+    print(f"[bench_workflow] coalescing {'on' if args.coalescing else 'off'}")
+    print(f"[bench_workflow] sequential p50={lat['p50']:.4f}s p95={lat['p95']:.4f}s")
+    for row in result["throughput"]:
+        print(f"[bench_workflow] c={row['concurrency']:<3} {row['throughput_rps']} req/s "
+              f"p95={row['latency']['p95']:.4f}s errors={row['errors']}")
+    print(f"[bench_workflow] results → {path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Diff two benchmark result files.
+
+Every numeric leaf whose key looks like a cost (``*_ns``, ``*_ms``,
+``*_us``, ``*_s``, ``p50``…``p99``, ``mean``, ``*bytes*``, ``*kib*``,
+``*blocks*``) is compared; list entries are keyed by their ``claims`` /
+``concurrency`` field so rows line up across runs. Exits 1 when any
+metric regressed by more than ``--threshold`` (relative).
+
+    python -m benchmarks.compare benchmarks/results/verifier-abc123-*.json \\
+                                 benchmarks/results/verifier-def456-*.json
+"""
+
+import argparse
+import json
+import re
+import sys
+from typing import Any, Dict, List, Optional
+
+_COST_KEY = re.compile(r"(_ns|_ms|_us|_s|^p\d+|^mean|bytes|kib|mib|blocks)", re.I)
+_ROW_KEYS = ("claims", "concurrency", "name")
+_SKIP = ("config", "environment")
+
+
+def flatten(obj: Any, prefix: str = "") -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if not prefix and key in _SKIP:
+                continue
+            out.update(flatten(value, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            tag = next((f"{k}={item[k]}" for k in _ROW_KEYS if isinstance(item, dict) and k in item), str(i))
+            out.update(flatten(item, f"{prefix}[{tag}]"))
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        out[prefix] = float(obj)
+    return out
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    a, b = flatten(old), flatten(new)
+    rows = []
+    for key in sorted(a.keys() & b.keys()):
+        if not _COST_KEY.search(key.rsplit(".", 1)[-1]) or a[key] == 0:
+            continue
+        change = (b[key] - a[key]) / a[key]
+        rows.append({"metric": key, "old": a[key], "new": b[key], "change": change,
+                     "regressed": change > threshold})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative increase that counts as a regression (default 10%%).")
+    parser.add_argument("--only-regressions", action="store_true")
+    args = parser.parse_args(argv)
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    rows = compare(old, new, args.threshold)
+    old_c = old.get("environment", {}).get("commit")
+    new_c = new.get("environment", {}).get("commit")
+    print(f"{old.get('benchmark')}: {old_c} → {new_c}")
+    for r in rows:
+        if args.only_regressions and not r["regressed"]:
+            continue
+        flag = "  REGRESSED" if r["regressed"] else ""
+        print(f"{r['metric']:<60} {r['old']:>14.4g} → {r['new']:>14.4g}  {r['change']:+7.1%}{flag}")
+    return 1 if any(r["regressed"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
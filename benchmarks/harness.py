@@ -0,0 +1,146 @@
+"""
+Shared plumbing for the benchmark scripts: an isolated offline
+environment, summary statistics and result files.
+"""
+
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+from src.config import paths, settings
+
+# Keep Chroma from trying to phone home on an offline box.
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+RESULTS_DIR = str(Path(__file__).resolve().parent / "results")
+
+# Mix of verify-route (known and unknown sections) and direct-route questions.
+QUESTIONS = [
+    "What is the BNS equivalent of IPC Section 302?",
+    "Which BNS section replaces IPC 420 on cheating?",
+    "What is the punishment for dowry death under IPC 304B?",
+    "Is IPC Section 498A still an offence under the BNS?",
+    "What does IPC section 120B cover and where is it in BNS?",
+    "IPC 376 corresponds to which BNS section?",
+    "What happened to IPC Section 124A (sedition) in the BNS?",
+    "Can you recommend a good book for a long train journey?",
+]
+
+
+@contextlib.contextmanager
+def offline_environment(
+    workdir: Optional[str] = None,
+    llm_latency_s: float = 0.0,
+    llm_jitter_s: float = 0.0,
+    embed_latency_s: float = 0.0,
+    coalescing: bool = False,
+) -> Iterator[str]:
+    """
+    Point the pipeline at offline models and a scratch data directory.
+
+    The relational store is the real (read-only) mapping DB; the vector
+    store is rebuilt from the processed chunks with hashing embeddings.
+    Request coalescing (workflow, embeddings, LLM) is off unless
+    *coalescing* is set: the benchmarks cycle through a handful of
+    ``QUESTIONS``, so concurrent duplicates would share one execution and
+    overstate throughput. Yields the scratch directory and restores the
+    previous wiring on exit.
+    """
+    from src.offline import HashingEmbeddings
+    from src.rag.store_manager import StoreManager
+    from src.rag.vectorstore import IPCBNSRelationalStore, IPCBNSVectorStore
+    from src.storage import review_queue, verified_answers
+    from src.storage.log_sink import get_sink
+
+    owned = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="guardrail-bench-")
+    saved = {
+        "offline": settings["llm"].get("offline"),
+        "coalescing": settings.get("coalescing"),
+        "eval_log": paths.EVAL_LOG,
+        "queue": review_queue._queue,
+        "answers": verified_answers._store,
+    }
+    stores = StoreManager()
+    stores.close()
+
+    settings["llm"]["offline"] = {"latency_s": llm_latency_s, "jitter_s": llm_jitter_s}
+    settings["coalescing"] = {**(saved["coalescing"] or {}), "enabled": coalescing}
+    paths.EVAL_LOG = os.path.join(workdir, "eval_log.jsonl")
+    review_db = os.path.join(workdir, "review_queue.db")
+    review_queue._queue = review_queue.ReviewQueue(review_db)
+    verified_answers._store = verified_answers.VerifiedAnswerStore(review_db)
+
+    vector = IPCBNSVectorStore(
+        persist_dir=os.path.join(workdir, "chroma"),
+        embeddings=HashingEmbeddings(latency_s=embed_latency_s),
+    )
+    vector.build_from_json(paths.PROCESSED_CHUNKS)
+    stores.install(relational=IPCBNSRelationalStore(paths.SQLITE_DB), vector=vector)
+    try:
+        yield workdir
+    finally:
+        get_sink(paths.EVAL_LOG).close()
+        stores.close()
+        review_queue._queue.close()
+        verified_answers._store.close()
+        settings["llm"]["offline"] = saved["offline"]
+        settings["coalescing"] = saved["coalescing"]
+        paths.EVAL_LOG = saved["eval_log"]
+        review_queue._queue = saved["queue"]
+        verified_answers._store = saved["answers"]
+        if owned:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def summarize(values: Sequence[float], qs: Sequence[int] = (50, 90, 95, 99)) -> Dict[str, Any]:
+    """Count, mean, min/max and percentiles of a latency sample (seconds)."""
+    if not values:
+        return {"count": 0}
+    arr = np.asarray(values, dtype=np.float64)
+    out: Dict[str, Any] = {
+        "count": int(arr.size),
+        "mean": round(float(arr.mean()), 6),
+        "min": round(float(arr.min()), 6),
+        "max": round(float(arr.max()), 6),
+    }
+    for q in qs:
+        out[f"p{q}"] = round(float(np.percentile(arr, q)), 6)
+    return out
+
+
+def environment_info() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=paths.ROOT, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(name: str, payload: Dict[str, Any], out_dir: str = RESULTS_DIR) -> str:
+    """Write ``payload`` (plus environment info) to ``<out_dir>/<name>-<commit>-<ts>.json``."""
+    env = environment_info()
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(out_dir, f"{name}-{env['commit'] or 'nocommit'}-{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"benchmark": name, "environment": env, **payload}, f, indent=2)
+    return path
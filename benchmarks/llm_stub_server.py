@@ -0,0 +1,293 @@
+"""
+Local HTTP stand-in for the Gemini and OpenAI chat APIs.
+
+Serves just enough of each wire format for the LangChain clients used by
+``get_llm``:
+
+    POST /v1beta/models/{model}:generateContent   (Gemini)
+    POST /v1/chat/completions                     (OpenAI)
+    GET  /stats                                   (per-model counters)
+    POST /stats/reset
+
+Reply text comes from ``ScriptedChatModel`` so the graph sees valid
+planner JSON, answers and claim lists. Each model has a ``ModelProfile``:
+a latency distribution, a random 429 probability and an optional
+requests-per-minute quota past which every call gets 429
+``RESOURCE_EXHAUSTED`` (what a free-tier key does under load).
+
+    python -m benchmarks.llm_stub_server --port 8765 --latency lognormal:0.4:0.5 \\
+        --quota gemini-2.5-flash=60 --error-rate 0.02
+
+Point the app at it with ``llm.base_url: http://127.0.0.1:8765`` in
+settings.yaml (any non-empty ``GOOGLE_API_KEY`` works).
+"""
+
+import argparse
+import asyncio
+import collections
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from aiohttp import web
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from src.offline import ScriptedChatModel, _approx_tokens
+
+
+# ── Profiles ─────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class LatencyDistribution:
+    """``fixed:S``, ``uniform:LO:HI``, ``lognormal:MEDIAN:SIGMA`` or ``exp:MEAN`` (seconds)."""
+
+    kind: str = "fixed"
+    params: Tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, *rest = spec.split(":")
+        params = tuple(float(p) for p in rest) or (0.0,)
+        if kind not in ("fixed", "uniform", "lognormal", "exp"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        return cls(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.params[0], self.params[1])
+        if self.kind == "lognormal":
+            median, sigma = self.params[0], self.params[1] if len(self.params) > 1 else 0.5
+            return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        if self.kind == "exp":
+            return rng.expovariate(1.0 / self.params[0]) if self.params[0] > 0 else 0.0
+        return self.params[0]
+
+
+@dataclass
+class ModelProfile:
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0  # probability of a random 429
+    rpm: Optional[int] = None  # sliding 60 s quota; None = unlimited
+
+
+@dataclass
+class _ModelState:
+    calls: Deque[float] = field(default_factory=collections.deque)
+    requests: int = 0
+    ok: int = 0
+    quota_429: int = 0
+    random_429: int = 0
+
+
+# ── Server ───────────────────────────────────────────────────────────────────
+
+
+class StubLLMServer:
+    """aiohttp app serving scripted replies with injected latency and 429s."""
+
+    def __init__(
+        self,
+        default: Optional[ModelProfile] = None,
+        profiles: Optional[Dict[str, ModelProfile]] = None,
+        seed: int = 0,
+    ):
+        self.default = default or ModelProfile()
+        self.profiles = profiles or {}
+        self.rng = random.Random(seed)
+        self.scripted = ScriptedChatModel()
+        self.state: Dict[str, _ModelState] = collections.defaultdict(_ModelState)
+        self.app = web.Application()
+        self.app.add_routes([
+            web.post("/v1beta/models/{model}:generateContent", self.gemini),
+            web.post("/v1/models/{model}:generateContent", self.gemini),
+            web.post("/v1/chat/completions", self.openai),
+            web.get("/stats", self.stats),
+            web.post("/stats/reset", self.reset),
+        ])
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def profile(self, model: str) -> ModelProfile:
+        return self.profiles.get(model, self.default)
+
+    async def _admit(self, model: str) -> Optional[str]:
+        """Apply quota / error injection and latency; return a 429 reason or None."""
+        profile, st = self.profile(model), self.state[model]
+        st.requests += 1
+        now = time.monotonic()
+        if profile.rpm is not None:
+            while st.calls and now - st.calls[0] > 60.0:
+                st.calls.popleft()
+            if len(st.calls) >= profile.rpm:
+                st.quota_429 += 1
+                return "quota"
+            st.calls.append(now)
+        if profile.error_rate and self.rng.random() < profile.error_rate:
+            st.random_429 += 1
+            return "random"
+        await asyncio.sleep(profile.latency.sample(self.rng))
+        st.ok += 1
+        return None
+
+    def _reply(self, messages: List[BaseMessage]) -> Tuple[str, int, int]:
+        text = self.scripted._respond(messages)
+        prompt = sum(_approx_tokens(str(m.content)) for m in messages)
+        return text, prompt, _approx_tokens(text)
+
+    @staticmethod
+    def _too_many(model: str, reason: str) -> web.Response:
+        return web.json_response(
+            {"error": {
+                "code": 429,
+                "message": f"Resource has been exhausted (e.g. check quota). model={model} ({reason})",
+                "status": "RESOURCE_EXHAUSTED",
+            }},
+            status=429,
+        )
+
+    async def gemini(self, request: web.Request) -> web.Response:
+        model = request.match_info["model"].removeprefix("models/")
+        body = await request.json()
+        rejected = await self._admit(model)
+        if rejected:
+            return self._too_many(model, rejected)
+
+        messages: List[BaseMessage] = []
+        system = body.get("systemInstruction") or body.get("system_instruction")
+        if system:
+            messages.append(SystemMessage("".join(p.get("text", "") for p in system.get("parts", []))))
+        for content in body.get("contents", []):
+            text = "".join(p.get("text", "") for p in content.get("parts", []))
+            messages.append(AIMessage(text) if content.get("role") == "model" else HumanMessage(text))
+        text, prompt, completion = self._reply(messages)
+        return web.json_response({
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": text}]},
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {
+                "promptTokenCount": prompt,
+                "candidatesTokenCount": completion,
+                "totalTokenCount": prompt + completion,
+            },
+            "modelVersion": model,
+        })
+
+    async def openai(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        model = body.get("model", "unknown")
+        rejected = await self._admit(model)
+        if rejected:
+            return self._too_many(model, rejected)
+
+        kinds = {"system": SystemMessage, "assistant": AIMessage}
+        messages = [kinds.get(m.get("role"), HumanMessage)(str(m.get("content", ""))) for m in body.get("messages", [])]
+        text, prompt, completion = self._reply(messages)
+        return web.json_response({
+            "id": f"chatcmpl-stub-{int(time.time() * 1000)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion},
+        })
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {
+            model: {"requests": s.requests, "ok": s.ok, "quota_429": s.quota_429, "random_429": s.random_429}
+            for model, s in sorted(self.state.items())
+        }
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.snapshot())
+
+    async def reset(self, request: web.Request) -> web.Response:
+        self.state.clear()
+        return web.json_response({"ok": True})
+
+    # ── Lifecycle ────────────────────────────────────────────────────────
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve from a daemon thread with its own event loop; returns the base URL."""
+        ready = threading.Event()
+        bound: Dict[str, Any] = {}
+
+        def _serve() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._runner = web.AppRunner(self.app, access_log=None)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, host, port)
+            self._loop.run_until_complete(site.start())
+            bound["port"] = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+            ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=_serve, name="llm-stub-server", daemon=True).start()
+        ready.wait(10)
+        return f"http://{host}:{bound['port']}"
+
+    def stop(self) -> None:
+        if self._loop is None or self._runner is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def parse_model_overrides(items: List[str]) -> Dict[str, str]:
+    """``["model=value", ...]`` → ``{model: value}``."""
+    out = {}
+    for item in items or []:
+        model, _, value = item.partition("=")
+        out[model.strip()] = value.strip()
+    return out
+
+
+def build_server(
+    latency: str = "fixed:0",
+    error_rate: float = 0.0,
+    quota: Optional[List[str]] = None,
+    model_latency: Optional[List[str]] = None,
+    seed: int = 0,
+) -> StubLLMServer:
+    """Server with one default profile plus per-model quota/latency overrides."""
+    default = ModelProfile(LatencyDistribution.parse(latency), error_rate)
+    quotas = {m: int(v) for m, v in parse_model_overrides(quota or []).items()}
+    latencies = {m: LatencyDistribution.parse(v) for m, v in parse_model_overrides(model_latency or []).items()}
+    profiles = {
+        m: ModelProfile(latencies.get(m, default.latency), error_rate, quotas.get(m))
+        for m in set(quotas) | set(latencies)
+    }
+    return StubLLMServer(default, profiles, seed)
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", default="lognormal:0.3:0.4",
+                        help="Default latency: fixed:S | uniform:LO:HI | lognormal:MEDIAN:SIGMA | exp:MEAN")
+    parser.add_argument("--model-latency", action="append", default=[], metavar="MODEL=DIST")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Random 429 probability per call.")
+    parser.add_argument("--quota", action="append", default=[], metavar="MODEL=RPM",
+                        help="Requests/minute before a model returns 429 RESOURCE_EXHAUSTED.")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stand-in Gemini/OpenAI server for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = build_server(args.latency, args.error_rate, args.quota, args.model_latency, args.seed)
+    print(f"[llm_stub_server] http://{args.host}:{args.port} (latency={args.latency}, "
+          f"error_rate={args.error_rate}, quota={args.quota or 'none'})")
+    web.run_app(server.app, host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Load test: how much concurrent ``run_workflow`` traffic one process
+sustains before quota 429s push calls onto fallback models.
+
+Starts ``StubLLMServer`` in-process (or targets ``--server-url``), points
+the ``google`` provider at it via ``llm.base_url`` and drives
+``_run_workflow_async`` closed-loop at each concurrency level for
+``--duration`` seconds. Per level it reports:
+
+* throughput (completed requests/s) and end-to-end latency percentiles;
+* fallback rate – share of requests where any node was answered by a
+  fallback model, and share of LLM calls served by a fallback;
+* error rates – requests that raised, requests degraded because every
+  model failed (planner error / "All models failed" answer), and 429s
+  served by the stand-in per model;
+* the router's per-model health snapshot at the end of the level, and
+  hedge counts / win rate when run with ``--hedging``;
+* with ``--rate-limit MODEL=RPM``, calls queued or refused by the local
+  rate limiter before they reach the stand-in.
+
+As in ``bench_workflow``, request coalescing is off unless
+``--coalescing`` is given; ``config.coalescing`` records the mode.
+
+    python -m benchmarks.load_test --concurrency 1,4,16,64 --duration 20 \\
+        --latency lognormal:0.4:0.5 --quota gemini-2.5-flash=300
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from benchmarks.harness import QUESTIONS, RESULTS_DIR, offline_environment, summarize, write_results
+from benchmarks.llm_stub_server import StubLLMServer, add_server_arguments, build_server, parse_model_overrides
+from src.config import settings
+from src.llm.hedging import hedge_policy
+from src.llm.rate_limit import configure_rate_limiter
+from src.llm.router import model_health
+
+LLM_NODES = ("planner", "primary_llm", "claim_extractor")
+
+
+def _classify(state: Dict[str, Any]) -> Dict[str, Any]:
+    nodes = state.get("metadata", {}).get("nodes", {})
+    calls = fallback_calls = 0
+    for name in LLM_NODES:
+        stats = nodes.get(name) or {}
+        if stats.get("model"):
+            calls += 1
+            fallback_calls += 1 if (stats.get("fallback_index") or 0) > 0 else 0
+    degraded = str(state.get("plan", "")).startswith("Planner error") or str(
+        state.get("llm_answer", "")
+    ).startswith("⚠️ All models failed")
+    return {
+        "llm_nodes": calls,
+        "fallback_nodes": fallback_calls,
+        "degraded": degraded,
+        "models": [nodes[n]["model"] for n in LLM_NODES if (nodes.get(n) or {}).get("model")],
+    }
+
+
+async def run_level(concurrency: int, duration_s: float, model: str) -> Dict[str, Any]:
+    from src.graph.workflow import _run_workflow_async
+
+    deadline = time.perf_counter() + duration_s
+    latencies: List[float] = []
+    served_by: Counter = Counter()
+    totals = Counter()
+    counter = iter(range(10**9))
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            question = QUESTIONS[next(counter) % len(QUESTIONS)]
+            t0 = time.perf_counter()
+            try:
+                state = await _run_workflow_async(question, "google", model)
+            except Exception:
+                totals["exceptions"] += 1
+                continue
+            latencies.append(time.perf_counter() - t0)
+            info = _classify(state)
+            totals["completed"] += 1
+            totals["degraded"] += info["degraded"]
+            totals["llm_nodes"] += info["llm_nodes"]
+            totals["fallback_nodes"] += info["fallback_nodes"]
+            totals["requests_with_fallback"] += info["fallback_nodes"] > 0
+            served_by.update(info["models"])
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - t0
+    completed = totals["completed"]
+    attempted = completed + totals["exceptions"]
+    return {
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "completed": completed,
+        "throughput_rps": round(completed / wall, 3) if wall else None,
+        "latency": summarize(latencies),
+        "fallback_rate": round(totals["requests_with_fallback"] / completed, 4) if completed else None,
+        "fallback_call_rate": round(totals["fallback_nodes"] / totals["llm_nodes"], 4) if totals["llm_nodes"] else None,
+        "exception_rate": round(totals["exceptions"] / attempted, 4) if attempted else None,
+        "degraded_rate": round(totals["degraded"] / completed, 4) if completed else None,
+        "served_by": dict(served_by.most_common()),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load-test the graph against a stand-in LLM API.")
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per concurrency level.")
+    parser.add_argument("--model", default=settings["llm"]["model"], help="Primary model requested.")
+    parser.add_argument("--server-url", default=None,
+                        help="Use an already-running stand-in instead of starting one.")
+    parser.add_argument("--hedging", action="store_true", help="Enable hedged requests for this run.")
+    parser.add_argument("--rate-limit", action="append", default=[], metavar="MODEL=RPM",
+                        help="Enable the client-side rate limiter with this requests/minute budget.")
+    parser.add_argument("--coalescing", action="store_true",
+                        help="Keep request coalescing on (duplicate in-flight questions share one run).")
+    parser.add_argument("--out", default=RESULTS_DIR)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    # Fallback failures are expected here; keep node error logs out of the output.
+    logging.getLogger("src").setLevel(logging.CRITICAL)
+    os.environ.setdefault("GOOGLE_API_KEY", "stub-key")
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    server: Optional[StubLLMServer] = None
+    url = args.server_url
+    if url is None:
+        server = build_server(args.latency, args.error_rate, args.quota, args.model_latency, args.seed)
+        url = server.start_in_thread()
+
+    saved_url = settings["llm"].get("base_url")
+    settings["llm"]["base_url"] = url
+    saved_hedging = hedge_policy.enabled
+    hedge_policy.enabled = args.hedging or saved_hedging
+    saved_limits = settings["rate_limits"]
+    limits = {m: {"rpm": int(v)} for m, v in parse_model_overrides(args.rate_limit).items()}
+    if limits:
+        settings["rate_limits"] = {**saved_limits, "enabled": True, "backend": "memory", "models": limits}
+    rows = []
+    try:
+        print(f"[load_test] coalescing {'on' if args.coalescing else 'off'}")
+        with offline_environment(coalescing=args.coalescing):
+            for c in levels:
+                if server is not None:
+                    server.state.clear()  # fresh quota window per level
+                model_health.reset()
+                hedge_policy.reset()
+                limiter = configure_rate_limiter() if limits else None
+                row = asyncio.run(run_level(c, args.duration, args.model))
+                row["router"] = model_health.snapshot()
+                row["hedging"] = hedge_policy.snapshot() if hedge_policy.enabled else None
+                row["rate_limits"] = limiter.snapshot() if limiter else None
+                if server is not None:
+                    row["server"] = server.snapshot()
+                rows.append(row)
+                print(f"[load_test] c={c:<4} {row['throughput_rps']:>8} req/s  "
+                      f"p50={row['latency'].get('p50', 0):.3f}s p95={row['latency'].get('p95', 0):.3f}s  "
+                      f"fallback={row['fallback_rate']} degraded={row['degraded_rate']} "
+                      f"exceptions={row['exception_rate']}"
+                      + (f" hedges={row['hedging']}" if row["hedging"] else "")
+                      + (f" rate_limits={row['rate_limits']}" if row["rate_limits"] else ""))
+    finally:
+        settings["llm"]["base_url"] = saved_url
+        hedge_policy.enabled = saved_hedging
+        settings["rate_limits"] = saved_limits
+        configure_rate_limiter()
+        if server is not None:
+            server.stop()
+
+    config = vars(args)
+    config["fallback_models"] = settings["llm"]["fallback_models"]
+    path = write_results("load", {"levels": rows, "config": config}, args.out)
+    print(f"[load_test] results → {path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,459 @@
+"""
+Confidence calibration trained from human review outcomes.
+
+The verifier's overall status comes from hand-picked rules (contradiction
+⇒ unreliable; ≥70 % supported and ≥0.75 average confidence ⇒ reliable)
+and the review decision from a fixed confidence threshold. This module
+fits a small model of P(answer is correct) on answers reviewers resolved
+(approved ⇒ correct; corrected / rejected ⇒ not), using per-answer
+features of the claim verifications:
+
+* ``logistic`` — L2-regularised logistic regression (Newton / IRLS).
+* ``isotonic`` — pool-adjacent-violators on the mean claim confidence.
+
+Training examples are the resolved review-queue items plus every
+eval-log run of the same question with the same answer, so frequent
+cases weigh as often as they occur. The thresholds are picked on
+out-of-fold predictions (k-fold cross-validation, grouping every run of
+one reviewed answer into the same fold) and saved with the model:
+
+* ``review_below`` — the lowest cut that still sends ``target_recall`` of
+  the bad answers to review (fewer good answers get queued);
+* ``reliable_at`` — the lowest cut whose answers reviewers approved at
+  ``target_precision`` or better.
+
+The bad-answer recall and reliable precision in the training report are
+measured on held-out folds only, and an artifact whose held-out recall
+misses ``target_recall`` is not saved.
+
+The artifact is a small JSON file (``calibration.path``) loaded once per
+process. Without one, the hand rules apply unchanged.
+
+CLI:
+    python -m src.agents.calibration train
+    python -m src.agents.calibration train --method isotonic --target-recall 0.98
+    python -m src.agents.calibration show
+"""
+
+import argparse
+import json
+import logging
+import math
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.agents.utils import question_hash
+from src.config import HUMAN_REVIEW_THRESHOLD, paths, settings
+from src.graph.records import ClaimVerdict
+from src.storage.review_queue import STATUS_RESOLVED, get_review_queue
+
+logger = logging.getLogger(__name__)
+
+FEATURES = (
+    "bias",
+    "supported_share",
+    "contradicted_share",
+    "uncertain_share",
+    "mean_confidence",
+    "min_confidence",
+    "relational_share",
+    "relational_contradicted_share",
+    "log_claims",
+)
+UNRELIABLE_BELOW = 0.5  # calibrated: more likely wrong than right
+
+
+# ── Features ─────────────────────────────────────────────────────────────
+
+
+def _triple(v: Any) -> Tuple[str, float, str]:
+    if isinstance(v, ClaimVerdict):
+        return v.status.label, v.confidence, v.source.label
+    return str(v.get("status")), float(v.get("confidence") or 0.0), str(v.get("source"))
+
+
+def answer_features(verifications: Iterable[Any]) -> np.ndarray:
+    """Feature vector (``FEATURES``) for one answer's verification records or verdicts."""
+    rows = [_triple(v) for v in verifications]
+    n = len(rows)
+    if n == 0:
+        return np.array([1.0] + [0.0] * (len(FEATURES) - 1))
+    status = np.array([r[0] for r in rows])
+    conf = np.array([r[1] for r in rows], dtype=np.float64)
+    relational = np.array([r[2] in ("relational", "mixed") for r in rows])
+    contradicted = status == "contradicted"
+    return np.array([
+        1.0,
+        float(np.mean(status == "supported")),
+        float(np.mean(contradicted)),
+        float(np.mean(status == "uncertain")),
+        float(conf.mean()),
+        float(conf.min()),
+        float(relational.mean()),
+        float(np.mean(contradicted & relational)),
+        math.log1p(n),
+    ])
+
+
+def _rule_sends_to_review(x: np.ndarray) -> bool:
+    """The uncalibrated decision: hand rule for overall status + confidence threshold."""
+    from src.agents.verifier import RELIABLE_AVG_CONF, RELIABLE_SUPPORTED_SHARE  # verifier imports this module
+
+    mean_conf = x[FEATURES.index("mean_confidence")]
+    reliable = (
+        x[FEATURES.index("contradicted_share")] == 0
+        and x[FEATURES.index("supported_share")] >= RELIABLE_SUPPORTED_SHARE
+        and mean_conf >= RELIABLE_AVG_CONF
+    )
+    return not reliable or mean_conf < HUMAN_REVIEW_THRESHOLD
+
+
+# ── Models ───────────────────────────────────────────────────────────────
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35.0, 35.0)))
+
+
+def fit_logistic(X: np.ndarray, y: np.ndarray, l2: float = 1.0, max_iter: int = 100) -> np.ndarray:
+    """Newton / IRLS fit of L2-regularised logistic regression (bias unpenalised)."""
+    w = np.zeros(X.shape[1])
+    penalty = np.full(X.shape[1], l2)
+    penalty[0] = 0.0
+    for _ in range(max_iter):
+        p = _sigmoid(X @ w)
+        grad = X.T @ (p - y) + penalty * w
+        hess = (X * (p * (1.0 - p))[:, None]).T @ X + np.diag(penalty) + 1e-9 * np.eye(X.shape[1])
+        step = np.linalg.solve(hess, grad)
+        w -= step
+        if np.max(np.abs(step)) < 1e-8:
+            break
+    return w
+
+
+def fit_isotonic(score: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pool-adjacent-violators; returns block upper edges and block means (non-decreasing)."""
+    order = np.argsort(score, kind="stable")
+    s, t = score[order], y[order].astype(np.float64)
+    means: List[float] = []
+    weights: List[float] = []
+    edges: List[float] = []
+    for value, label in zip(s.tolist(), t.tolist()):
+        means.append(label)
+        weights.append(1.0)
+        edges.append(value)
+        while len(means) > 1 and means[-2] >= means[-1]:
+            w = weights[-2] + weights[-1]
+            means[-2] = (means[-2] * weights[-2] + means[-1] * weights[-1]) / w
+            weights[-2] = w
+            edges[-2] = edges[-1]
+            del means[-1], weights[-1], edges[-1]
+    return np.array(edges), np.array(means)
+
+
+class Calibrator:
+    """Loaded calibration artifact: P(correct) plus the decision thresholds."""
+
+    def __init__(self, artifact: Dict[str, Any]):
+        if tuple(artifact.get("features", FEATURES)) != FEATURES:
+            raise ValueError("Calibration artifact was trained on a different feature set; retrain it.")
+        self.artifact = artifact
+        self.method = artifact["method"]
+        self.weights = np.array(artifact.get("weights") or [], dtype=np.float64)
+        self.edges = np.array(artifact.get("edges") or [], dtype=np.float64)
+        self.values = np.array(artifact.get("values") or [], dtype=np.float64)
+        self.review_below = float(artifact["review_below"])
+        self.reliable_at: Optional[float] = artifact.get("reliable_at")
+
+    @classmethod
+    def load(cls, path: str) -> "Calibrator":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """P(answer is correct) for each feature row."""
+        if self.method == "logistic":
+            return _sigmoid(X @ self.weights)
+        score = X[:, FEATURES.index("mean_confidence")]
+        idx = np.minimum(np.searchsorted(self.edges, score, side="left"), len(self.values) - 1)
+        return self.values[idx]
+
+    def status(self, p: float) -> str:
+        if self.reliable_at is not None and p >= self.reliable_at:
+            return "reliable"
+        if p < UNRELIABLE_BELOW:
+            return "unreliable"
+        return "uncertain"
+
+    def annotate(self, final: Dict[str, Any], p: float) -> Dict[str, Any]:
+        """*final* with the calibrated status, probability and review threshold."""
+        return {
+            **final,
+            "rule_status": final["overall_status"],
+            "overall_status": self.status(p),
+            "calibrated_confidence": float(round(p, 3)),
+            "review_threshold": self.review_below,
+        }
+
+    def apply(self, final: Dict[str, Any], verifications: Sequence[Any]) -> Dict[str, Any]:
+        if not final.get("total_claims"):
+            return final
+        return self.annotate(final, float(self.predict(answer_features(verifications)[None, :])[0]))
+
+
+# ── Training ─────────────────────────────────────────────────────────────
+
+
+def labelled_examples(
+    eval_log: Optional[str] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, int]]:
+    """Features, labels and group ids (one per reviewed answer) from review items and eval-log runs."""
+    from src.agents.reverify import iter_eval_entries  # reverify imports this module
+
+    reviewed: Dict[Tuple[str, str], Tuple[int, List[Dict[str, Any]]]] = {}
+    for item in get_review_queue().iter_items(status=STATUS_RESOLVED, include_payload=True):
+        if not item.get("verifications") or not item.get("verdict"):
+            continue
+        label = 1 if item["verdict"] == "approved" else 0
+        reviewed[(item.get("question_hash") or "", item.get("llm_answer") or "")] = (label, item["verifications"])
+
+    group_of = {key: i for i, key in enumerate(reviewed)}
+    X: List[np.ndarray] = []
+    y: List[int] = []
+    groups: List[int] = []
+    matched = set()
+    for entry in iter_eval_entries(eval_log):
+        key = (question_hash(entry.get("question") or ""), entry.get("llm_answer") or "")
+        if key in reviewed and entry["verifications"]:
+            X.append(answer_features(entry["verifications"]))
+            y.append(reviewed[key][0])
+            groups.append(group_of[key])
+            matched.add(key)
+    # Items reviewed before the eval log carried claims count once.
+    for key, (label, verifications) in reviewed.items():
+        if key not in matched:
+            X.append(answer_features(verifications))
+            y.append(label)
+            groups.append(group_of[key])
+
+    stats = {"reviewed_items": len(reviewed), "eval_log_runs": len(y) - (len(reviewed) - len(matched))}
+    if not X:
+        return np.empty((0, len(FEATURES))), np.empty(0), np.empty(0, dtype=np.int64), stats
+    return np.vstack(X), np.array(y, dtype=np.float64), np.array(groups, dtype=np.int64), stats
+
+
+def _review_threshold(p: np.ndarray, y: np.ndarray, target_recall: float) -> float:
+    """Lowest cut with ``P(p < cut | bad) >= target_recall``."""
+    bad = np.sort(p[y == 0])
+    if bad.size == 0:
+        return UNRELIABLE_BELOW
+    k = max(1, math.ceil(target_recall * bad.size))
+    return float(np.nextafter(bad[k - 1], np.inf))
+
+
+def _reliable_threshold(p: np.ndarray, y: np.ndarray, target_precision: float) -> Optional[float]:
+    """Lowest cut whose answers (p >= cut) are correct at ``target_precision`` or better."""
+    order = np.argsort(-p, kind="stable")
+    ps, ys = p[order], y[order]
+    precision = np.cumsum(ys) / np.arange(1, ys.size + 1)
+    # Only cut between distinct probabilities.
+    last_of_value = np.append(ps[1:] != ps[:-1], True)
+    ok = np.flatnonzero(last_of_value & (precision >= target_precision))
+    return float(ps[ok[-1]]) if ok.size else None
+
+
+def _fit(method: str, X: np.ndarray, y: np.ndarray, l2: float) -> Dict[str, Any]:
+    """Model parameters of the artifact (``weights`` or ``edges``/``values``)."""
+    if method == "logistic":
+        return {"weights": fit_logistic(X, y, l2).tolist()}
+    if method == "isotonic":
+        edges, values = fit_isotonic(X[:, FEATURES.index("mean_confidence")], y)
+        return {"edges": edges.tolist(), "values": values.tolist()}
+    raise ValueError(f"Unknown calibration method {method!r}")
+
+
+def _thresholds(
+    p: np.ndarray, y: np.ndarray, target_recall: float, target_precision: float
+) -> Tuple[float, Optional[float]]:
+    """``(review_below, reliable_at)`` picked on predictions *p*."""
+    review_below = _review_threshold(p, y, target_recall)
+    reliable_at = _reliable_threshold(p, y, target_precision)
+    # A reliable answer is never also queued for review.
+    return review_below, None if reliable_at is None else max(reliable_at, review_below)
+
+
+def _assign_folds(y: np.ndarray, groups: np.ndarray, folds: int, seed: int) -> np.ndarray:
+    """Fold id per example: whole groups, dealt out per label so every fold sees both outcomes."""
+    rng = np.random.default_rng(seed)
+    fold_of: Dict[int, int] = {}
+    for label in (0.0, 1.0):
+        ids = np.unique(groups[y == label])
+        rng.shuffle(ids)
+        fold_of.update({int(g): i % folds for i, g in enumerate(ids)})
+    return np.array([fold_of[int(g)] for g in groups])
+
+
+def train(
+    method: str = "logistic",
+    target_recall: float = 0.95,
+    target_precision: float = 0.95,
+    l2: float = 1.0,
+    min_samples: int = 30,
+    eval_log: Optional[str] = None,
+    folds: int = 5,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Fit a calibrator on the review outcomes; returns the artifact with held-out metrics.
+
+    Every prediction used to pick or evaluate a threshold comes from a model
+    that did not see that answer, and the thresholds whose recall/precision
+    are reported were picked without the fold they are measured on. The saved
+    model is then refit on all examples.
+    """
+    X, y, groups, stats = labelled_examples(eval_log)
+    if len(y) < min_samples or len(set(y.tolist())) < 2:
+        raise ValueError(
+            f"Need at least {min_samples} reviewed answers with both outcomes, "
+            f"have {len(y)} ({int(y.sum())} approved)."
+        )
+    folds = min(folds, len(np.unique(groups[y == 0])), len(np.unique(groups[y == 1])))
+    if folds < 2:
+        raise ValueError("Need at least two distinct reviewed answers of each outcome for cross-validation.")
+    fold = _assign_folds(y, groups, folds, seed)
+
+    # Out-of-fold P(correct): each fold scored by a model fit on the others.
+    p = np.empty(len(y))
+    for k in range(folds):
+        test = fold == k
+        model = Calibrator({"method": method, **_fit(method, X[~test], y[~test], l2), "review_below": 0.5})
+        p[test] = model.predict(X[test])
+
+    # Held-out decisions: thresholds picked on the other folds' predictions.
+    review = np.zeros(len(y), dtype=bool)
+    reliable = np.zeros(len(y), dtype=bool)
+    for k in range(folds):
+        test = fold == k
+        review_below, reliable_at = _thresholds(p[~test], y[~test], target_recall, target_precision)
+        review[test] = p[test] < review_below
+        if reliable_at is not None:
+            reliable[test] = p[test] >= reliable_at
+
+    artifact: Dict[str, Any] = {"method": method, "features": list(FEATURES), **_fit(method, X, y, l2)}
+    artifact["review_below"], artifact["reliable_at"] = _thresholds(p, y, target_recall, target_precision)
+
+    bad = y == 0
+    rule_review = np.array([_rule_sends_to_review(x) for x in X])
+    eps = 1e-12
+    artifact["training"] = {
+        **stats,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "samples": int(len(y)),
+        "approved": int(y.sum()),
+        "folds": folds,
+        "target_recall": target_recall,
+        "target_precision": target_precision,
+        "heldout_log_loss": float(-np.mean(y * np.log(p + eps) + (1 - y) * np.log(1 - p + eps))),
+        "heldout_brier": float(np.mean((p - y) ** 2)),
+        "rule_reviews": int(rule_review.sum()),
+        "rule_bad_recall": float(rule_review[bad].mean()),
+        "heldout_reviews": int(review.sum()),
+        "heldout_bad_recall": float(review[bad].mean()),
+        "heldout_reliable": int(reliable.sum()),
+        "heldout_reliable_precision": float(y[reliable].mean()) if reliable.any() else None,
+    }
+    return artifact
+
+
+def save(artifact: Dict[str, Any], path: str) -> None:
+    """Write *artifact* to *path*; refuses one whose held-out recall misses its target."""
+    t = artifact.get("training", {})
+    if t.get("heldout_bad_recall", 0.0) < t.get("target_recall", 0.0):
+        raise ValueError(
+            f"Held-out bad-answer recall {t['heldout_bad_recall']:.3f} is below the target "
+            f"{t['target_recall']:.3f}; not saving. Review more answers or lower --target-recall."
+        )
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(artifact, indent=2), encoding="utf-8")
+
+
+# ── Process-wide model ───────────────────────────────────────────────────
+
+
+def calibration_path() -> str:
+    return str(Path(paths.ROOT) / settings.get("calibration", {}).get("path", "data/models/calibration.json"))
+
+
+_calibrator: Optional[Calibrator] = None
+_calibrator_loaded = False
+_calibrator_lock = threading.Lock()
+
+
+def get_calibrator() -> Optional[Calibrator]:
+    """The artifact at ``calibration.path``, loaded once; None if disabled or not trained."""
+    global _calibrator, _calibrator_loaded
+    if not _calibrator_loaded:
+        with _calibrator_lock:
+            if not _calibrator_loaded:
+                path = calibration_path()
+                if settings.get("calibration", {}).get("enabled", True) and Path(path).exists():
+                    try:
+                        _calibrator = Calibrator.load(path)
+                        logger.info("Calibration: loaded %s model from %s", _calibrator.method, path)
+                    except (OSError, ValueError, KeyError) as e:
+                        logger.warning("Calibration: ignoring %s (%s); using hand-set rules", path, e)
+                _calibrator_loaded = True
+    return _calibrator
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    cfg = settings.get("calibration", {})
+    parser = argparse.ArgumentParser(description="Train or inspect the confidence calibration model.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_train = sub.add_parser("train", help="Fit from resolved review items and the eval log.")
+    p_train.add_argument("--method", choices=["logistic", "isotonic"], default=cfg.get("method", "logistic"))
+    p_train.add_argument("--target-recall", type=float, default=cfg.get("target_recall", 0.95))
+    p_train.add_argument("--target-precision", type=float, default=cfg.get("target_precision", 0.95))
+    p_train.add_argument("--l2", type=float, default=cfg.get("l2", 1.0))
+    p_train.add_argument("--min-samples", type=int, default=cfg.get("min_samples", 30))
+    p_train.add_argument("--folds", type=int, default=cfg.get("folds", 5),
+                         help="Cross-validation folds for picking and checking the thresholds.")
+    p_train.add_argument("--eval-log", help="Evaluation log (default: paths.EVAL_LOG).")
+    p_train.add_argument("--out", default=None, help="Artifact path (default: calibration.path).")
+    sub.add_parser("show", help="Print the current artifact's training summary.")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "show":
+        path = calibration_path()
+        if not Path(path).exists():
+            print(f"[calibration] No artifact at {path}")
+            return
+        print(json.dumps(Calibrator.load(path).artifact.get("training", {}), indent=2))
+        return
+
+    try:
+        artifact = train(args.method, args.target_recall, args.target_precision, args.l2,
+                         args.min_samples, args.eval_log, args.folds)
+    except ValueError as e:
+        raise SystemExit(f"[calibration] {e}")
+    out = args.out or calibration_path()
+    t = artifact["training"]
+    print(f"[calibration] {args.method} model on {t['samples']} answers ({t['approved']} approved), "
+          f"{t['folds']}-fold held-out metrics:")
+    reliable = "never" if artifact["reliable_at"] is None else f"{artifact['reliable_at']:.3f}"
+    print(f"[calibration] review below {artifact['review_below']:.3f}, reliable from {reliable}")
+    print(f"[calibration] reviews: rule {t['rule_reviews']} (bad recall {t['rule_bad_recall']:.3f}) → "
+          f"calibrated {t['heldout_reviews']} (bad recall {t['heldout_bad_recall']:.3f})")
+    if t["heldout_reliable_precision"] is not None:
+        print(f"[calibration] reliable: {t['heldout_reliable']} answers "
+              f"(precision {t['heldout_reliable_precision']:.3f})")
+    try:
+        save(artifact, out)
+    except ValueError as e:
+        raise SystemExit(f"[calibration] {e}")
+    print(f"[calibration] saved → {out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
-import json
 from datetime import datetime, timezone
-from pathlib import Path
 
 from src.config import paths
 from src.graph.state import VerificationState
+from src.observability.timing import summarize_nodes
+from src.storage.log_sink import get_sink
 
 
 async def evaluation_node(state: VerificationState) -> dict:
@@ -11,24 +11,33 @@ async def evaluation_node(state: VerificationState) -> dict:
     Log run metadata for offline evaluation (precision/recall, latency, etc.).
     """
     final = state.get("final_result", {})
+    nodes = state.get("metadata", {}).get("nodes", {})
     log = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "question": state.get("question"),
         "plan": state.get("plan"),
         "route": state.get("route"),
+        # Stored so src.agents.reverify can re-check old verdicts after a
+        # knowledge-base update; evidence text is left out to keep lines small.
+        "llm_answer": state.get("llm_answer"),
+        "claims": state.get("claims", []),
+        "verifications": [
+            {k: v.get(k) for k in ("claim", "status", "confidence", "source")}
+            for v in state.get("verifications", [])
+        ],
         "overall_status": final.get("overall_status"),
         "average_confidence": final.get("average_confidence"),
+        "calibrated_confidence": final.get("calibrated_confidence"),
         "counts": {
             "supported": final.get("supported_claims"),
             "contradicted": final.get("contradicted_claims"),
             "uncertain": final.get("uncertain_claims"),
             "total": final.get("total_claims"),
         },
+        "timings": nodes,
+        "totals": summarize_nodes(nodes),
     }
 
-    p = Path(paths.EVAL_LOG)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(log, ensure_ascii=False) + "\n")
+    get_sink(paths.EVAL_LOG).write(log)
 
     return {"evaluation": log}
@@ -1,22 +1,26 @@
-import json
+import asyncio
 from datetime import datetime, timezone
-from pathlib import Path
 
-from src.config import paths, HUMAN_REVIEW_THRESHOLD
+from src.config import HUMAN_REVIEW_THRESHOLD
 from src.graph.state import VerificationState
+from src.storage.review_queue import get_review_queue
 
 
 async def human_validation_node(state: VerificationState) -> dict:
     """
     Decide whether a human should review and, if so, queue the case.
 
-    For the assignment this is simulated by writing to a JSONL queue.
+    Flagged cases go to the SQLite review queue (see src/storage/review_queue.py).
     """
     final = state.get("final_result", {})
     overall = final.get("overall_status", "unknown")
     avg_conf = float(final.get("average_confidence", 0.0))
 
-    needs = overall in {"unreliable", "uncertain"} or avg_conf < HUMAN_REVIEW_THRESHOLD
+    if "calibrated_confidence" in final:
+        # Calibrated: review below the threshold fitted on past review outcomes.
+        needs = overall == "unreliable" or final["calibrated_confidence"] < final["review_threshold"]
+    else:
+        needs = overall in {"unreliable", "uncertain"} or avg_conf < HUMAN_REVIEW_THRESHOLD
 
     if not needs:
         return {"needs_human": False, "human_feedback": "auto-approved"}
@@ -26,11 +30,14 @@ async def human_validation_node(state: VerificationState) -> dict:
         "question": state.get("question"),
         "llm_answer": state.get("llm_answer"),
         "verifications": state.get("verifications", []),
+        "evidence": state.get("evidence", {}),
         "final_result": final,
     }
 
-    queue_path = Path(paths.HUMAN_REVIEW_QUEUE)
-    with queue_path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    item_id, occurrences = await asyncio.to_thread(get_review_queue().enqueue, record)
 
-    return {"needs_human": True, "human_feedback": "queued_for_review"}
+    return {
+        "needs_human": True,
+        "human_feedback": "queued_for_review",
+        "metadata": {"review_item_id": item_id, "review_occurrences": occurrences},
+    }
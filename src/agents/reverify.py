@@ -0,0 +1,283 @@
+"""
+Re-verify stored answers after a knowledge-base update.
+
+Correcting a row in ``ipcbns_mapping.db`` or re-ingesting the PDF leaves
+earlier verdicts in ``eval_log.jsonl`` and the review queue stale. This
+job reruns only claim verification over the stored claims — no planner,
+primary LLM or claim-extractor calls — and reports every answer whose
+overall status or per-claim verdicts changed.
+
+Entries are processed in batches: claims are de-duplicated across the
+batch, then checked with one relational ``IN`` query and one batched
+embedding + Chroma query, and fused and summarised with array ops
+(``verifier.verify_claims`` / ``verifier.summarize_arrays``). Eval-log lines
+written before claims were logged, and answers with no claims, are
+skipped and counted. Rotated log segments and the compacted Parquet
+dataset (``src.analytics.compaction``) are read too, oldest first.
+
+CLI:
+    python -m src.agents.reverify                        # eval log + review queue
+    python -m src.agents.reverify --source review --review-status pending
+    python -m src.agents.reverify --out data/reverify_report.json
+"""
+
+import argparse
+import glob
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import orjson
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from src.agents.calibration import answer_features, get_calibrator
+from src.agents.utils import extract_text
+from src.agents.verifier import summarize_arrays, verify_claims
+from src.analytics.compaction import SCHEMA
+from src.config import paths
+from src.graph.records import ClaimVerdict
+from src.rag.store_manager import StoreManager
+from src.rag.vectorstore import IPCBNSRelationalStore, IPCBNSVectorStore
+from src.storage.review_queue import get_review_queue
+
+logger = logging.getLogger(__name__)
+
+
+# ── Stored answers ───────────────────────────────────────────────────────
+
+
+def _log_files(path: str) -> List[str]:
+    """Rotated segments oldest first (``.5`` … ``.1``), then the active file."""
+    rotated = [p for p in glob.glob(path + ".*") if p.rsplit(".", 1)[-1].isdigit()]
+    files = sorted(rotated, key=lambda p: int(p.rsplit(".", 1)[-1]), reverse=True)
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+_PARQUET_COLUMNS = ["timestamp", "question", "llm_answer", "claims", "verifications", "overall_status"]
+
+
+def iter_parquet_entries(dataset_dir: str, batch_size: int = 10_000) -> Iterator[Dict[str, Any]]:
+    """Stored answers from the compacted Parquet log (``claims`` is None for rows compacted without them)."""
+    if not os.path.isdir(dataset_dir):
+        return
+    partitioning = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(dataset_dir, schema=SCHEMA, format="parquet", partitioning=partitioning)
+    for fragment in dataset.get_fragments():
+        row = 0
+        for batch in fragment.to_batches(schema=dataset.schema, columns=_PARQUET_COLUMNS, batch_size=batch_size):
+            for rec in batch.to_pylist():
+                row += 1
+                yield {
+                    "source": "eval_parquet",
+                    "ref": f"{os.path.relpath(fragment.path, dataset_dir)}:{row}",
+                    "timestamp": rec["timestamp"],
+                    "question": rec["question"],
+                    "llm_answer": rec["llm_answer"],
+                    "claims": rec["claims"],
+                    "verifications": rec["verifications"] or [],
+                    "overall_status": rec["overall_status"],
+                }
+
+
+def iter_eval_entries(
+    path: Optional[str] = None, parquet_dir: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stored answers from the evaluation log (``claims`` is None for old lines).
+
+    Compacted rows come first: from *parquet_dir*, or from
+    ``paths.EVAL_PARQUET_DIR`` when reading the default log.
+    """
+    if parquet_dir is None and path is None:
+        parquet_dir = paths.EVAL_PARQUET_DIR
+    if parquet_dir:
+        yield from iter_parquet_entries(parquet_dir)
+    for file in _log_files(path or paths.EVAL_LOG):
+        with open(file, "rb") as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    rec = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                answer = rec.get("llm_answer")
+                if answer is not None and not isinstance(answer, str):
+                    answer = extract_text(answer)
+                yield {
+                    "source": "eval_log",
+                    "ref": f"{os.path.basename(file)}:{lineno}",
+                    "timestamp": rec.get("timestamp"),
+                    "question": rec.get("question"),
+                    "llm_answer": answer,
+                    "claims": rec.get("claims"),
+                    "verifications": rec.get("verifications") or [],
+                    "overall_status": rec.get("overall_status"),
+                }
+
+
+def iter_review_entries(status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stored answers from the review queue; claims come from the stored verifications."""
+    for item in get_review_queue().iter_items(status=status, include_payload=True):
+        verifications = item.get("verifications") or []
+        yield {
+            "source": "review_queue",
+            "ref": f"review:{item['id']}",
+            "timestamp": item.get("created_at"),
+            "question": item.get("question"),
+            "llm_answer": item.get("llm_answer"),
+            "claims": [v.get("claim", "") for v in verifications],
+            "verifications": verifications,
+            "overall_status": item.get("overall_status"),
+        }
+
+
+# ── Re-verification ──────────────────────────────────────────────────────
+
+
+def _diff(entry: Dict[str, Any], fresh: List[ClaimVerdict], final: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Changed-verdict record for *entry*, or None if nothing changed."""
+    old = {v.get("claim"): v for v in entry["verifications"]}
+    claims = []
+    for new in fresh:
+        prev = old.get(new.claim) or {}
+        if prev.get("status") != new.status.label:
+            claims.append({
+                "claim": new.claim,
+                "old_status": prev.get("status"),
+                "new_status": new.status.label,
+                "old_confidence": prev.get("confidence"),
+                "new_confidence": new.confidence,
+            })
+    if not claims and entry["overall_status"] == final["overall_status"]:
+        return None
+    return {
+        "source": entry["source"],
+        "ref": entry["ref"],
+        "timestamp": entry["timestamp"],
+        "question": entry["question"],
+        "old_status": entry["overall_status"],
+        "new_status": final["overall_status"],
+        "new_average_confidence": final["average_confidence"],
+        "new_calibrated_confidence": final.get("calibrated_confidence"),
+        "claims": claims,
+    }
+
+
+def reverify(
+    entries: Iterable[Dict[str, Any]],
+    rel: IPCBNSRelationalStore,
+    vec: Optional[IPCBNSVectorStore],
+    batch_size: int = 200,
+) -> Dict[str, Any]:
+    """Re-check the claims of *entries* and report the verdicts that changed."""
+    report: Dict[str, Any] = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "verification_mode": "full" if vec is not None else "relational_only",
+        "entries": 0,
+        "skipped_no_claims": 0,
+        "claims_checked": 0,
+        "unique_claims": 0,
+        "changed": [],
+        "status_transitions": {},
+    }
+
+    def flush(batch: List[Dict[str, Any]]) -> None:
+        unique = list(dict.fromkeys(c for e in batch for c in e["claims"]))
+        fresh = dict(zip(unique, verify_claims(unique, rel, vec)))
+        report["unique_claims"] += len(unique)
+        per_entry = [[fresh[c] for c in entry["claims"]] for entry in batch]
+        flat = [v for verdicts in per_entry for v in verdicts]
+        finals = summarize_arrays(
+            np.fromiter((v.status for v in flat), dtype=np.int8, count=len(flat)),
+            np.fromiter((v.confidence for v in flat), dtype=np.float64, count=len(flat)),
+            np.repeat(np.arange(len(batch)), [len(v) for v in per_entry]),
+            len(batch),
+        )
+        report["claims_checked"] += len(flat)
+        calibrator = get_calibrator()
+        if calibrator is not None:
+            p = calibrator.predict(np.vstack([answer_features(v) for v in per_entry]))
+            finals = [calibrator.annotate(f, float(pi)) for f, pi in zip(finals, p.tolist())]
+        for entry, verdicts, final in zip(batch, per_entry, finals):
+            change = _diff(entry, verdicts, final)
+            if change is not None:
+                report["changed"].append(change)
+                if change["old_status"] != change["new_status"]:
+                    key = f"{change['old_status']} -> {change['new_status']}"
+                    report["status_transitions"][key] = report["status_transitions"].get(key, 0) + 1
+
+    batch: List[Dict[str, Any]] = []
+    pending = 0
+    for entry in entries:
+        report["entries"] += 1
+        if not entry.get("claims"):
+            report["skipped_no_claims"] += 1
+            continue
+        batch.append(entry)
+        pending += len(entry["claims"])
+        if pending >= batch_size:
+            flush(batch)
+            batch, pending = [], 0
+    if batch:
+        flush(batch)
+
+    report["changed_count"] = len(report["changed"])
+    logger.info(
+        "Re-verification: %d entries, %d skipped, %d claims (%d unique), %d changed",
+        report["entries"], report["skipped_no_claims"], report["claims_checked"],
+        report["unique_claims"], report["changed_count"],
+    )
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-verify stored answers against the current knowledge base.")
+    parser.add_argument("--source", choices=["all", "eval", "review"], default="all")
+    parser.add_argument("--eval-log", help="Evaluation log (default: paths.EVAL_LOG).")
+    parser.add_argument("--eval-parquet", help="Compacted log (default: paths.EVAL_PARQUET_DIR with the default log).")
+    parser.add_argument("--review-status", help="Only review-queue items with this status.")
+    parser.add_argument("--batch-size", type=int, default=200, help="Claims per batched lookup.")
+    parser.add_argument("--relational-only", action="store_true", help="Skip the vector store.")
+    parser.add_argument("--out", help="Write the full JSON report here.")
+    args = parser.parse_args(argv)
+
+    if args.relational_only:
+        # Only SQLite: no vector load or build is started and then abandoned at exit.
+        rel = IPCBNSRelationalStore(paths.SQLITE_DB)
+        vec = None
+    else:
+        stores = StoreManager().warmup()
+        rel, vec = stores.relational, stores.vector
+    entries: List[Iterable[Dict[str, Any]]] = []
+    if args.source in ("all", "eval"):
+        entries.append(iter_eval_entries(args.eval_log, args.eval_parquet))
+    if args.source in ("all", "review"):
+        entries.append(iter_review_entries(args.review_status))
+
+    try:
+        report = reverify((e for it in entries for e in it), rel, vec, args.batch_size)
+    finally:
+        if args.relational_only:
+            rel.close()
+
+    if args.out:
+        with open(args.out, "wb") as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    print(
+        f"[reverify] {report['entries']} entries ({report['skipped_no_claims']} without claims), "
+        f"{report['claims_checked']} claims, {report['changed_count']} changed"
+    )
+    for change in report["changed"]:
+        print(f"  {change['ref']}: {change['old_status']} -> {change['new_status']}  {change['question']!r}")
+        for c in change["claims"]:
+            print(f"    - {c['old_status']} -> {c['new_status']}: {c['claim'][:100]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Shared utilities for agent nodes."""
 
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -41,3 +42,13 @@ def extract_text(result) -> str:
         return "\n".join(parts)
 
     return str(content)
+
+
+def normalize_question(question: str) -> str:
+    """Lower-case and collapse whitespace/trailing punctuation for keying."""
+    return " ".join((question or "").lower().split()).rstrip(" ?!.")
+
+
+def question_hash(question: str) -> str:
+    """Short, stable hash of the normalised question (safe to log/export)."""
+    return hashlib.sha256(normalize_question(question).encode("utf-8")).hexdigest()[:16]
@@ -1,124 +1,322 @@
 import logging
-import re
-from typing import Dict, List
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from src.agents.calibration import get_calibrator
+from src.config import settings
+from src.graph.records import ClaimVerdict, EvidenceTable, Score, Source, Status, chunk_key
 from src.graph.state import VerificationRecord, VerificationState
+from src.rag.sections import BNS, IPC, extract_sections
 from src.rag.store_manager import StoreManager
 from src.rag.vectorstore import IPCBNSRelationalStore, IPCBNSVectorStore
 
 logger = logging.getLogger(__name__)
 
-SECTION_RE = re.compile(r"(?:IPC|BNS)?\s*Section\s*(\d+[A-Z]?)", re.IGNORECASE)
+
+# Scoring thresholds, shared by the per-claim and the vectorized path.
+VECTOR_SUPPORTED_SIM = 0.75
+VECTOR_CONTRADICTED_SIM = 0.45
+VECTOR_OVERRIDE_CONF = 0.7  # a vector contradiction this confident downgrades a relational "supported"
+RELIABLE_SUPPORTED_SHARE = 0.7
+RELIABLE_AVG_CONF = 0.75
 
 
 def _extract_sections(text: str) -> List[str]:
-    return list({m.group(1) for m in SECTION_RE.finditer(text)})
+    # Canonical keys in order of appearance, minus those the text says are
+    # BNS sections: callers treat [0] as the IPC section.
+    return extract_sections(text, IPC)
+
 
+def _section_filter_enabled() -> bool:
+    return bool(settings["verification"].get("vector_section_filter", False))
 
-def _score_relational(claim: str, rel: IPCBNSRelationalStore) -> Dict[str, object]:
+
+def _score_relational(
+    claim: str, rel: IPCBNSRelationalStore, evidence: Optional[EvidenceTable] = None
+) -> Score:
     secs = _extract_sections(claim)
     if not secs:
-        return {
-            "status": "uncertain",
-            "confidence": 0.0,
-            "evidence": "",
-            "source": "relational",
-        }
+        return _relational_verdict(claim, None, None, evidence)
+    return _relational_verdict(claim, secs[0], rel.get_by_ipc(secs[0]), evidence)
+
+
+def _relational_verdict(
+    claim: str,
+    ipc: Optional[str],
+    record: Optional[Dict[str, str]],
+    evidence: Optional[EvidenceTable] = None,
+) -> Score:
+    """Score *claim* against the mapping row already looked up for its IPC section."""
+    if ipc is None:
+        return Score(Status.UNCERTAIN, 0.0, Source.RELATIONAL)
 
-    ipc = secs[0]
-    record = rel.get_by_ipc(ipc)
+    ipc = sys.intern(ipc)
+    if evidence is not None:
+        evidence.add_mapping(ipc, record)
     if not record:
-        return {
-            "status": "uncertain",
-            "confidence": 0.4,
-            "evidence": "No mapping found in IPC↔BNS table.",
-            "source": "relational",
-        }
+        return Score(Status.UNCERTAIN, 0.4, Source.RELATIONAL, ipc)
 
     bns = record["bns_section"]
-    notes = record.get("notes", "")
-    ok = (bns in claim) or (f"BNS {bns}" in claim)
-    status = "supported" if ok else "contradicted"
-    conf = 0.9 if ok else 0.7
-    evidence = f"IPC {ipc} → BNS {bns}. {notes}"
-    return {
-        "status": status,
-        "confidence": conf,
-        "evidence": evidence,
-        "source": "relational",
-    }
+    ok = bns in claim or bns in extract_sections(claim, BNS)
+    if ok:
+        return Score(Status.SUPPORTED, 0.9, Source.RELATIONAL, ipc)
+    return Score(Status.CONTRADICTED, 0.7, Source.RELATIONAL, ipc)
+
 
+def _score_vector(
+    claim: str,
+    vec: IPCBNSVectorStore,
+    evidence: Optional[EvidenceTable] = None,
+    sections: Optional[List[str]] = None,
+) -> Score:
+    if sections:
+        return _vector_verdict(vec.query(claim, k=3, sections=sections), evidence)
+    return _vector_verdict(vec.query(claim, k=3), evidence)
 
-def _score_vector(claim: str, vec: IPCBNSVectorStore) -> Dict[str, object]:
-    results = vec.query(claim, k=3)
+
+def _vector_verdict(
+    results: List[Tuple[str, Dict[str, Any], float]], evidence: Optional[EvidenceTable] = None
+) -> Score:
+    """Score the top-k hits already retrieved for a claim."""
     if not results:
-        return {
-            "status": "uncertain",
-            "confidence": 0.0,
-            "evidence": "No semantic evidence.",
-            "source": "vector",
-        }
+        return Score(Status.UNCERTAIN, 0.0, Source.VECTOR)
 
     best_text, meta, dist = results[0]
     # Convert distance to a crude similarity.
     sim = max(0.0, min(1.0, 1.0 - dist))
 
-    if sim >= 0.75:
-        status = "supported"
-    elif sim <= 0.45:
-        status = "contradicted"
+    if sim >= VECTOR_SUPPORTED_SIM:
+        status = Status.SUPPORTED
+    elif sim <= VECTOR_CONTRADICTED_SIM:
+        status = Status.CONTRADICTED
     else:
-        status = "uncertain"
+        status = Status.UNCERTAIN
 
-    return {
-        "status": status,
-        "confidence": sim,
-        "evidence": best_text[:500],
-        "source": "vector",
-    }
+    chunk_id = chunk_key(best_text, meta)
+    if evidence is not None:
+        evidence.add_chunk(chunk_id, best_text)
+    return Score(status, sim, Source.VECTOR, chunk_id)
 
 
-def _fuse(rel: Dict[str, object], vec: Dict[str, object]) -> VerificationRecord:
-    if rel["status"] != "uncertain":
-        base_status = str(rel["status"])
-        base_conf = float(rel["confidence"])
-        vec_status = str(vec["status"])
-        vec_conf = float(vec["confidence"])
-
-        if base_status == "supported" and vec_status == "contradicted" and vec_conf > 0.7:
-            status = "uncertain"
-            conf = (base_conf + vec_conf) / 2
+def _fuse(rel: Score, vec: Score) -> ClaimVerdict:
+    if rel.status is not Status.UNCERTAIN:
+        if (
+            rel.status is Status.SUPPORTED
+            and vec.status is Status.CONTRADICTED
+            and vec.confidence > VECTOR_OVERRIDE_CONF
+        ):
+            status = Status.UNCERTAIN
+            conf = (rel.confidence + vec.confidence) / 2
         else:
-            status = base_status
-            conf = max(base_conf, vec_conf)
+            status = rel.status
+            conf = max(rel.confidence, vec.confidence)
+        source = Source.MIXED
+    else:
+        status = vec.status
+        conf = vec.confidence
+        source = Source.VECTOR
 
-        evidence = f"{rel['evidence']}\n\nVector evidence:\n{vec['evidence']}"
-        source = "mixed"
+    return ClaimVerdict("", status, float(round(conf, 3)), source, rel.key, vec.key)
+
+
+def _relational_only(rel: Score) -> ClaimVerdict:
+    """Verdict for a claim scored while the vector store is still warming up."""
+    return ClaimVerdict("", rel.status, float(round(rel.confidence, 3)), Source.RELATIONAL, rel.key)
+
+
+def _verify_single_claim(
+    claim: str,
+    rel: IPCBNSRelationalStore,
+    vec: Optional[IPCBNSVectorStore],
+    evidence: Optional[EvidenceTable] = None,
+) -> ClaimVerdict:
+    """Verify a single claim using both stores (relational only if *vec* is None)."""
+    rel_score = _score_relational(claim, rel, evidence)
+    if vec is None:
+        fused = _relational_only(rel_score)
     else:
-        status = str(vec["status"])
-        conf = float(vec["confidence"])
-        evidence = str(vec["evidence"])
-        source = "vector"
+        sections = [rel_score.key] if rel_score.key and _section_filter_enabled() else None
+        vec_score = _score_vector(claim, vec, evidence, sections)
+        fused = _fuse(rel_score, vec_score)
+    fused.claim = claim
+    return fused
+
+
+def summarize_verifications(verdicts: Sequence[ClaimVerdict]) -> Dict[str, Any]:
+    """Overall verdict and counts for a list of claim verdicts (one pass)."""
+    counts = [0, 0, 0]  # indexed by Status
+    conf_sum = 0.0
+    for v in verdicts:
+        counts[v.status] += 1
+        conf_sum += v.confidence
+    supported, contradicted, uncertain = counts
+    total = len(verdicts)
+    avg_conf = conf_sum / total if total else 0.0
+
+    if total == 0:
+        overall = "no_claims"
+    elif contradicted > 0:
+        overall = "unreliable"
+    elif supported / max(total, 1) >= RELIABLE_SUPPORTED_SHARE and avg_conf >= RELIABLE_AVG_CONF:
+        overall = "reliable"
+    else:
+        overall = "uncertain"
 
     return {
-        "claim": "",
-        "status": status,  # type: ignore[assignment]
-        "confidence": float(round(conf, 3)),
-        "evidence": evidence,
-        "source": source,
+        "overall_status": overall,
+        "average_confidence": float(round(avg_conf, 3)),
+        "supported_claims": supported,
+        "contradicted_claims": contradicted,
+        "uncertain_claims": uncertain,
+        "total_claims": total,
     }
 
 
+# ── Vectorized path (bulk re-verification) ──────────────────────────────
+#
+# Same semantics as _vector_verdict / _fuse / _relational_only /
+# summarize_verifications, bit for bit (tests/test_fusion.py), over
+# NumPy arrays of Status codes and confidences.
+
+_STATUSES = tuple(Status)
+_SOURCES = tuple(Source)
+_OVERALL = ("no_claims", "unreliable", "reliable", "uncertain")
 
-def _verify_single_claim(
-    claim: str, rel: IPCBNSRelationalStore, vec: IPCBNSVectorStore
-) -> VerificationRecord:
-    """Verify a single claim using both stores."""
-    rel_score = _score_relational(claim, rel)
-    vec_score = _score_vector(claim, vec)
-    fused = _fuse(rel_score, vec_score)
-    fused["claim"] = claim
-    return fused
+
+def _round3(values: np.ndarray) -> np.ndarray:
+    """``round(x, 3)`` elementwise: ``np.round`` except within float error of a tie."""
+    out = np.round(values, 3)
+    scaled = values * 1000.0
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        idx = np.flatnonzero(near_tie)
+        out[idx] = [round(v, 3) for v in values[idx].tolist()]
+    return out
+
+
+def vector_arrays(dists: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Status codes and similarities from best-hit distances (NaN = no hit)."""
+    missing = np.isnan(dists)
+    sim = np.where(missing, 0.0, np.clip(1.0 - np.where(missing, 1.0, dists), 0.0, 1.0))
+    status = np.where(
+        sim >= VECTOR_SUPPORTED_SIM,
+        Status.SUPPORTED,
+        np.where(sim <= VECTOR_CONTRADICTED_SIM, Status.CONTRADICTED, Status.UNCERTAIN),
+    )
+    status[missing] = Status.UNCERTAIN
+    return status.astype(np.int8), sim
+
+
+def fuse_arrays(
+    rel_status: np.ndarray, rel_conf: np.ndarray, vec_status: np.ndarray, vec_conf: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``_fuse`` over arrays; returns (status, rounded confidence, source) codes."""
+    rel_known = rel_status != Status.UNCERTAIN
+    override = (
+        (rel_status == Status.SUPPORTED)
+        & (vec_status == Status.CONTRADICTED)
+        & (vec_conf > VECTOR_OVERRIDE_CONF)
+    )
+    status = np.where(rel_known, np.where(override, Status.UNCERTAIN, rel_status), vec_status)
+    conf = np.where(
+        rel_known,
+        np.where(override, (rel_conf + vec_conf) / 2, np.maximum(rel_conf, vec_conf)),
+        vec_conf,
+    )
+    source = np.where(rel_known, Source.MIXED, Source.VECTOR)
+    return status.astype(np.int8), _round3(conf), source.astype(np.int8)
+
+
+def summarize_arrays(
+    status: np.ndarray, conf: np.ndarray, groups: Optional[np.ndarray] = None, n_groups: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    ``summarize_verifications`` for *n_groups* answers at once; ``groups``
+    maps each claim to its answer (all claims in one answer if omitted).
+    """
+    if groups is None:
+        groups = np.zeros(len(status), dtype=np.int64)
+    counts = np.bincount(groups * 3 + status, minlength=3 * n_groups).reshape(n_groups, 3)
+    totals = counts.sum(axis=1)
+    # bincount adds weights in input order, matching the sequential sum above.
+    conf_sums = np.bincount(groups, weights=conf, minlength=n_groups)
+    avg = np.divide(conf_sums, totals, out=np.zeros(n_groups), where=totals > 0)
+    reliable = (
+        (counts[:, Status.SUPPORTED] / np.maximum(totals, 1) >= RELIABLE_SUPPORTED_SHARE)
+        & (avg >= RELIABLE_AVG_CONF)
+    )
+    overall = np.select([totals == 0, counts[:, Status.CONTRADICTED] > 0, reliable], [0, 1, 2], 3)
+    return [
+        {
+            "overall_status": _OVERALL[code],
+            "average_confidence": avg_conf,
+            "supported_claims": supported,
+            "contradicted_claims": contradicted,
+            "uncertain_claims": uncertain,
+            "total_claims": total,
+        }
+        for code, avg_conf, (supported, contradicted, uncertain), total in zip(
+            overall.tolist(), _round3(avg).tolist(), counts.tolist(), totals.tolist()
+        )
+    ]
+
+
+def verify_claims(
+    claims: List[str],
+    rel: IPCBNSRelationalStore,
+    vec: Optional[IPCBNSVectorStore],
+    evidence: Optional[EvidenceTable] = None,
+) -> List[ClaimVerdict]:
+    """
+    Bulk ``_verify_single_claim``: one relational ``IN`` query, one batched
+    embedding + Chroma query and array fusion for all *claims*, same
+    verdicts. Pass an ``EvidenceTable`` to keep the evidence for rendering.
+    """
+    n = len(claims)
+    sections = [_extract_sections(c) for c in claims]
+    records = rel.get_many_by_ipc([secs[0] for secs in sections if secs])
+
+    rel_status = np.empty(n, dtype=np.int8)
+    rel_conf = np.empty(n, dtype=np.float64)
+    rel_keys: List[Optional[str]] = []
+    for i, claim in enumerate(claims):
+        ipc = sections[i][0] if sections[i] else None
+        score = _relational_verdict(claim, ipc, records.get(ipc) if ipc else None, evidence)
+        rel_status[i], rel_conf[i] = score.status, score.confidence
+        rel_keys.append(score.key)
+
+    if vec is None:
+        status, conf = rel_status, _round3(rel_conf)
+        source = np.full(n, Source.RELATIONAL, dtype=np.int8)
+        vec_keys: List[Optional[str]] = [None] * n
+    else:
+        if not n:
+            hits = []
+        elif _section_filter_enabled():
+            hits = vec.query_many(claims, k=3, sections=[[key] if key else None for key in rel_keys])
+        else:
+            hits = vec.query_many(claims, k=3)
+        dists = np.array([h[0][2] if h else np.nan for h in hits], dtype=np.float64)
+        vec_keys = []
+        for h in hits:
+            if not h:
+                vec_keys.append(None)
+                continue
+            key = chunk_key(h[0][0], h[0][1])
+            if evidence is not None:
+                evidence.add_chunk(key, h[0][0])
+            vec_keys.append(key)
+        vec_status, vec_conf = vector_arrays(dists)
+        status, conf, source = fuse_arrays(rel_status, rel_conf, vec_status, vec_conf)
+
+    return [
+        ClaimVerdict(claim, _STATUSES[s], c, _SOURCES[src], rk, vk)
+        for claim, s, c, src, rk, vk in zip(
+            claims, status.tolist(), conf.tolist(), source.tolist(), rel_keys, vec_keys
+        )
+    ]
 
 
 async def verifier_node(state: VerificationState) -> dict:
@@ -126,6 +324,7 @@ async def verifier_node(state: VerificationState) -> dict:
         logger.info("Verifier: skipping (direct route)")
         return {
             "verifications": [],
+            "evidence": {},
             "final_result": {
                 "overall_status": "direct_answer",
                 "average_confidence": 1.0,
@@ -138,42 +337,33 @@ async def verifier_node(state: VerificationState) -> dict:
 
     claims = state.get("claims", [])
     logger.info("Verifying %d claims", len(claims))
-    stores = StoreManager()
+    # Never block a request on the vector build: if warm-up hasn't finished,
+    # kick it off in the background and verify against SQLite only (after a
+    # failure, StoreManager waits out its retry backoff instead).
+    stores = StoreManager().warmup(background=True)
     rel, vec = stores.relational, stores.vector
+    if vec is None:
+        logger.warning("Verifier: vector store not ready, using relational-only verification")
 
-    # Verify all claims (stores are pre-initialized for fast access)
-    verifications: List[VerificationRecord] = [
-        _verify_single_claim(claim, rel, vec) for claim in claims
-    ]
-
-    supported = sum(1 for v in verifications if v["status"] == "supported")
-    contradicted = sum(1 for v in verifications if v["status"] == "contradicted")
-    uncertain = sum(1 for v in verifications if v["status"] == "uncertain")
-    total = len(verifications)
-    avg_conf = sum(v["confidence"] for v in verifications) / total if total else 0.0
-
-    if total == 0:
-        overall = "no_claims"
-    elif contradicted > 0:
-        overall = "unreliable"
-    elif supported / max(total, 1) >= 0.7 and avg_conf >= 0.75:
-        overall = "reliable"
-    else:
-        overall = "uncertain"
+    evidence = EvidenceTable()
+    verdicts = [_verify_single_claim(claim, rel, vec, evidence) for claim in claims]
+    verifications: List[VerificationRecord] = [v.to_dict() for v in verdicts]
 
+    final = summarize_verifications(verdicts)
+    calibrator = get_calibrator()
+    if calibrator is not None:
+        final = calibrator.apply(final, verdicts)
     logger.info(
         "Verification complete: overall=%s, supported=%d, contradicted=%d, uncertain=%d, avg_conf=%.3f",
-        overall, supported, contradicted, uncertain, avg_conf,
+        final["overall_status"], final["supported_claims"], final["contradicted_claims"],
+        final["uncertain_claims"], final["average_confidence"],
     )
 
     return {
         "verifications": verifications,
+        "evidence": evidence.to_dict(verdicts),
         "final_result": {
-            "overall_status": overall,
-            "average_confidence": float(round(avg_conf, 3)),
-            "supported_claims": supported,
-            "contradicted_claims": contradicted,
-            "uncertain_claims": uncertain,
-            "total_claims": total,
+            **final,
+            "verification_mode": "full" if vec is not None else "relational_only",
         },
     }
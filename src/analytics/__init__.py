@@ -0,0 +1 @@
+# Offline analytics over the evaluation log (Parquet compaction + stats).
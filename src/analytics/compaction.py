@@ -0,0 +1,258 @@
+"""
+Compact ``eval_log.jsonl`` into a date-partitioned Parquet dataset.
+
+Rotated segments (``eval_log.jsonl.1`` … written by the log sink) are
+first renamed to unique ``.compacting-*`` names under the sink's file
+lock, so a rotation during compaction cannot shift a segment that was
+not compacted onto a name that is about to be deleted. They are then
+streamed in fixed-size chunks, flattened to a fixed schema and appended
+to ``data/eval_parquet/date=YYYY-MM-DD/``. The schema keeps the question,
+answer, claims and claim verdicts, which re-verification
+(``src.agents.reverify``) and calibration training read back.
+
+Each segment is written atomically: its rows go to hidden temp files
+(ignored by dataset readers) that are renamed to
+``part-<segment content hash>.parquet`` once the whole segment is
+written. A marker in ``_segments/`` then records the hash, and only
+after that is the segment deleted. If a crash leaves the segment behind,
+the next run either finds the marker and just deletes the segment, or
+rewrites the same file names. Either way no row is written twice.
+Compacted segments are deleted, so the JSONL footprint stays bounded by
+the sink's rotation settings.
+
+CLI:
+    python -m src.analytics.compaction                 # rotated segments only
+    python -m src.analytics.compaction --include-active
+"""
+
+import argparse
+import glob
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from filelock import FileLock
+
+from src.agents.utils import extract_text, question_hash
+from src.config import paths
+
+logger = logging.getLogger(__name__)
+
+# evaluation_node writes the log, so its own timing is never in it.
+TIMED_NODES = ("planner", "primary_llm", "claim_extractor", "verifier", "human_validation")
+
+VERIFICATION_TYPE = pa.struct(
+    [("claim", pa.string()), ("status", pa.string()), ("confidence", pa.float64()), ("source", pa.string())]
+)
+
+SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.string()),
+        ("question_hash", pa.string()),
+        ("route", pa.string()),
+        ("overall_status", pa.string()),
+        ("average_confidence", pa.float64()),
+        ("supported", pa.int32()),
+        ("contradicted", pa.int32()),
+        ("uncertain", pa.int32()),
+        ("total", pa.int32()),
+        ("wall_s", pa.float64()),
+        ("prompt_tokens", pa.int64()),
+        ("completion_tokens", pa.int64()),
+        ("retries", pa.int32()),
+    ]
+    + [(f"{node}_s", pa.float64()) for node in TIMED_NODES]
+    + [
+        ("calibrated_confidence", pa.float64()),
+        ("question", pa.string()),
+        ("llm_answer", pa.string()),
+        ("claims", pa.list_(pa.string())),
+        ("verifications", pa.list_(VERIFICATION_TYPE)),
+        ("date", pa.string()),
+    ]
+)
+# Files inside a ``date=`` directory carry every column but the partition key.
+PARTITION_SCHEMA = pa.schema([f for f in SCHEMA if f.name != "date"])
+
+
+def flatten_record(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """Map one eval-log record onto ``SCHEMA`` (missing fields → None)."""
+    counts = rec.get("counts") or {}
+    totals = rec.get("totals") or {}
+    timings = rec.get("timings") or {}
+    ts = rec.get("timestamp") or ""
+    answer = rec.get("llm_answer")
+    if answer is not None and not isinstance(answer, str):
+        answer = extract_text(answer)
+    row: Dict[str, Any] = {
+        "timestamp": ts,
+        "question_hash": rec.get("question_hash") or question_hash(rec.get("question") or ""),
+        "route": rec.get("route"),
+        "overall_status": rec.get("overall_status"),
+        "average_confidence": rec.get("average_confidence"),
+        "supported": counts.get("supported"),
+        "contradicted": counts.get("contradicted"),
+        "uncertain": counts.get("uncertain"),
+        "total": counts.get("total"),
+        "wall_s": totals.get("wall_s"),
+        "prompt_tokens": totals.get("prompt_tokens"),
+        "completion_tokens": totals.get("completion_tokens"),
+        "retries": totals.get("retries"),
+        "calibrated_confidence": rec.get("calibrated_confidence"),
+        "question": rec.get("question"),
+        "llm_answer": answer,
+        "claims": rec.get("claims"),
+        "verifications": [
+            {k: v.get(k) for k in ("claim", "status", "confidence", "source")}
+            for v in rec.get("verifications") or []
+        ] if rec.get("verifications") is not None else None,
+        "date": ts[:10] or "unknown",
+    }
+    for node in TIMED_NODES:
+        row[f"{node}_s"] = (timings.get(node) or {}).get("duration_s")
+    return row
+
+
+def iter_jsonl_batches(path: str, chunk_rows: int = 50_000) -> Iterator[pa.RecordBatch]:
+    """Stream a JSONL file as flattened record batches of ``chunk_rows``."""
+    rows: List[Dict[str, Any]] = []
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                rows.append(flatten_record(orjson.loads(line)))
+            except orjson.JSONDecodeError:
+                continue
+            if len(rows) >= chunk_rows:
+                yield pa.RecordBatch.from_pylist(rows, schema=SCHEMA)
+                rows = []
+    if rows:
+        yield pa.RecordBatch.from_pylist(rows, schema=SCHEMA)
+
+
+def _segments(source: str) -> List[str]:
+    """Rotated segments, oldest first (``.5`` before ``.1``)."""
+    found = [p for p in glob.glob(source + ".*") if p.rsplit(".", 1)[-1].isdigit()]
+    return sorted(found, key=lambda p: int(p.rsplit(".", 1)[-1]), reverse=True)
+
+
+def _detach(source: str, include_active: bool) -> List[str]:
+    """
+    Move the rotated segments (oldest first) and, with *include_active*,
+    the active log to unique ``.compacting-*`` names under the sink's lock.
+
+    The sink renames ``.1`` → ``.2`` … when it rotates, so segments are
+    only ever compacted and deleted under names it no longer touches.
+    """
+    stamp = f"{time.time_ns():020d}-{os.getpid()}"
+    detached = []
+    with FileLock(source + ".lock"):
+        segments = _segments(source)
+        if include_active and os.path.exists(source) and os.path.getsize(source) > 0:
+            segments.append(source)
+        for i, segment in enumerate(segments):
+            name = f"{source}.compacting-{stamp}-{i:04d}"
+            os.replace(segment, name)
+            detached.append(name)
+    return detached
+
+
+def _content_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+def _marker(dest: str, digest: str) -> str:
+    return os.path.join(dest, "_segments", digest)
+
+
+def _write_segment(segment: str, dest: str, basename: str, chunk_rows: int) -> int:
+    """Write *segment* as ``<dest>/date=*/<basename>``, all partitions or none."""
+    writers: Dict[str, pq.ParquetWriter] = {}
+    temps: Dict[str, str] = {}
+    rows = 0
+    try:
+        for batch in iter_jsonl_batches(segment, chunk_rows):
+            table = pa.Table.from_batches([batch])
+            dates = table.column("date")
+            for date in pc.unique(dates).to_pylist():
+                if date not in writers:
+                    part_dir = os.path.join(dest, f"date={date}")
+                    os.makedirs(part_dir, exist_ok=True)
+                    temps[date] = os.path.join(part_dir, f".{basename}.tmp")
+                    writers[date] = pq.ParquetWriter(temps[date], PARTITION_SCHEMA)
+                part = table.filter(pc.equal(dates, date)).drop_columns(["date"])
+                writers[date].write_table(part)
+            rows += batch.num_rows
+        for writer in writers.values():
+            writer.close()
+    except BaseException:
+        for date, writer in writers.items():
+            writer.close()
+            os.remove(temps[date])
+        raise
+    for date, tmp in temps.items():
+        os.replace(tmp, os.path.join(os.path.dirname(tmp), basename))
+    return rows
+
+
+def compact_eval_log(
+    source: str = paths.EVAL_LOG,
+    dest: str = paths.EVAL_PARQUET_DIR,
+    include_active: bool = False,
+    chunk_rows: int = 50_000,
+    keep_source: bool = False,
+) -> int:
+    """
+    Append log segments to the Parquet dataset; returns rows written.
+
+    With *keep_source* the segments stay behind as ``.compacting-*`` files
+    and are only deleted (not rewritten) by the next run.
+    """
+    # Leftovers of an interrupted run sort before this run's segments.
+    leftovers = sorted(glob.glob(source + ".compacting-*"))
+    segments = leftovers + _detach(source, include_active)
+
+    written = 0
+    for segment in segments:
+        digest = _content_hash(segment)
+        marker = _marker(dest, digest)
+        if os.path.exists(marker):
+            logger.info("Skipping %s: already compacted (%s)", segment, digest)
+        else:
+            seg_rows = _write_segment(segment, dest, f"part-{digest}.parquet", chunk_rows)
+            os.makedirs(os.path.dirname(marker), exist_ok=True)
+            with open(marker, "w", encoding="utf-8") as f:
+                f.write(f"{os.path.basename(segment)} {seg_rows}\n")
+            written += seg_rows
+            logger.info("Compacted %d rows from %s", seg_rows, segment)
+        if not keep_source:
+            os.remove(segment)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compact eval_log.jsonl into Parquet.")
+    parser.add_argument("--source", default=paths.EVAL_LOG)
+    parser.add_argument("--dest", default=paths.EVAL_PARQUET_DIR)
+    parser.add_argument("--include-active", action="store_true",
+                        help="Also compact the file currently being written.")
+    parser.add_argument("--keep-source", action="store_true")
+    args = parser.parse_args(argv)
+
+    n = compact_eval_log(args.source, args.dest, args.include_active, keep_source=args.keep_source)
+    print(f"[compaction] Wrote {n} rows to {args.dest}")
+
+
+if __name__ == "__main__":
+    main()
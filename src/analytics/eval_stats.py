@@ -0,0 +1,164 @@
+"""
+Streaming analytics over the compacted evaluation log.
+
+Everything is computed batch by batch from the Parquet dataset (plus,
+optionally, the not-yet-compacted JSONL), so memory stays flat regardless
+of row count: counts are summed, confidence goes into a fixed 20-bin
+histogram and latencies into log-spaced histograms from which percentiles
+are interpolated.
+
+Usage:
+    from src.analytics.eval_stats import compute_stats
+
+    stats = compute_stats(start_date="2026-01-01")
+    stats["latency"]["total"]["p95"]
+"""
+
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from src.analytics.compaction import SCHEMA, TIMED_NODES, iter_jsonl_batches
+from src.config import paths
+
+CONFIDENCE_EDGES = np.linspace(0.0, 1.0, 21)
+# 1 ms … ~20 min, 20 bins per decade (≈12% relative error per bin).
+LATENCY_EDGES = np.logspace(-3, 3.1, 123)
+PERCENTILES = (50, 90, 95, 99)
+
+# Latency column → label used in the result ("total" is end-to-end wall time).
+LATENCY_LABELS = {"wall_s": "total", **{f"{node}_s": node for node in TIMED_NODES}}
+LATENCY_COLUMNS = list(LATENCY_LABELS)
+COLUMNS = ["route", "overall_status", "average_confidence", "retries", "prompt_tokens",
+           "completion_tokens"] + LATENCY_COLUMNS
+
+
+def _percentiles(counts: np.ndarray, edges: np.ndarray, qs: Sequence[int]) -> Dict[str, Optional[float]]:
+    total = counts.sum()
+    if total == 0:
+        return {f"p{q}": None for q in qs}
+    cum = np.cumsum(counts)
+    out: Dict[str, Optional[float]] = {}
+    for q in qs:
+        target = total * q / 100.0
+        i = int(np.searchsorted(cum, target))
+        i = min(i, len(counts) - 1)
+        prev = cum[i - 1] if i > 0 else 0
+        frac = (target - prev) / counts[i] if counts[i] else 0.0
+        # Geometric interpolation inside the (log-spaced) bin.
+        lo, hi = edges[i], edges[i + 1]
+        out[f"p{q}"] = float(lo * (hi / lo) ** frac)
+    return out
+
+
+class _Accumulator:
+    def __init__(self):
+        self.rows = 0
+        self.routes: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.confidence = np.zeros(len(CONFIDENCE_EDGES) - 1, dtype=np.int64)
+        self.latency = {c: np.zeros(len(LATENCY_EDGES) - 1, dtype=np.int64) for c in LATENCY_COLUMNS}
+        self.tokens = 0
+        self.retries = 0
+
+    @staticmethod
+    def _counts(column: pa.Array) -> Dict[str, int]:
+        vc = pc.value_counts(column.fill_null("unknown"))
+        return dict(zip(vc.field("values").to_pylist(), vc.field("counts").to_pylist()))
+
+    @staticmethod
+    def _values(column: pa.Array) -> np.ndarray:
+        return column.drop_null().to_numpy(zero_copy_only=False).astype(np.float64)
+
+    def update(self, batch: pa.RecordBatch) -> None:
+        self.rows += batch.num_rows
+        self.routes.update(self._counts(batch.column("route")))
+        self.statuses.update(self._counts(batch.column("overall_status")))
+        conf = np.clip(self._values(batch.column("average_confidence")), 0.0, 1.0)
+        self.confidence += np.histogram(conf, bins=CONFIDENCE_EDGES)[0]
+        for c in LATENCY_COLUMNS:
+            vals = np.clip(self._values(batch.column(c)), LATENCY_EDGES[0], LATENCY_EDGES[-1])
+            self.latency[c] += np.histogram(vals, bins=LATENCY_EDGES)[0]
+        for c in ("prompt_tokens", "completion_tokens"):
+            self.tokens += int(pc.sum(batch.column(c)).as_py() or 0)
+        self.retries += int(pc.sum(batch.column("retries")).as_py() or 0)
+
+    def result(self) -> Dict[str, Any]:
+        def share(counter: Counter) -> Dict[str, Dict[str, float]]:
+            total = sum(counter.values()) or 1
+            return {k: {"count": v, "share": round(v / total, 4)} for k, v in counter.most_common()}
+
+        return {
+            "rows": self.rows,
+            "route_mix": share(self.routes),
+            "status_distribution": share(self.statuses),
+            "confidence_histogram": {
+                "edges": [round(float(e), 3) for e in CONFIDENCE_EDGES],
+                "counts": self.confidence.tolist(),
+            },
+            "latency": {
+                LATENCY_LABELS[c]: {
+                    "count": int(self.latency[c].sum()),
+                    **_percentiles(self.latency[c], LATENCY_EDGES, PERCENTILES),
+                }
+                for c in LATENCY_COLUMNS
+            },
+            "total_tokens": self.tokens,
+            "total_retries": self.retries,
+        }
+
+
+def _dataset_batches(
+    dataset_dir: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    batch_size: int,
+) -> Iterable[pa.RecordBatch]:
+    if not os.path.isdir(dataset_dir):
+        return []
+    # Explicit schema: files compacted before a column existed read it as null.
+    partitioning = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(dataset_dir, schema=SCHEMA, format="parquet", partitioning=partitioning)
+    expr = None
+    if start_date:
+        expr = ds.field("date") >= start_date
+    if end_date:
+        cond = ds.field("date") <= end_date
+        expr = cond if expr is None else expr & cond
+    return dataset.to_batches(columns=COLUMNS, filter=expr, batch_size=batch_size)
+
+
+def compute_stats(
+    dataset_dir: str = paths.EVAL_PARQUET_DIR,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    include_jsonl: bool = False,
+    batch_size: int = 65_536,
+) -> Dict[str, Any]:
+    """
+    Route mix, status distribution, confidence histogram and latency
+    percentiles over the eval log, streamed by record batch.
+
+    ``include_jsonl`` also folds in the active (uncompacted) ``eval_log.jsonl``.
+    """
+    acc = _Accumulator()
+    for batch in _dataset_batches(dataset_dir, start_date, end_date, batch_size):
+        acc.update(batch)
+    if include_jsonl and os.path.exists(paths.EVAL_LOG):
+        for batch in iter_jsonl_batches(paths.EVAL_LOG, batch_size):
+            if start_date or end_date:
+                dates = batch.column("date")
+                mask = None
+                if start_date:
+                    mask = pc.greater_equal(dates, start_date)
+                if end_date:
+                    upper = pc.less_equal(dates, end_date)
+                    mask = upper if mask is None else pc.and_(mask, upper)
+                batch = batch.filter(mask)
+            acc.update(batch.select(COLUMNS))
+    return acc.result()
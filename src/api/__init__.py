@@ -0,0 +1 @@
+# HTTP API (ASGI app served by uvicorn).
@@ -0,0 +1,424 @@
+"""
+HTTP API for the guardrail (raw ASGI, served by uvicorn).
+
+    POST /verify          {"question": "...", "provider"?: "...", "model"?: "..."}
+    POST /verify/batch    {"questions": ["...", ...], "provider"?, "model"?}
+    POST /verify/stream   same body as /verify; Server-Sent Events: ``thread``
+                          first when checkpointing is on, one ``node``
+                          event per finished graph node, then ``result``
+                          (or ``error``)
+    POST /verify/resume   {"thread_id": "...", "from_node"?: "verifier"}; needs
+                          ``checkpointing.enabled`` (see ``resume_workflow``)
+    GET  /healthz         store readiness and current load
+
+Each worker process compiles the graph once (``workflow.get_workflow``)
+and warms the ``StoreManager`` singleton once, in the ASGI lifespan
+startup. Requests are bounded per worker: at most ``api.max_concurrency``
+workflows run at a time, up to ``api.max_queue`` more wait for a slot,
+and anything beyond that gets ``503`` with ``Retry-After`` instead of
+piling up. Each workflow is cut off after ``api.request_timeout_s``
+(``504``). With checkpointing on, ``500`` / ``504`` bodies (and stream
+``error`` events) carry the run's ``thread_id`` for ``/verify/resume``.
+
+    python -m src.api.server --workers 4
+    uvicorn src.api.server:app --workers 4      # equivalent
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from langgraph.graph import END
+
+from src.agents.calibration import get_calibrator
+from src.config import init_data_dirs, settings
+from src.graph.state import VerificationState
+from src.graph.workflow import (
+    WorkflowError,
+    _resume_workflow_async,
+    _run_workflow_async,
+    _stream_workflow_async,
+    get_workflow,
+)
+from src.observability.tracing import init_tracing
+from src.rag.store_manager import StoreManager
+from src.storage.log_sink import close_all
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# State keys returned to clients; the rest is internal.
+_RESULT_KEYS = (
+    "question", "llm_provider", "llm_model", "thread_id", "plan", "route", "llm_answer", "claims",
+    "verifications", "evidence", "final_result", "needs_human", "human_feedback", "evaluation", "metadata",
+)
+
+
+class HTTPError(Exception):
+    def __init__(
+        self,
+        status: int,
+        detail: str,
+        headers: Optional[Dict[str, str]] = None,
+        thread_id: Optional[str] = None,
+    ):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.headers = headers or {}
+        self.thread_id = thread_id
+
+    def payload(self) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"error": self.detail}
+        if self.thread_id:
+            body["thread_id"] = self.thread_id
+        return body
+
+
+# ── Admission control ────────────────────────────────────────────────────────
+
+
+class Admission:
+    """
+    Per-worker concurrency limit with a bounded wait queue.
+
+    ``admit(n)`` reserves queue places synchronously (so a burst arriving
+    in one loop tick is counted) or raises 503; each ``slot()`` then uses
+    one reservation while it waits for a free slot.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.running = 0
+        self.waiting = 0
+        self._sem = asyncio.Semaphore(max_concurrency)
+
+    def admit(self, n: int = 1) -> None:
+        free = max(0, self.max_concurrency - self.running)
+        if self.waiting + n - free > self.max_queue:
+            raise HTTPError(503, "Server busy, retry later.", {"Retry-After": "1"})
+        self.waiting += n
+
+    def release(self, n: int = 1) -> None:
+        """Give back reservations that will never reach ``slot()``."""
+        self.waiting -= n
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._sem.release()
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _to_json(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _public(state: VerificationState) -> Dict[str, Any]:
+    return {k: state[k] for k in _RESULT_KEYS if k in state}
+
+
+async def _read_json(receive: Receive, max_bytes: int) -> Dict[str, Any]:
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(499, "Client disconnected.")
+        body.extend(message.get("body", b""))
+        if len(body) > max_bytes:
+            raise HTTPError(413, f"Request body exceeds {max_bytes} bytes.")
+        if not message.get("more_body"):
+            break
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "Body must be JSON.")
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Body must be a JSON object.")
+    return data
+
+
+def _question(value: Any) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise HTTPError(422, "'question' must be a non-empty string.")
+    return value.strip()
+
+
+def _llm_args(body: Dict[str, Any]) -> Tuple[str, str]:
+    return (
+        str(body.get("provider") or settings["llm"]["provider"]),
+        str(body.get("model") or settings["llm"]["model"]),
+    )
+
+
+async def _send_json(send: Send, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+    body = _to_json(payload)
+    raw_headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    raw_headers += [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _wait_disconnect(receive: Receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+def _sse(event: str, data: Any) -> Dict[str, Any]:
+    return {"type": "http.response.body", "body": b"event: " + event.encode() + b"\ndata: " + _to_json(data) + b"\n\n",
+            "more_body": True}
+
+
+# ── Application ──────────────────────────────────────────────────────────────
+
+
+class GuardrailAPI:
+    """ASGI app; one instance per worker process."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        cfg = config if config is not None else settings.get("api", {})
+        self.timeout_s: float = float(cfg.get("request_timeout_s", 60.0))
+        self.max_batch: int = int(cfg.get("max_batch", 20))
+        self.max_body_bytes: int = int(cfg.get("max_body_bytes", 65536))
+        self.max_concurrency: int = int(cfg.get("max_concurrency", 16))
+        self.max_queue: int = int(cfg.get("max_queue", 64))
+        self.admission: Optional[Admission] = None
+        self.routes: Dict[Tuple[str, str], Callable[[Scope, Receive, Send], Awaitable[None]]] = {
+            ("POST", "/verify"): self.verify,
+            ("POST", "/verify/batch"): self.verify_batch,
+            ("POST", "/verify/stream"): self.verify_stream,
+            ("POST", "/verify/resume"): self.verify_resume,
+            ("GET", "/healthz"): self.healthz,
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        handler = self.routes.get((scope["method"], scope["path"]))
+        try:
+            if handler is None:
+                if any(path == scope["path"] for _, path in self.routes):
+                    raise HTTPError(405, "Method not allowed.")
+                raise HTTPError(404, "Not found.")
+            await handler(scope, receive, send)
+        except HTTPError as e:
+            await _send_json(send, e.status, e.payload(), e.headers)
+        except WorkflowError as e:
+            logger.error("API: %s %s failed: %s", scope["method"], scope["path"], e, exc_info=True)
+            await _send_json(send, 500, {"error": "Internal error.", "thread_id": e.thread_id})
+        except Exception as e:
+            logger.error("API: %s %s failed: %s", scope["method"], scope["path"], e, exc_info=True)
+            await _send_json(send, 500, {"error": "Internal error."})
+
+    # ── Lifespan ─────────────────────────────────────────────────────────
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    logger.error("API: startup failed: %s", e, exc_info=True)
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.to_thread(self.shutdown)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def startup(self) -> None:
+        """Per-process init: data dirs, tracing, stores; the graph compiles on first use."""
+        load_dotenv()
+        init_data_dirs()
+        init_tracing()
+        self.admission = Admission(self.max_concurrency, self.max_queue)
+        # Relational store opens now; the vector store loads off-thread and
+        # the verifier degrades to relational-only until it is ready.
+        await asyncio.to_thread(StoreManager().warmup, True)
+        await asyncio.to_thread(get_calibrator)
+        logger.info("API worker ready (max_concurrency=%d, max_queue=%d)", self.max_concurrency, self.max_queue)
+
+    def shutdown(self) -> None:
+        StoreManager().close()
+        close_all()
+
+    # ── Handlers ─────────────────────────────────────────────────────────
+
+    async def _run_one(self, question: str, provider: str, model: str) -> VerificationState:
+        """Run one admitted workflow under the request timeout."""
+        run: Dict[str, Any] = {}
+        try:
+            async with asyncio.timeout(self.timeout_s):
+                async with self.admission.slot():  # type: ignore[union-attr]
+                    return await _run_workflow_async(question, provider, model, run)
+        except TimeoutError:
+            raise HTTPError(
+                504, f"Verification did not finish within {self.timeout_s:g}s.", thread_id=run.get("thread_id")
+            )
+
+    async def verify(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body = await _read_json(receive, self.max_body_bytes)
+        question = _question(body.get("question"))
+        self.admission.admit()  # type: ignore[union-attr]
+        t0 = time.perf_counter()
+        state = await self._run_one(question, *_llm_args(body))
+        await _send_json(send, 200, {**_public(state), "elapsed_s": round(time.perf_counter() - t0, 3)})
+
+    async def verify_resume(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body = await _read_json(receive, self.max_body_bytes)
+        thread_id = body.get("thread_id")
+        if not isinstance(thread_id, str) or not thread_id:
+            raise HTTPError(422, "'thread_id' must be a non-empty string.")
+        from_node = body.get("from_node")
+        if not settings["checkpointing"].get("enabled", False):
+            raise HTTPError(409, "Checkpointing is disabled on this server.")
+        self.admission.admit()  # type: ignore[union-attr]
+        t0 = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout_s):
+                async with self.admission.slot():  # type: ignore[union-attr]
+                    state = await _resume_workflow_async(thread_id, from_node)
+        except TimeoutError:
+            raise HTTPError(504, f"Verification did not finish within {self.timeout_s:g}s.")
+        except ValueError as e:
+            raise HTTPError(404, str(e))
+        await _send_json(send, 200, {**_public(state), "elapsed_s": round(time.perf_counter() - t0, 3)})
+
+    async def verify_batch(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body = await _read_json(receive, self.max_body_bytes)
+        questions = body.get("questions")
+        if not isinstance(questions, list) or not questions:
+            raise HTTPError(422, "'questions' must be a non-empty list.")
+        if len(questions) > self.max_batch:
+            raise HTTPError(413, f"At most {self.max_batch} questions per batch.")
+        questions = [_question(q) for q in questions]
+        provider, model = _llm_args(body)
+        self.admission.admit(len(questions))  # type: ignore[union-attr]
+
+        async def _one(q: str) -> Dict[str, Any]:
+            try:
+                return {"ok": True, "result": _public(await self._run_one(q, provider, model))}
+            except HTTPError as e:
+                return {"ok": False, "question": q, "status": e.status, **e.payload()}
+            except WorkflowError as e:
+                logger.error("API: batch item failed: %s", e, exc_info=True)
+                return {"ok": False, "question": q, "status": 500, "error": str(e), "thread_id": e.thread_id}
+            except Exception as e:
+                logger.error("API: batch item failed: %s", e, exc_info=True)
+                return {"ok": False, "question": q, "status": 500, "error": str(e)}
+
+        t0 = time.perf_counter()
+        results: List[Dict[str, Any]] = await asyncio.gather(*(_one(q) for q in questions))
+        await _send_json(send, 200, {"results": results, "elapsed_s": round(time.perf_counter() - t0, 3)})
+
+    async def verify_stream(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body = await _read_json(receive, self.max_body_bytes)
+        question = _question(body.get("question"))
+        provider, model = _llm_args(body)
+        self.admission.admit()  # type: ignore[union-attr]
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache"),
+                        (b"x-accel-buffering", b"no")],
+        })
+        started: List[bool] = []
+        stream = asyncio.ensure_future(self._stream(question, provider, model, send, started))
+        disconnect = asyncio.ensure_future(_wait_disconnect(receive))
+        try:
+            await asyncio.wait({stream, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            disconnect.cancel()
+            stream.cancel()  # client went away: stop the workflow
+            if not started:
+                self.admission.release()  # type: ignore[union-attr]
+        if stream.done() and not stream.cancelled():
+            await send({"type": "http.response.body", "body": b""})
+
+    async def _stream(self, question: str, provider: str, model: str, send: Send, started: List[bool]) -> None:
+        started.append(True)
+        # Known before the run starts, so even a timeout or crash can be resumed.
+        thread_id = uuid.uuid4().hex if get_workflow().checkpointer is not None else None
+        ref = {"thread_id": thread_id} if thread_id else {}
+        try:
+            if thread_id:
+                await send(_sse("thread", ref))
+            async with asyncio.timeout(self.timeout_s):
+                async with self.admission.slot():  # type: ignore[union-attr]
+                    async for node, update in _stream_workflow_async(question, provider, model, thread_id):
+                        if node == END:
+                            await send(_sse("result", _public(update)))
+                        else:
+                            await send(_sse("node", {"node": node, "update": update}))
+        except TimeoutError:
+            await send(_sse("error", {
+                "status": 504, "error": f"Verification did not finish within {self.timeout_s:g}s.", **ref,
+            }))
+        except Exception as e:
+            logger.error("API: stream failed: %s", e, exc_info=True)
+            await send(_sse("error", {"status": 500, "error": str(e), **ref}))
+
+    async def healthz(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stores = StoreManager().readiness()
+        load = self.admission.snapshot() if self.admission else {}
+        await _send_json(send, 200 if stores["relational"] else 503, {"stores": stores, "load": load})
+
+
+app = GuardrailAPI()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    cfg = settings.get("api", {})
+    parser = argparse.ArgumentParser(description="Serve the guardrail HTTP API.")
+    parser.add_argument("--host", default=cfg.get("host", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(cfg.get("port", 8000)))
+    parser.add_argument("--workers", type=int, default=int(cfg.get("workers", 1)),
+                        help="Worker processes; each warms its own stores and graph.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=getattr(logging, settings.get("logging", {}).get("level", "INFO")),
+        format="%(asctime)s - %(process)d - %(levelname)s - %(message)s",
+    )
+    uvicorn.run("src.api.server:app", host=args.host, port=args.port, workers=args.workers,
+                lifespan="on", log_level="info")
+
+
+if __name__ == "__main__":
+    main()
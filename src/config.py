@@ -1,6 +1,7 @@
 import logging
 import os
 import sqlite3
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional
@@ -31,11 +32,94 @@ _DEFAULT_SETTINGS: Dict[str, Any] = {
             "gemini-2.0-flash-lite",
             "gemini-2.5-flash-lite",
         ],
+        "offline": {"latency_s": 0.0, "jitter_s": 0.0},
+        "base_url": None,
     },
     "embedding": {"model": "models/gemini-embedding-001"},
-    "vectorstore": {"persist_dir": "data/chroma_ipcbns"},
-    "verification": {"human_review_confidence_threshold": 0.7},
-    "logging": {"level": "INFO"},
+    "vectorstore": {"persist_dir": "data/chroma_ipcbns", "warmup_retry_s": 30.0, "warmup_retry_max_s": 600.0},
+    "verification": {
+        "human_review_confidence_threshold": 0.7,
+        "use_verified_answers": True,
+        "vector_section_filter": False,
+    },
+    "logging": {
+        "level": "INFO",
+        "sink": {
+            "batch_size": 64,
+            "flush_interval_s": 0.5,
+            "max_bytes": 50 * 1024 * 1024,
+            "backup_count": 5,
+        },
+    },
+    "tracing": {
+        "enabled": False,
+        "exporter": "file",
+        "endpoint": "http://localhost:4317",
+        "file_path": "logs/traces.jsonl",
+        "service_name": "hallucination-guardrail",
+    },
+    "routing": {
+        "enabled": True,
+        "strategy": "latency",
+        "ewma_alpha": 0.2,
+        "quota_cooldown_s": 30,
+        "error_cooldown_s": 15,
+        "max_cooldown_s": 300,
+        "error_threshold": 0.5,
+        "min_calls": 5,
+        "consecutive_failures": 3,
+    },
+    "hedging": {
+        "enabled": False,
+        "nodes": ["primary_llm"],
+        "percentile": 95,
+        "min_samples": 20,
+        "default_delay_s": 2.0,
+        "min_delay_s": 0.2,
+        "max_delay_s": 10.0,
+        "budget_ratio": 0.1,
+        "budget_burst": 5,
+    },
+    "rate_limits": {
+        "enabled": False,
+        "backend": "memory",
+        "path": "data/db/rate_limits.db",
+        "max_wait_s": 5.0,
+        "completion_tokens_estimate": 256,
+        "models": {},
+    },
+    "llm_cache": {
+        "enabled": False,
+        "backend": "sqlite",
+        "path": "data/db/llm_cache.db",
+        "ttl_s": 86400,
+        "max_entries": 1024,
+        "max_disk_entries": 100000,
+        "nodes": {"planner": True, "primary_llm": True, "claim_extractor": True},
+    },
+    "checkpointing": {"enabled": False, "path": "data/db/checkpoints.db", "retention_days": 7},
+    "coalescing": {"enabled": True, "workflow": True, "embeddings": True, "llm": True},
+    "api": {
+        "host": "127.0.0.1",
+        "port": 8000,
+        "workers": 1,
+        "request_timeout_s": 60.0,
+        "max_concurrency": 16,
+        "max_queue": 64,
+        "max_batch": 20,
+        "max_body_bytes": 65536,
+    },
+    "metrics": {"enabled": False, "host": "127.0.0.1", "port": 9464, "max_series_per_metric": 500},
+    "calibration": {
+        "enabled": True,
+        "path": "data/models/calibration.json",
+        "method": "logistic",
+        "target_recall": 0.95,
+        "target_precision": 0.95,
+        "min_samples": 30,
+        "l2": 1.0,
+        "folds": 5,
+    },
 }
 
 
@@ -88,7 +172,9 @@ class ProjectPaths:
     PROCESSED_CHUNKS: str = str(Path(_PROJECT_ROOT) / "data" / "processed" / "ipcbns_chunks.json")
     SQLITE_DB: str = str(Path(_PROJECT_ROOT) / "data" / "db" / "ipcbns_mapping.db")
     EVAL_LOG: str = str(Path(_PROJECT_ROOT) / "data" / "eval_log.jsonl")
+    EVAL_PARQUET_DIR: str = str(Path(_PROJECT_ROOT) / "data" / "eval_parquet")
     HUMAN_REVIEW_QUEUE: str = str(Path(_PROJECT_ROOT) / "data" / "human_review_queue.jsonl")
+    REVIEW_DB: str = str(Path(_PROJECT_ROOT) / "data" / "db" / "review_queue.db")
     CHROMA_DIR: str = str(Path(_PROJECT_ROOT) / settings["vectorstore"]["persist_dir"])
 
 
@@ -124,6 +210,10 @@ def init_data_dirs() -> None:
 # ── LLM factory ──────────────────────────────────────────────────────────────
 
 
+_llm_cache: Dict[tuple, Any] = {}
+_llm_cache_lock = threading.Lock()
+
+
 def get_llm(config: Optional[LLMConfig] = None):
     """
     Return a LangChain-compatible chat model.
@@ -131,11 +221,49 @@ def get_llm(config: Optional[LLMConfig] = None):
     For the Google provider, the returned model is wrapped with fallbacks so
     that if the primary model's quota is exhausted (429 RESOURCE_EXHAUSTED),
     the next model in GOOGLE_FALLBACK_MODELS is tried automatically.
-    """
-    from langchain_core.language_models import BaseChatModel  # type: ignore
 
+    Models are built once per configuration and reused: constructing the
+    Google chain creates one SDK client (and TLS context) per fallback
+    model, which costs ~0.1 s each and blocks the event loop.
+    """
     if config is None:
         config = LLMConfig()
+    llm_settings = settings["llm"]
+    key = (
+        config.provider,
+        config.model,
+        config.temperature,
+        llm_settings.get("base_url"),
+        tuple(GOOGLE_FALLBACK_MODELS),
+        repr(llm_settings.get("offline")),
+        bool(settings["rate_limits"].get("enabled", False)),
+    )
+    with _llm_cache_lock:
+        llm = _llm_cache.get(key)
+        if llm is None:
+            from src.llm.cache import CachedModel
+            from src.llm.coalesce import CoalescedModel
+
+            # Caching and coalescing are switched per call (llm_cache.*,
+            # coalescing.llm), so they are not part of the key.
+            model_key = f"{config.provider}:{config.model}:{config.temperature}"
+            llm = _llm_cache[key] = CachedModel(CoalescedModel(_build_llm(config), model_key), model_key)
+    return llm
+
+
+def _rate_limited(model_name: str, llm):
+    """Wrap ``llm`` in the shared per-model rate limiter when ``rate_limits.enabled``."""
+    if not settings["rate_limits"].get("enabled", False):
+        return llm
+    from src.llm.rate_limit import RateLimitedModel
+
+    return RateLimitedModel(llm, model_name)
+
+
+def _build_llm(config: LLMConfig):
+    from langchain_core.language_models import BaseChatModel  # type: ignore
+
+    from src.observability.timing import usage_callback
 
     if config.provider == "google":
         from langchain_google_genai import ChatGoogleGenerativeAI
@@ -144,15 +272,19 @@ def get_llm(config: Optional[LLMConfig] = None):
         if not api_key:
             raise RuntimeError("Set GOOGLE_API_KEY or GEMINI_API_KEY in environment.")
 
-        def _make_google_llm(model_name: str) -> ChatGoogleGenerativeAI:
-            return ChatGoogleGenerativeAI(
+        base_url = settings["llm"].get("base_url") or None
+
+        def _make_google_llm(model_name: str) -> BaseChatModel:
+            return _rate_limited(model_name, ChatGoogleGenerativeAI(
                 model=model_name,
                 api_key=api_key,
                 temperature=config.temperature,
                 max_retries=1,  # fail fast → let fallback handle it
                 timeout=30,
                 max_output_tokens=2048,
-            )
+                base_url=base_url,
+                callbacks=[usage_callback],
+            ))
 
         primary: BaseChatModel = _make_google_llm(config.model)
 
@@ -164,31 +296,41 @@ def get_llm(config: Optional[LLMConfig] = None):
         ]
 
         if fallbacks:
+            fallback_names = [m for m in GOOGLE_FALLBACK_MODELS if m != config.model]
             logger.info(
-                "Google LLM: primary=%s, fallbacks=%s",
-                config.model,
-                [m for m in GOOGLE_FALLBACK_MODELS if m != config.model],
+                "Google LLM: primary=%s, fallbacks=%s", config.model, fallback_names
             )
+            if settings["routing"].get("enabled", True):
+                from src.llm.router import RoutedChatModel
+
+                models = dict(zip([config.model] + fallback_names, [primary] + fallbacks))
+                return RoutedChatModel(models)
             return primary.with_fallbacks(fallbacks)
 
         return primary
 
     if config.provider == "offline":
-        from langchain_core.runnables import RunnableLambda  # type: ignore
-
-        def _dummy(messages):
-            last = messages[-1].content if messages else ""
-            return {"content": f"OFFLINE DUMMY ANSWER (echo): {last[:200]}"}
+        from src.offline import ScriptedChatModel
 
-        return RunnableLambda(_dummy)
+        offline = settings["llm"].get("offline", {})
+        return ScriptedChatModel(
+            model=config.model or "offline-scripted",
+            temperature=config.temperature,
+            latency_s=float(offline.get("latency_s", 0.0)),
+            jitter_s=float(offline.get("jitter_s", 0.0)),
+            callbacks=[usage_callback],
+        )
 
     if config.provider == "openai":
         from langchain_openai import ChatOpenAI  # type: ignore
 
-        return ChatOpenAI(
-            model=config.model or "gpt-4o-mini",
+        model_name = config.model or "gpt-4o-mini"
+        return _rate_limited(model_name, ChatOpenAI(
+            model=model_name,
             temperature=config.temperature,
-        )
+            base_url=settings["llm"].get("base_url") or None,
+            callbacks=[usage_callback],
+        ))
 
     if config.provider == "anthropic":
         from langchain_anthropic import ChatAnthropic  # type: ignore
@@ -196,6 +338,7 @@ def get_llm(config: Optional[LLMConfig] = None):
         return ChatAnthropic(
             model=config.model or "claude-3-haiku-20240307",
             temperature=config.temperature,
+            callbacks=[usage_callback],
         )
 
     raise ValueError(f"Unknown provider: {config.provider}")
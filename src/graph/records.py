@@ -0,0 +1,186 @@
+"""
+Compact in-process records for claim verification.
+
+The verifier works on ``Score`` / ``ClaimVerdict`` instances: slotted
+dataclasses with enum-coded status and source, holding evidence only by
+key (the IPC section for relational evidence, the chunk id for vector
+evidence). The text behind those keys lives once per run in an
+``EvidenceTable``, so a batch of claims hitting the same chunk shares one
+copy, and bulk jobs that only need verdicts keep no evidence at all.
+
+At the state boundary ``ClaimVerdict.to_dict`` emits a
+``VerificationRecord`` with ``evidence_ids`` ("ipc:<section>",
+"chunk:<chunk id>") and ``EvidenceTable.to_dict`` the result's
+``evidence`` table (id → text, each text once). ``render_evidence`` turns
+the two back into the per-claim evidence string the verifier used to
+inline, and still accepts old records that carry ``evidence`` text.
+"""
+
+import hashlib
+import sys
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+
+from src.graph.state import VerificationRecord
+
+VECTOR_EVIDENCE_CHARS = 500
+NO_MAPPING_EVIDENCE = "No mapping found in IPC↔BNS table."
+NO_VECTOR_EVIDENCE = "No semantic evidence."
+IPC_PREFIX = "ipc:"
+CHUNK_PREFIX = "chunk:"
+
+
+class Status(IntEnum):
+    SUPPORTED = 0
+    CONTRADICTED = 1
+    UNCERTAIN = 2
+
+    @property
+    def label(self) -> str:
+        return _STATUS_LABELS[self]
+
+    @classmethod
+    def parse(cls, label: str) -> "Status":
+        return _STATUS_BY_LABEL[label]
+
+
+class Source(IntEnum):
+    RELATIONAL = 0
+    VECTOR = 1
+    MIXED = 2
+
+    @property
+    def label(self) -> str:
+        return _SOURCE_LABELS[self]
+
+
+_STATUS_LABELS = {Status.SUPPORTED: "supported", Status.CONTRADICTED: "contradicted", Status.UNCERTAIN: "uncertain"}
+_STATUS_BY_LABEL = {label: status for status, label in _STATUS_LABELS.items()}
+_SOURCE_LABELS = {Source.RELATIONAL: "relational", Source.VECTOR: "vector", Source.MIXED: "mixed"}
+
+
+@dataclass(slots=True)
+class Score:
+    """One store's opinion of a claim; ``key`` is an IPC section or chunk id."""
+
+    status: Status
+    confidence: float
+    source: Source
+    key: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ClaimVerdict:
+    """Fused verdict for one claim; evidence is referenced, not copied."""
+
+    claim: str
+    status: Status
+    confidence: float
+    source: Source
+    ipc: Optional[str] = None
+    chunk_id: Optional[str] = None
+
+    @property
+    def evidence_ids(self) -> List[str]:
+        ids = []
+        if self.source is not Source.VECTOR and self.ipc is not None:
+            ids.append(IPC_PREFIX + self.ipc)
+        if self.source is not Source.RELATIONAL and self.chunk_id is not None:
+            ids.append(CHUNK_PREFIX + self.chunk_id)
+        return ids
+
+    def to_dict(self) -> VerificationRecord:
+        return {
+            "claim": self.claim,
+            "status": self.status.label,  # type: ignore[typeddict-item]
+            "confidence": self.confidence,
+            "source": self.source.label,
+            "evidence_ids": self.evidence_ids,
+        }
+
+
+def chunk_key(text: str, metadata: Optional[Dict[str, object]] = None) -> str:
+    """Chunk id from hit metadata, or a content hash for stores that do not return one."""
+    chunk_id = (metadata or {}).get("chunk_id")
+    if chunk_id:
+        return sys.intern(str(chunk_id))
+    return sys.intern(hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest())
+
+
+class EvidenceTable:
+    """Evidence text for one verification run, keyed by IPC section and chunk id."""
+
+    __slots__ = ("mappings", "chunks")
+
+    def __init__(self) -> None:
+        self.mappings: Dict[str, Optional[Dict[str, str]]] = {}
+        self.chunks: Dict[str, str] = {}
+
+    def add_mapping(self, ipc: str, record: Optional[Dict[str, str]]) -> None:
+        self.mappings[ipc] = record
+
+    def add_chunk(self, chunk_id: str, text: str) -> None:
+        if chunk_id not in self.chunks:
+            self.chunks[chunk_id] = text[:VECTOR_EVIDENCE_CHARS]
+
+    def relational(self, ipc: Optional[str]) -> str:
+        if ipc is None:
+            return ""
+        record = self.mappings.get(ipc)
+        if not record:
+            return NO_MAPPING_EVIDENCE
+        return f"IPC {ipc} → BNS {record['bns_section']}. {record.get('notes', '')}"
+
+    def vector(self, chunk_id: Optional[str]) -> str:
+        if chunk_id is None:
+            return NO_VECTOR_EVIDENCE
+        return self.chunks.get(chunk_id, "")
+
+    def to_dict(self, verdicts: Iterable[ClaimVerdict]) -> Dict[str, str]:
+        """The result's evidence table: text for every id the *verdicts* reference."""
+        table: Dict[str, str] = {}
+        for v in verdicts:
+            for eid in v.evidence_ids:
+                if eid not in table:
+                    if eid.startswith(IPC_PREFIX):
+                        table[eid] = self.relational(eid[len(IPC_PREFIX):])
+                    else:
+                        table[eid] = self.vector(eid[len(CHUNK_PREFIX):])
+        return table
+
+
+def render_evidence(
+    record: Mapping[str, object],
+    table: Mapping[str, str],
+    fetch_chunks: Optional[Callable[[List[str]], Mapping[str, str]]] = None,
+) -> str:
+    """
+    Evidence text for one verification record.
+
+    Ids missing from *table* are looked up through *fetch_chunks* (chunk
+    id → text, e.g. ``IPCBNSVectorStore.get_chunks``) when given. Records
+    written before ``evidence_ids`` existed return their inline text.
+    """
+    ids = record.get("evidence_ids")
+    if ids is None:
+        return str(record.get("evidence", ""))
+    rel_id = next((i for i in ids if i.startswith(IPC_PREFIX)), None)  # type: ignore[union-attr]
+    vec_id = next((i for i in ids if i.startswith(CHUNK_PREFIX)), None)  # type: ignore[union-attr]
+
+    rel_text = table.get(rel_id, "") if rel_id else ""
+    if vec_id is None:
+        vec_text = NO_VECTOR_EVIDENCE
+    elif vec_id in table:
+        vec_text = table[vec_id]
+    else:
+        chunk = vec_id[len(CHUNK_PREFIX):]
+        fetched = fetch_chunks([chunk]) if fetch_chunks is not None else {}
+        vec_text = fetched.get(chunk, "")[:VECTOR_EVIDENCE_CHARS]
+
+    source = record.get("source")
+    if source == "relational":
+        return rel_text
+    if source == "vector":
+        return vec_text
+    return f"{rel_text}\n\nVector evidence:\n{vec_text}"
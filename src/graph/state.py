@@ -1,14 +1,29 @@
-from typing import Any, Dict, List, Literal, Optional, TypedDict
+from typing import Annotated, Any, Dict, List, Literal, Optional, TypedDict
 
 StatusLabel = Literal["supported", "contradicted", "uncertain"]
 
 
+def merge_metadata(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reducer for ``metadata``: parallel nodes (planner + primary_llm) both
+    write to it in the same step, so nested dicts are merged one level deep
+    instead of overwritten.
+    """
+    merged = dict(left or {})
+    for key, value in (right or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
 class VerificationRecord(TypedDict):
     claim: str
     status: StatusLabel
     confidence: float
-    evidence: str
     source: str  # "relational", "vector", or "mixed"
+    evidence_ids: List[str]  # keys into VerificationState["evidence"]
 
 
 class VerificationState(TypedDict, total=False):
@@ -16,10 +31,11 @@ class VerificationState(TypedDict, total=False):
     question: str
     llm_provider: str
     llm_model: str
+    thread_id: str  # checkpoint thread, set when checkpointing is enabled
 
     # Planner output
     plan: str
-    route: Literal["direct", "verify"]
+    route: Literal["direct", "verify", "verified"]  # "verified": served from reviewed answers
 
     # Primary LLM output
     llm_answer: str
@@ -29,14 +45,16 @@ class VerificationState(TypedDict, total=False):
 
     # Verification
     verifications: List[VerificationRecord]
+    evidence: Dict[str, str]  # evidence id → text, once per result (see src/graph/records.py)
     final_result: Dict[str, Any]
 
-    # Human validation
+    # Human validation (human_feedback also carries the reviewer's note
+    # when the answer comes from the verified-answer store)
     needs_human: bool
     human_feedback: Optional[str]
 
     # Evaluation
     evaluation: Dict[str, Any]
 
-    # Misc
-    metadata: Dict[str, Any]
+    # Misc (per-node timings live under metadata["nodes"])
+    metadata: Annotated[Dict[str, Any], merge_metadata]
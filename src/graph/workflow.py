@@ -1,5 +1,11 @@
 import asyncio
+import copy
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, List, Optional, Tuple
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
 
 from src.agents.claim_extractor import claim_extractor_node
@@ -8,19 +14,30 @@ from src.agents.human_validation import human_validation_node
 from src.agents.planner import planner_node
 from src.agents.primary_llm import primary_llm_node
 from src.agents.verifier import verifier_node
+from src.agents.utils import normalize_question, question_hash
 from src.config import settings
 from src.graph.state import VerificationState
+from src.observability.metrics import CACHE_LOOKUPS, OVERALL_STATUS, REQUEST_LATENCY, REQUESTS
+from src.observability.timing import instrument_node
+from src.observability.tracing import init_tracing, start_span
+from src.rag.store_manager import StoreManager
+from src.singleflight import SingleFlight, coalescing_enabled
+from src.storage.verified_answers import get_verified_answers
 
 
-def create_workflow():
+def create_workflow(checkpointer: Optional[BaseCheckpointSaver] = None):
     g = StateGraph(VerificationState)
 
-    g.add_node("planner", planner_node)
-    g.add_node("primary_llm", primary_llm_node)
-    g.add_node("claim_extractor", claim_extractor_node)
-    g.add_node("verifier", verifier_node)
-    g.add_node("human_validation", human_validation_node)
-    g.add_node("evaluation", evaluation_node)
+    nodes = {
+        "planner": planner_node,
+        "primary_llm": primary_llm_node,
+        "claim_extractor": claim_extractor_node,
+        "verifier": verifier_node,
+        "human_validation": human_validation_node,
+        "evaluation": evaluation_node,
+    }
+    for name, fn in nodes.items():
+        g.add_node(name, instrument_node(name, fn))
 
     # Fan-out: planner and primary_llm run in PARALLEL from START
     g.add_edge(START, "planner")
@@ -48,36 +65,236 @@ def create_workflow():
     g.add_edge("human_validation", "evaluation")
     g.add_edge("evaluation", END)
 
-    return g.compile()
+    return g.compile(checkpointer=checkpointer)
 
 
-_compiled_workflow = None
+_compiled_workflows: Dict[bool, Any] = {}
+_workflow_flight = SingleFlight("workflow")
+# Thread id of the checkpointed run currently in flight per coalescing key,
+# so a follower that times out can still report which thread to resume.
+_flight_threads: Dict[Any, str] = {}
 
 
-async def _run_workflow_async(
+class WorkflowError(RuntimeError):
+    """A checkpointed run failed; ``thread_id`` picks it up via ``resume_workflow``."""
+
+    def __init__(self, thread_id: str, error: BaseException):
+        super().__init__(f"{error} (thread_id={thread_id})")
+        self.thread_id = thread_id
+
+
+def get_workflow():
+    """
+    The compiled graph for this process, built once per checkpointing
+    mode (with the SQLite checkpointer when ``checkpointing.enabled``).
+    """
+    checkpointed = bool(settings["checkpointing"].get("enabled", False))
+    graph = _compiled_workflows.get(checkpointed)
+    if graph is None:
+        saver = None
+        if checkpointed:
+            from src.storage.checkpoints import get_checkpointer
+
+            saver = get_checkpointer()
+        graph = _compiled_workflows[checkpointed] = create_workflow(saver)
+    return graph
+
+
+async def _answer_from_verified(initial: VerificationState) -> Optional[VerificationState]:
+    """Serve a reviewer-confirmed answer without touching any LLM, if one exists."""
+    if not settings["verification"].get("use_verified_answers", True):
+        return None
+    hit = await asyncio.to_thread(get_verified_answers().lookup, initial["question"])
+    CACHE_LOOKUPS.inc(cache="verified_answers", result="hit" if hit else "miss")
+    if hit is None:
+        return None
+
+    provenance = {
+        "source": "human_review",
+        "verdict": hit["verdict"],
+        "reviewer": hit["reviewer"],
+        "review_item_id": hit["review_item_id"],
+        "verified_at": hit["verified_at"],
+        "kb_version": hit["kb_version"],
+    }
+    state: VerificationState = {
+        **initial,
+        "plan": "Answered from the verified-answer store (human-reviewed).",
+        "route": "verified",
+        "llm_answer": hit["answer"],
+        "claims": [],
+        "verifications": [],
+        "evidence": {},
+        "final_result": {
+            "overall_status": "human_verified",
+            "average_confidence": 1.0,
+            "supported_claims": 0,
+            "contradicted_claims": 0,
+            "uncertain_claims": 0,
+            "total_claims": 0,
+        },
+        "needs_human": False,
+        "human_feedback": hit["reviewer_notes"] or f"{hit['verdict']} by {hit['reviewer']}",
+        "metadata": {**initial.get("metadata", {}), "verified_answer": provenance},
+    }
+    state.update(await evaluation_node(state))
+    return state
+
+
+async def _stream_workflow_async(
     question: str,
     llm_provider: str = settings["llm"]["provider"],
     llm_model: str = settings["llm"]["model"],
-):
-    global _compiled_workflow
-    if _compiled_workflow is None:
-        _compiled_workflow = create_workflow()
+    thread_id: Optional[str] = None,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Run the graph, yielding ``(node_name, update)`` as each node finishes
+    and ``(END, final_state)`` last. A verified-answer hit yields only the
+    final state. With checkpointing on, the run's ``thread_id`` (*thread_id*
+    or a fresh one) is part of the state, and a failure is raised as
+    ``WorkflowError`` carrying it.
+    """
+    init_tracing()
+    graph = get_workflow()
     initial: VerificationState = {
         "question": question,
         "llm_provider": llm_provider,
         "llm_model": llm_model,
         "metadata": {},
     }
-    final_state = await _compiled_workflow.ainvoke(initial)
-    return final_state
+    config: Optional[RunnableConfig] = None
+    if graph.checkpointer is not None:
+        initial["thread_id"] = thread_id or uuid.uuid4().hex
+        config = {"configurable": {"thread_id": initial["thread_id"]}}
+    with start_span(
+        "workflow.run",
+        {
+            "guardrail.question_hash": question_hash(question),
+            "llm.provider": llm_provider,
+            "llm.model": llm_model,
+        },
+    ) as span:
+        t0 = time.perf_counter()
+        final_state = await _answer_from_verified(initial)
+        if final_state is None:
+            final_state = initial
+            try:
+                async for mode, chunk in graph.astream(initial, config, stream_mode=["updates", "values"]):
+                    if mode == "values":
+                        final_state = chunk
+                        continue
+                    for node, update in chunk.items():
+                        yield node, update or {}
+            except Exception as e:
+                if config is None:
+                    raise
+                raise WorkflowError(initial["thread_id"], e) from e
+        final = final_state.get("final_result", {})
+        route = final_state.get("route", "verify")
+        REQUESTS.inc(route=route)
+        OVERALL_STATUS.inc(status=final.get("overall_status", "unknown"))
+        REQUEST_LATENCY.observe(time.perf_counter() - t0, route=route)
+        span.set_attribute("guardrail.route", final_state.get("route", ""))
+        span.set_attribute("guardrail.claim_count", len(final_state.get("claims") or []))
+        span.set_attribute("guardrail.overall_status", final.get("overall_status", ""))
+    yield END, final_state
 
 
-def run_workflow(
+async def _run_workflow_async(
     question: str,
     llm_provider: str = settings["llm"]["provider"],
     llm_model: str = settings["llm"]["model"],
+    run: Optional[Dict[str, Any]] = None,
 ):
-    """Sync wrapper for Streamlit compatibility."""
+    """
+    Run the graph to completion. Concurrent calls for the same normalised
+    question and provider/model share one execution (``coalescing.workflow``);
+    followers get their own copy of the result, marked ``metadata["coalesced"]``,
+    and are counted in the request metrics with their own wait as latency.
+
+    With checkpointing on, ``run["thread_id"]`` is set to the executing
+    run's thread as soon as it is known, so a caller that gives up (e.g. on
+    a timeout) can still point at ``resume_workflow``.
+    """
+    executed: List[bool] = []
+    run = run if run is not None else {}
+    key = (normalize_question(question), llm_provider, llm_model)
+
+    async def _execute() -> VerificationState:
+        executed.append(True)
+        thread_id = uuid.uuid4().hex if get_workflow().checkpointer is not None else None
+        if thread_id:
+            run["thread_id"] = _flight_threads[key] = thread_id
+        try:
+            final_state: VerificationState = {}
+            async for _, final_state in _stream_workflow_async(question, llm_provider, llm_model, thread_id):
+                pass
+            return final_state
+        finally:
+            if thread_id and _flight_threads.get(key) == thread_id:
+                del _flight_threads[key]
+
+    if not coalescing_enabled("workflow"):
+        return await _execute()
+    t0 = time.perf_counter()
+    try:
+        state = await _workflow_flight.do(key, _execute)
+    except BaseException:
+        leader_thread = _flight_threads.get(key)
+        if leader_thread:
+            run.setdefault("thread_id", leader_thread)
+        raise
+    if executed:
+        return state
+    state = copy.deepcopy(state)
+    state["question"] = question
+    state["metadata"] = {**state.get("metadata", {}), "coalesced": True}
+    # The leader's metrics cover its own request only; count this one too,
+    # with the time this caller actually waited.
+    route = state.get("route", "verify")
+    REQUESTS.inc(route=route)
+    OVERALL_STATUS.inc(status=state.get("final_result", {}).get("overall_status", "unknown"))
+    REQUEST_LATENCY.observe(time.perf_counter() - t0, route=route)
+    return state
+
+
+async def _resume_workflow_async(thread_id: str, from_node: Optional[str] = None) -> VerificationState:
+    """
+    Continue a checkpointed run.
+
+    Without ``from_node`` the run picks up after its last completed node
+    (e.g. after a verifier crash), reusing every LLM output already saved;
+    for a finished run this just returns its final state. With
+    ``from_node`` (typically ``"verifier"`` after a knowledge-base update)
+    the run is forked from the checkpoint taken just before that node,
+    which is then re-run with everything after it.
+    """
+    init_tracing()
+    graph = get_workflow()
+    if graph.checkpointer is None:
+        raise RuntimeError("Resuming needs checkpointing.enabled in settings.yaml.")
+    config: RunnableConfig = {"configurable": {"thread_id": thread_id}}
+    if from_node is not None:
+        target = None
+        async for snapshot in graph.aget_state_history(config):  # newest first
+            if from_node in snapshot.next:
+                target = snapshot.config
+                break
+        if target is None:
+            raise ValueError(f"No checkpoint before {from_node!r} in thread {thread_id}.")
+        config = target
+    else:
+        snapshot = await graph.aget_state(config)
+        if not snapshot.values:
+            raise ValueError(f"Unknown thread {thread_id}.")
+        if not snapshot.next:
+            return snapshot.values
+
+    with start_span("workflow.resume", {"guardrail.thread_id": thread_id, "guardrail.from_node": from_node or ""}):
+        return await graph.ainvoke(None, config)
+
+
+def _run_sync(make_coro: Callable[[], Coroutine[Any, Any, Any]]) -> Any:
     try:
         loop = asyncio.get_running_loop()
     except RuntimeError:
@@ -87,17 +304,27 @@ def run_workflow(
         # Already in an async context (e.g. Streamlit with async)
         import concurrent.futures
         with concurrent.futures.ThreadPoolExecutor() as pool:
-            return pool.submit(
-                asyncio.run,
-                _run_workflow_async(question, llm_provider, llm_model)
-            ).result()
+            return pool.submit(lambda: asyncio.run(make_coro())).result()
     else:
-        return asyncio.run(
-            _run_workflow_async(question, llm_provider, llm_model)
-        )
+        return asyncio.run(make_coro())
+
+
+def run_workflow(
+    question: str,
+    llm_provider: str = settings["llm"]["provider"],
+    llm_model: str = settings["llm"]["model"],
+):
+    """Sync wrapper for Streamlit compatibility."""
+    return _run_sync(lambda: _run_workflow_async(question, llm_provider, llm_model))
+
+
+def resume_workflow(thread_id: str, from_node: Optional[str] = None) -> VerificationState:
+    """Sync wrapper for ``_resume_workflow_async``."""
+    return _run_sync(lambda: _resume_workflow_async(thread_id, from_node))
 
 
 if __name__ == "__main__":
+    StoreManager().warmup()
     q = "What is the BNS equivalent of IPC Section 302?"
     out = run_workflow(q)
     print("Question:", out["question"])
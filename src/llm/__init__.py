@@ -0,0 +1 @@
+# LLM call path: health-aware model routing, hedged requests, rate limiting.
@@ -0,0 +1,144 @@
+"""
+Opt-in prompt-level response cache in front of ``get_llm``'s chain.
+
+The planner, primary and claim-extractor prompts are fixed templates, so
+the same question (or the same ``llm_answer`` handed to the claim
+extractor) renders byte-identical messages. ``CachedModel`` keys each
+call on the model, temperature, derived-runnable variant and a hash of
+the rendered messages, and serves repeats from ``LLMResponseCache``.
+
+Off by default (``llm_cache.enabled``), and switched per node through
+``llm_cache.nodes`` — calls made outside an instrumented node are never
+cached. Lookups feed ``guardrail_cache_lookups_total{cache="llm"}``;
+hits show up as ``cache_hits`` in the node's timing metadata.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from functools import wraps
+from typing import Any, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.config import settings
+from src.llm.coalesce import prompt_fingerprint
+from src.observability.metrics import CACHE_LOOKUPS
+from src.observability.timing import current_node
+from src.storage.llm_cache import get_llm_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(result: Any) -> Optional[str]:
+    """Serialise a model result, or None if it is not cacheable."""
+    if isinstance(result, BaseMessage):
+        return json.dumps({"kind": "message", "data": message_to_dict(result)}, ensure_ascii=False)
+    try:
+        return json.dumps({"kind": "json", "data": result}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+
+
+def _decode(payload: str) -> Any:
+    entry = json.loads(payload)
+    if entry["kind"] == "message":
+        return messages_from_dict([entry["data"]])[0]
+    return entry["data"]
+
+
+def _cache_applies() -> bool:
+    cfg = settings.get("llm_cache", {})
+    if not cfg.get("enabled", False):
+        return False
+    stats = current_node()
+    return stats is not None and bool((cfg.get("nodes") or {}).get(stats.name, False))
+
+
+class CachedModel(Runnable):
+    """Chat model (or derived runnable) that answers repeated prompts from the cache."""
+
+    def __init__(self, bound: Runnable, model_key: str, variant: Tuple[str, ...] = ()):
+        self.bound = bound
+        self.model_key = model_key
+        self.variant = variant
+
+    @property
+    def InputType(self) -> Any:  # noqa: N802 (Runnable API)
+        return self.bound.InputType
+
+    @property
+    def OutputType(self) -> Any:  # noqa: N802 (Runnable API)
+        return self.bound.OutputType
+
+    def _derive(self, method: str, args: Any, kwargs: Any, result: Runnable) -> "CachedModel":
+        return CachedModel(result, self.model_key, self.variant + (f"{method}{args!r}{sorted(kwargs.items())!r}",))
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name in ("bound", "model_key", "variant"):
+            raise AttributeError(name)
+        attr = getattr(self.bound, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            result = attr(*args, **kwargs)
+            return self._derive(name, args, kwargs, result) if isinstance(result, Runnable) else result
+
+        return wrapped
+
+    def with_structured_output(self, *args: Any, **kwargs: Any) -> "CachedModel":
+        return self._derive("with_structured_output", args, kwargs, self.bound.with_structured_output(*args, **kwargs))
+
+    def _key(self, input: Any, kwargs: Any) -> str:
+        blob = json.dumps([self.model_key, self.variant, prompt_fingerprint(input), repr(sorted(kwargs.items()))])
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _hit(payload: Optional[str]) -> Any:
+        if payload is None:
+            CACHE_LOOKUPS.inc(cache="llm", result="miss")
+            return None
+        CACHE_LOOKUPS.inc(cache="llm", result="hit")
+        stats = current_node()
+        if stats is not None:
+            stats.cache_hits += 1
+        return _decode(payload)
+
+    def _store(self, key: str, result: Any) -> None:
+        payload = _encode(result)
+        if payload is None:
+            return
+        try:
+            get_llm_cache().set(key, payload, self.model_key)
+        except Exception as e:  # a cache write must never fail the call
+            logger.warning("LLM cache write failed: %s", e)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        if not _cache_applies():
+            return self.bound.invoke(input, config, **kwargs)
+        key = self._key(input, kwargs)
+        cached = self._hit(get_llm_cache().get(key))
+        if cached is not None:
+            return cached
+        result = self.bound.invoke(input, config, **kwargs)
+        self._store(key, result)
+        return result
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        if not _cache_applies():
+            return await self.bound.ainvoke(input, config, **kwargs)
+        key = self._key(input, kwargs)
+        cache = get_llm_cache()
+        payload = cache.get_memory(key)
+        if payload is None and cache.engine is not None:
+            payload = await asyncio.to_thread(cache.get, key)
+        cached = self._hit(payload)
+        if cached is not None:
+            return cached
+        result = await self.bound.ainvoke(input, config, **kwargs)
+        await asyncio.to_thread(self._store, key, result)
+        return result
@@ -0,0 +1,89 @@
+"""
+LLM-call coalescing.
+
+``CoalescedModel`` wraps the chain returned by ``get_llm`` so that
+identical prompts sent to the same model at the same time make one API
+call: the key is the model, temperature, any derived-runnable variant
+(e.g. ``with_structured_output(schema)``) and a hash of the rendered
+messages. This catches what workflow-level coalescing cannot — the
+streaming endpoint, and differently phrased questions whose later
+prompts converge.
+
+Only the leader's call goes through the model callbacks, so usage is
+attributed to the node that actually made the request.
+"""
+
+import hashlib
+import json
+from functools import wraps
+from typing import Any, Optional, Tuple
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.singleflight import SingleFlight, coalescing_enabled
+
+_llm_flight = SingleFlight("llm")
+
+
+def prompt_fingerprint(input: Any) -> str:
+    """Stable hash of a prompt value, message list or plain text."""
+    if hasattr(input, "to_messages"):
+        input = input.to_messages()
+    if isinstance(input, (list, tuple)):
+        rendered: Any = [
+            (getattr(m, "type", type(m).__name__), getattr(m, "content", m)) for m in input
+        ]
+    else:
+        rendered = str(input)
+    blob = json.dumps(rendered, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class CoalescedModel(Runnable):
+    """Chat model (or derived runnable) whose identical concurrent calls share one request."""
+
+    def __init__(self, bound: Runnable, model_key: str, variant: Tuple[str, ...] = ()):
+        self.bound = bound
+        self.model_key = model_key
+        self.variant = variant
+
+    @property
+    def InputType(self) -> Any:  # noqa: N802 (Runnable API)
+        return self.bound.InputType
+
+    @property
+    def OutputType(self) -> Any:  # noqa: N802 (Runnable API)
+        return self.bound.OutputType
+
+    def _derive(self, method: str, args: Any, kwargs: Any, result: Runnable) -> "CoalescedModel":
+        return CoalescedModel(result, self.model_key, self.variant + (f"{method}{args!r}{sorted(kwargs.items())!r}",))
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name in ("bound", "model_key", "variant"):
+            raise AttributeError(name)
+        attr = getattr(self.bound, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            result = attr(*args, **kwargs)
+            return self._derive(name, args, kwargs, result) if isinstance(result, Runnable) else result
+
+        return wrapped
+
+    def with_structured_output(self, *args: Any, **kwargs: Any) -> "CoalescedModel":
+        return self._derive("with_structured_output", args, kwargs, self.bound.with_structured_output(*args, **kwargs))
+
+    def _key(self, input: Any, kwargs: Any) -> Tuple[Any, ...]:
+        return (self.model_key, self.variant, prompt_fingerprint(input), repr(sorted(kwargs.items())))
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        if not coalescing_enabled("llm"):
+            return self.bound.invoke(input, config, **kwargs)
+        return _llm_flight.do_sync(self._key(input, kwargs), lambda: self.bound.invoke(input, config, **kwargs))
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        if not coalescing_enabled("llm"):
+            return await self.bound.ainvoke(input, config, **kwargs)
+        return await _llm_flight.do(self._key(input, kwargs), lambda: self.bound.ainvoke(input, config, **kwargs))
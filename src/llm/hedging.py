@@ -0,0 +1,97 @@
+"""
+Hedged LLM requests for tail latency.
+
+If the first-choice model has not answered within a delay taken from its
+own recent latency distribution (``hedging.percentile``, clamped to
+``[min_delay_s, max_delay_s]``), ``RoutedChatModel`` sends the same
+prompt to the next model in the routing order and keeps whichever
+finishes first; the other call is cancelled and awaited, and its elapsed
+time (at least the delay, for the first model) is recorded as a censored
+latency sample so the distribution is not built from winners only.
+
+Extra calls are capped by a token budget: every eligible request earns
+``budget_ratio`` tokens (up to ``budget_burst``) and each hedge spends
+one, so at most ~``budget_ratio`` of requests are duplicated. Hedging is
+limited to the nodes listed in ``hedging.nodes`` (matched through
+``current_node()``).
+
+Outcomes go to ``guardrail_llm_hedges_total{outcome}``:
+``fired``, ``hedge_won``, ``primary_won``, ``budget_exhausted``.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from src.config import settings
+from src.observability.metrics import LLM_HEDGES
+from src.observability.timing import current_node
+
+
+class HedgePolicy:
+    """Decides whether and when to hedge, and enforces the extra-call budget."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        cfg = config if config is not None else settings.get("hedging", {})
+        self.enabled: bool = bool(cfg.get("enabled", False))
+        self.nodes = set(cfg.get("nodes", ["primary_llm"]))
+        self.percentile: float = float(cfg.get("percentile", 95))
+        self.min_samples: int = int(cfg.get("min_samples", 20))
+        self.default_delay_s: float = float(cfg.get("default_delay_s", 2.0))
+        self.min_delay_s: float = float(cfg.get("min_delay_s", 0.2))
+        self.max_delay_s: float = float(cfg.get("max_delay_s", 10.0))
+        self.budget_ratio: float = float(cfg.get("budget_ratio", 0.1))
+        self.budget_burst: float = float(cfg.get("budget_burst", 5))
+        self._tokens = self.budget_burst
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def applies(self) -> bool:
+        """Hedging is on and the calling node opted in."""
+        if not self.enabled:
+            return False
+        stats = current_node()
+        return stats is not None and stats.name in self.nodes
+
+    def delay_for(self, model: str) -> float:
+        from src.llm.router import model_health
+
+        p = model_health.latency_percentile(model, self.percentile, self.min_samples)
+        delay = self.default_delay_s if p is None else p
+        return min(self.max_delay_s, max(self.min_delay_s, delay))
+
+    def earn(self) -> None:
+        """Credit the budget for one eligible request."""
+        with self._lock:
+            self._tokens = min(self.budget_burst, self._tokens + self.budget_ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+        self.record("budget_exhausted")
+        return False
+
+    def record(self, outcome: str) -> None:
+        LLM_HEDGES.inc(outcome=outcome)
+        with self._lock:
+            self._counts[outcome] = self._counts.get(outcome, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            tokens = self._tokens
+        fired = counts.get("fired", 0)
+        return {
+            **counts,
+            "win_rate": round(counts.get("hedge_won", 0) / fired, 4) if fired else None,
+            "budget_tokens": round(tokens, 2),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._tokens = self.budget_burst
+
+
+hedge_policy = HedgePolicy()
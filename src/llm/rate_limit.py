@@ -0,0 +1,333 @@
+"""
+Client-side token-bucket rate limiting per model.
+
+Planner, primary and extractor share one Gemini quota and fire in bursts.
+Every chat model built by ``get_llm`` is wrapped in ``RateLimitedModel``,
+which reserves one request and an estimated token count from that
+model's requests/min and tokens/min buckets before calling it. A call
+that has to wait up to ``rate_limits.max_wait_s`` simply queues; one that
+would wait longer raises ``RateLimited`` without touching the network,
+and the router moves on to the next model without tripping its circuit.
+
+Reservations are made up front (buckets may go negative), so waiters are
+served roughly in arrival order without polling. After the call the
+token estimate is corrected with the model's reported usage. A call that
+fails or is cancelled gives its token reservation back, and one cancelled
+while still queued also returns its request.
+
+Buckets live in process memory by default; ``backend: sqlite`` keeps them
+in a small SQLite file so every worker process on the host shares one
+budget.
+
+    rate_limits:
+      enabled: true
+      models:
+        gemini-2.5-flash: {rpm: 10, tpm: 250000}
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.config import paths, settings
+from src.observability.metrics import RATE_LIMIT_REJECTIONS, RATE_LIMIT_WAIT
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimited(Exception):
+    """Raised when a call would wait longer than ``max_wait_s`` for its model's budget."""
+
+
+# ── Bucket backends ──────────────────────────────────────────────────────────
+
+
+class MemoryBuckets:
+    """Token buckets in process memory (thread-safe, event-loop agnostic)."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key → (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, amount: float, capacity: float, rate: float, max_wait: float) -> Optional[float]:
+        """Take ``amount``; return seconds to wait, or None (nothing taken) if over ``max_wait``."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            remaining = tokens - amount
+            wait = max(0.0, -remaining / rate)
+            if wait > max_wait:
+                self._buckets[key] = (tokens, now)
+                return None
+            self._buckets[key] = (remaining, now)
+        return wait
+
+    def adjust(self, key: str, delta: float, capacity: float) -> None:
+        """Return (``delta`` > 0) or take (``delta`` < 0) tokens after the fact."""
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated = self._buckets[key]
+                self._buckets[key] = (min(capacity, tokens + delta), updated)
+
+
+class SQLiteBuckets:
+    """Token buckets in a SQLite file shared by every process on the host."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, key: str, amount: float, capacity: float, rate: float, max_wait: float) -> Optional[float]:
+        conn = self._conn()
+        now = time.time()  # wall clock: shared across processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            remaining = tokens - amount
+            wait = max(0.0, -remaining / rate)
+            stored = tokens if wait > max_wait else remaining
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, stored, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return None if wait > max_wait else wait
+
+    def adjust(self, key: str, delta: float, capacity: float) -> None:
+        self._conn().execute(
+            "UPDATE buckets SET tokens = MIN(?, tokens + ?) WHERE key = ?", (capacity, delta, key)
+        )
+
+
+# ── Limiter ──────────────────────────────────────────────────────────────────
+
+
+def estimate_tokens(input: Any) -> int:
+    """Rough prompt size (~4 characters per token) of a prompt value, messages or text."""
+    if hasattr(input, "to_messages"):
+        input = input.to_messages()
+    if isinstance(input, (list, tuple)):
+        chars = sum(len(str(getattr(m, "content", m))) for m in input)
+    else:
+        chars = len(str(input))
+    return max(1, chars // 4)
+
+
+class RateLimiter:
+    """Per-model requests/min and tokens/min budgets."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        cfg = config if config is not None else settings.get("rate_limits", {})
+        self.max_wait_s: float = float(cfg.get("max_wait_s", 5.0))
+        self.completion_estimate: int = int(cfg.get("completion_tokens_estimate", 256))
+        self.limits: Dict[str, Dict[str, float]] = cfg.get("models") or {}
+        if cfg.get("backend", "memory") == "sqlite":
+            self.buckets: Any = SQLiteBuckets(str(Path(paths.ROOT) / cfg.get("path", "data/db/rate_limits.db")))
+        else:
+            self.buckets = MemoryBuckets()
+        self._counts: Dict[str, Dict[str, float]] = {}
+        self._counts_lock = threading.Lock()
+
+    def _limits(self, model: str) -> Tuple[float, float]:
+        lim = self.limits.get(model) or self.limits.get("default") or {}
+        return float(lim.get("rpm") or 0), float(lim.get("tpm") or 0)
+
+    def _reserve(self, model: str, tokens: int) -> Optional[float]:
+        rpm, tpm = self._limits(model)
+        waits = []
+        if rpm > 0:
+            w = self.buckets.reserve(f"{model}:rpm", 1, rpm, rpm / 60.0, self.max_wait_s)
+            if w is None:
+                return None
+            waits.append(w)
+        if tpm > 0:
+            w = self.buckets.reserve(f"{model}:tpm", tokens, tpm, tpm / 60.0, self.max_wait_s)
+            if w is None:
+                if rpm > 0:
+                    self.buckets.adjust(f"{model}:rpm", 1, rpm)
+                return None
+            waits.append(w)
+        return max(waits, default=0.0)
+
+    def _wait_for(self, model: str, tokens: int) -> float:
+        wait = self._reserve(model, tokens)
+        if wait is None:
+            RATE_LIMIT_REJECTIONS.inc(model=model)
+            self._count(model, "rejected")
+            raise RateLimited(f"local rate limit for {model}: budget not available within {self.max_wait_s}s")
+        RATE_LIMIT_WAIT.observe(wait, model=model)
+        self._count(model, "queued" if wait > 0 else "immediate", wait)
+        return wait
+
+    def _count(self, model: str, outcome: str, wait: float = 0.0) -> None:
+        with self._counts_lock:
+            c = self._counts.setdefault(model, {"immediate": 0, "queued": 0, "rejected": 0, "wait_s": 0.0})
+            c[outcome] += 1
+            c["wait_s"] += wait
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-model admitted/queued/rejected counts and total queueing time in this process."""
+        with self._counts_lock:
+            return {m: {**c, "wait_s": round(c["wait_s"], 3)} for m, c in sorted(self._counts.items())}
+
+    def enabled_for(self, model: str) -> bool:
+        rpm, tpm = self._limits(model)
+        return rpm > 0 or tpm > 0
+
+    async def acquire(self, model: str, tokens: int) -> float:
+        """Wait for budget for one call of ~``tokens``; returns the wait in seconds."""
+        if not self.enabled_for(model):
+            return 0.0
+        if isinstance(self.buckets, SQLiteBuckets):
+            wait = await asyncio.to_thread(self._wait_for, model, tokens)
+        else:
+            wait = self._wait_for(model, tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                self.refund(model, tokens, request=True)
+                raise
+        return wait
+
+    def acquire_sync(self, model: str, tokens: int) -> float:
+        if not self.enabled_for(model):
+            return 0.0
+        wait = self._wait_for(model, tokens)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            except BaseException:
+                self.refund(model, tokens, request=True)
+                raise
+        return wait
+
+    def settle(self, model: str, estimated: int, actual: int) -> None:
+        """Correct the token reservation once real usage is known."""
+        _, tpm = self._limits(model)
+        if tpm > 0 and actual > 0 and actual != estimated:
+            self.buckets.adjust(f"{model}:tpm", estimated - actual, tpm)
+
+    def refund(self, model: str, tokens: int, request: bool = False) -> None:
+        """Give back a reservation whose call failed (tokens) or never went out (``request`` too)."""
+        rpm, tpm = self._limits(model)
+        if tpm > 0:
+            self.buckets.adjust(f"{model}:tpm", tokens, tpm)
+        if request and rpm > 0:
+            self.buckets.adjust(f"{model}:rpm", 1, rpm)
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
+
+
+def configure_rate_limiter(config: Optional[Dict[str, Any]] = None) -> RateLimiter:
+    """Replace the process-wide limiter (fresh buckets), e.g. between load-test levels."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = RateLimiter(config)
+    return _limiter
+
+
+# ── Runnable wrapper ─────────────────────────────────────────────────────────
+
+
+def _usage_tokens(result: Any) -> int:
+    if isinstance(result, dict) and "raw" in result:
+        result = result["raw"]  # with_structured_output(include_raw=True)
+    usage = getattr(result, "usage_metadata", None) or {}
+    return int(usage.get("input_tokens", 0) or 0) + int(usage.get("output_tokens", 0) or 0)
+
+
+class RateLimitedModel(Runnable):
+    """Chat model (or derived runnable) that waits for its model's budget before each call."""
+
+    def __init__(self, bound: Runnable, model: str):
+        self.bound = bound
+        self.model = model
+
+    @property
+    def InputType(self) -> Any:  # noqa: N802 (Runnable API)
+        return self.bound.InputType
+
+    @property
+    def OutputType(self) -> Any:  # noqa: N802 (Runnable API)
+        return self.bound.OutputType
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name in ("bound", "model"):
+            raise AttributeError(name)
+        attr = getattr(self.bound, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            result = attr(*args, **kwargs)
+            return RateLimitedModel(result, self.model) if isinstance(result, Runnable) else result
+
+        return wrapped
+
+    def with_structured_output(self, *args: Any, **kwargs: Any) -> "RateLimitedModel":
+        return RateLimitedModel(self.bound.with_structured_output(*args, **kwargs), self.model)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        limiter = get_rate_limiter()
+        estimated = estimate_tokens(input) + limiter.completion_estimate
+        limiter.acquire_sync(self.model, estimated)
+        try:
+            result = self.bound.invoke(input, config, **kwargs)
+        except BaseException:
+            limiter.refund(self.model, estimated)
+            raise
+        limiter.settle(self.model, estimated, _usage_tokens(result))
+        return result
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        limiter = get_rate_limiter()
+        estimated = estimate_tokens(input) + limiter.completion_estimate
+        await limiter.acquire(self.model, estimated)
+        try:
+            result = await self.bound.ainvoke(input, config, **kwargs)
+        except BaseException:
+            limiter.refund(self.model, estimated)
+            raise
+        limiter.settle(self.model, estimated, _usage_tokens(result))
+        return result
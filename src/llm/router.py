@@ -0,0 +1,382 @@
+"""
+Health-aware routing across the Google model list.
+
+``with_fallbacks`` always starts at the primary, so once a model's quota
+is exhausted every request still pays a failed round-trip before reaching
+a working one. ``RoutedChatModel`` instead asks the process-wide
+``ModelHealthRegistry`` for an order on every call:
+
+* each model keeps an EWMA of latency and of its error rate, plus its
+  429 count;
+* a 429 opens that model's circuit for ``quota_cooldown_s`` (doubling on
+  repeated trips up to ``max_cooldown_s``); other errors open it after
+  ``consecutive_failures`` in a row or once the error EWMA passes
+  ``error_threshold``;
+* after the cooldown the next request tries that model first as a probe
+  (half-open); success closes the circuit, failure re-opens it with a
+  longer cooldown;
+* healthy models are ordered by latency EWMA (``strategy: latency``) or
+  kept in configured order (``strategy: ordered``); models with no
+  samples yet keep their configured position after the measured ones.
+  Open circuits go last, so if everything is tripped the request still
+  tries the model that reopens soonest;
+* async calls from nodes listed in ``hedging.nodes`` may race the first
+  two models in that order (see ``src/llm/hedging.py``).
+
+Usage:
+    from src.llm.router import RoutedChatModel, model_health
+
+    llm = RoutedChatModel({"gemini-2.5-flash": m1, "gemini-2.0-flash": m2})
+    await llm.ainvoke(messages)
+    model_health.snapshot()
+"""
+
+import asyncio
+import collections
+import logging
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.config import settings
+from src.llm.hedging import HedgePolicy, hedge_policy
+from src.llm.rate_limit import RateLimited
+from src.observability.metrics import MODEL_CIRCUIT_TRIPS, MODEL_LATENCY_EWMA
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_quota_error(error: BaseException) -> bool:
+    text = str(error)
+    return "429" in text or "RESOURCE_EXHAUSTED" in text
+
+
+class _Health:
+    __slots__ = (
+        "latency_ewma", "error_ewma", "calls", "errors", "quota_errors",
+        "consecutive_failures", "state", "open_until", "cooldown_s", "recent",
+    )
+
+    def __init__(self, window: int) -> None:
+        self.latency_ewma: Optional[float] = None
+        self.recent: Deque[float] = collections.deque(maxlen=window)
+        self.error_ewma = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.quota_errors = 0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.open_until = 0.0
+        self.cooldown_s = 0.0
+
+
+class ModelHealthRegistry:
+    """Per-model latency/error statistics and circuit-breaker state."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        cfg = config if config is not None else settings.get("routing", {})
+        self.strategy: str = cfg.get("strategy", "latency")
+        self.alpha: float = float(cfg.get("ewma_alpha", 0.2))
+        self.quota_cooldown_s: float = float(cfg.get("quota_cooldown_s", 30.0))
+        self.error_cooldown_s: float = float(cfg.get("error_cooldown_s", 15.0))
+        self.max_cooldown_s: float = float(cfg.get("max_cooldown_s", 300.0))
+        self.error_threshold: float = float(cfg.get("error_threshold", 0.5))
+        self.min_calls: int = int(cfg.get("min_calls", 5))
+        self.max_consecutive: int = int(cfg.get("consecutive_failures", 3))
+        self.window: int = int(cfg.get("latency_window", 200))
+        self._models: Dict[str, _Health] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, model: str) -> _Health:
+        h = self._models.get(model)
+        if h is None:
+            h = self._models[model] = _Health(self.window)
+        return h
+
+    # ── Routing ──────────────────────────────────────────────────────────
+
+    def order(self, models: List[str]) -> List[str]:
+        """Order ``models`` for the next call (see module docstring)."""
+        now = time.monotonic()
+        probes: List[str] = []
+        healthy: List[Tuple[Tuple[int, float, int], str]] = []
+        tripped: List[Tuple[float, str]] = []
+        with self._lock:
+            for position, model in enumerate(models):
+                h = self._get(model)
+                if h.state != CLOSED:
+                    if now < h.open_until:
+                        # Cooling down, or a probe is already in flight.
+                        tripped.append((h.open_until, model))
+                        continue
+                    # Cooldown over (or the last probe never reported back):
+                    # this request probes it first; others keep avoiding it.
+                    h.state = HALF_OPEN
+                    h.open_until = now + self.error_cooldown_s
+                    probes.append(model)
+                    continue
+                if self.strategy == "latency" and h.latency_ewma is not None:
+                    healthy.append(((0, h.latency_ewma, position), model))
+                else:
+                    healthy.append(((1, 0.0, position), model))
+        healthy.sort()
+        tripped.sort()
+        return probes + [m for _, m in healthy] + [m for _, m in tripped]
+
+    # ── Outcomes ─────────────────────────────────────────────────────────
+
+    def record_success(self, model: str, latency_s: float) -> None:
+        with self._lock:
+            h = self._get(model)
+            h.calls += 1
+            h.consecutive_failures = 0
+            h.error_ewma *= 1.0 - self.alpha
+            h.latency_ewma = latency_s if h.latency_ewma is None else (
+                self.alpha * latency_s + (1.0 - self.alpha) * h.latency_ewma
+            )
+            h.recent.append(latency_s)
+            if h.state != CLOSED:
+                logger.info("Router: %s recovered, closing circuit", model)
+            h.state, h.cooldown_s = CLOSED, 0.0
+            ewma = h.latency_ewma
+        MODEL_LATENCY_EWMA.set(ewma, model=model)
+
+    def record_censored(self, model: str, latency_s: float) -> None:
+        """
+        A call cancelled after ``latency_s`` (a hedge loser): its latency is
+        at least that. Counted as a latency sample only; dropping it would
+        leave just the fast calls and pull the hedge delay down.
+        """
+        with self._lock:
+            h = self._get(model)
+            h.latency_ewma = latency_s if h.latency_ewma is None else (
+                self.alpha * latency_s + (1.0 - self.alpha) * h.latency_ewma
+            )
+            h.recent.append(latency_s)
+            ewma = h.latency_ewma
+        MODEL_LATENCY_EWMA.set(ewma, model=model)
+
+    def record_failure(self, model: str, error: BaseException) -> None:
+        quota = is_quota_error(error)
+        with self._lock:
+            h = self._get(model)
+            h.calls += 1
+            h.errors += 1
+            h.quota_errors += quota
+            h.consecutive_failures += 1
+            h.error_ewma = self.alpha + (1.0 - self.alpha) * h.error_ewma
+            if h.state == OPEN:
+                return  # in-flight calls dispatched before the trip
+            if h.state == HALF_OPEN:
+                reason = "probe_failed"
+            elif quota:
+                reason = "quota"
+            elif h.consecutive_failures >= self.max_consecutive or (
+                h.calls >= self.min_calls and h.error_ewma >= self.error_threshold
+            ):
+                reason = "errors"
+            else:
+                return
+            base = self.quota_cooldown_s if quota else self.error_cooldown_s
+            h.cooldown_s = min(self.max_cooldown_s, max(base, h.cooldown_s * 2))
+            h.open_until = time.monotonic() + h.cooldown_s
+            h.state = OPEN
+            cooldown = h.cooldown_s
+        MODEL_CIRCUIT_TRIPS.inc(model=model, reason=reason)
+        logger.warning("Router: opening circuit for %s for %.0fs (%s)", model, cooldown, reason)
+
+    # ── Introspection ────────────────────────────────────────────────────
+
+    def latency_percentile(self, model: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """``q``-th percentile of the last ``latency_window`` samples (successes and hedge losers)."""
+        with self._lock:
+            h = self._models.get(model)
+            samples = sorted(h.recent) if h is not None else []
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100.0))]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                model: {
+                    "state": h.state,
+                    "latency_ewma_s": round(h.latency_ewma, 4) if h.latency_ewma is not None else None,
+                    "error_ewma": round(h.error_ewma, 4),
+                    "calls": h.calls,
+                    "errors": h.errors,
+                    "quota_errors": h.quota_errors,
+                    "reopens_in_s": round(max(0.0, h.open_until - now), 1) if h.state == OPEN else None,
+                }
+                for model, h in self._models.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+model_health = ModelHealthRegistry()
+
+
+class RoutedChatModel(Runnable):
+    """
+    Runnable over several chat models, tried in ``model_health`` order.
+
+    Methods that return a new runnable (``with_structured_output``,
+    ``bind_tools``, ``bind``…) are applied to every model, as
+    ``RunnableWithFallbacks`` does, so callers can treat it like a model.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, Runnable],
+        health: Optional[ModelHealthRegistry] = None,
+        hedging: Optional[HedgePolicy] = None,
+    ):
+        self.models = models
+        self.health = health or model_health
+        self.hedging = hedging or hedge_policy
+
+    @property
+    def InputType(self) -> Any:  # noqa: N802 (Runnable API)
+        return next(iter(self.models.values())).InputType
+
+    @property
+    def OutputType(self) -> Any:  # noqa: N802 (Runnable API)
+        return next(iter(self.models.values())).OutputType
+
+    def _map(self, fn: Callable[[Runnable], Runnable]) -> "RoutedChatModel":
+        return RoutedChatModel(
+            {name: fn(r) for name, r in self.models.items()}, self.health, self.hedging
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name in ("models", "health", "hedging"):
+            raise AttributeError(name)
+        attr = getattr(next(iter(self.models.values())), name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            result = attr(*args, **kwargs)
+            if isinstance(result, Runnable):
+                return self._map(lambda r: getattr(r, name)(*args, **kwargs))
+            return result
+
+        return wrapped
+
+    def with_structured_output(self, *args: Any, **kwargs: Any) -> "RoutedChatModel":
+        return self._map(lambda r: r.with_structured_output(*args, **kwargs))
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        last: Optional[BaseException] = None
+        for name in self.health.order(list(self.models)):
+            t0 = time.perf_counter()
+            try:
+                result = self.models[name].invoke(input, config, **kwargs)
+            except RateLimited as e:
+                last = e  # local budget, not a model fault: no health penalty
+                continue
+            except Exception as e:
+                self.health.record_failure(name, e)
+                last = e
+                continue
+            self.health.record_success(name, time.perf_counter() - t0)
+            return result
+        assert last is not None
+        raise last
+
+    async def _attempt(self, name: str, input: Any, config: Optional[RunnableConfig], **kwargs: Any) -> Any:
+        t0 = time.perf_counter()
+        try:
+            result = await self.models[name].ainvoke(input, config, **kwargs)
+        except RateLimited:
+            raise  # local budget, not a model fault: no health penalty
+        except Exception as e:
+            self.health.record_failure(name, e)
+            raise
+        self.health.record_success(name, time.perf_counter() - t0)
+        return result
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        order = self.health.order(list(self.models))
+        if len(order) > 1 and self.hedging.applies():
+            self.hedging.earn()
+            try:
+                return await self._ainvoke_hedged(order[0], order[1], input, config, **kwargs)
+            except Exception as e:
+                last: Optional[BaseException] = e
+            order = order[2:]
+        else:
+            last = None
+
+        for name in order:
+            try:
+                return await self._attempt(name, input, config, **kwargs)
+            except Exception as e:
+                last = e
+        assert last is not None
+        raise last
+
+    async def _ainvoke_hedged(
+        self, first: str, second: str, input: Any, config: Optional[RunnableConfig], **kwargs: Any
+    ) -> Any:
+        """Race ``first`` against a delayed ``second``; raise only if both fail."""
+        delay = self.hedging.delay_for(first)
+        t0 = time.perf_counter()
+        primary = asyncio.ensure_future(self._attempt(first, input, config, **kwargs))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done:
+            if primary.exception() is None:
+                return primary.result()
+            # Failed fast: plain fallback to the second model, no hedge.
+            return await self._attempt(second, input, config, **kwargs)
+        if not self.hedging.try_spend():
+            try:
+                return await primary
+            except Exception:
+                return await self._attempt(second, input, config, **kwargs)
+
+        self.hedging.record("fired")
+        t_hedge = time.perf_counter()
+        hedge = asyncio.ensure_future(self._attempt(second, input, config, **kwargs))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.hedging.record("hedge_won" if task is hedge else "primary_won")
+                        return task.result()
+                    error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            now = time.perf_counter()
+            for task in pending:
+                if not task.cancelled():
+                    continue  # finished before the cancel landed: already recorded
+                if task is primary:
+                    # It had already run past the hedge delay.
+                    self.health.record_censored(first, max(now - t0, delay))
+                else:
+                    self.health.record_censored(second, now - t_hedge)
+        assert error is not None
+        raise error
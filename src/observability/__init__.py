@@ -0,0 +1 @@
+# Instrumentation: per-node timings, tracing, metrics.
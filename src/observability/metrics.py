@@ -0,0 +1,298 @@
+"""
+In-process metrics registry with a Prometheus text endpoint.
+
+Counters, gauges and fixed-bucket histograms with bounded memory: each
+metric keeps at most ``metrics.max_series_per_metric`` label sets, and
+anything past that is folded into a single ``other`` series, so a
+long-running process never grows with the number of distinct labels.
+
+Usage:
+    from src.observability.metrics import REQUESTS, start_metrics_server
+
+    REQUESTS.inc(route="verify")
+    start_metrics_server()          # GET http://127.0.0.1:9464/metrics
+"""
+
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_SERIES: int = settings.get("metrics", {}).get("max_series_per_metric", 500)
+_OVERFLOW = "other"
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str], existing: Dict[LabelKey, object]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        if key not in existing and len(existing) >= _MAX_SERIES:
+            return tuple(_OVERFLOW for _ in self.labelnames)
+        return key
+
+    def collect(self) -> List[str]:
+        raise NotImplementedError
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        with self._lock:
+            key = self._key(labels, self._values)
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[n]) for n in self.labelnames), 0.0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_fmt_labels(self.labelnames, k)} {_fmt_value(v)}" for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels, self._values)] = float(value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Compute the (unlabelled) value lazily at scrape time."""
+        self._function = fn
+
+    def collect(self) -> List[str]:
+        if self._function is not None:
+            try:
+                return [f"{self.name} {_fmt_value(self._function())}"]
+            except Exception as e:
+                logger.warning("Gauge %s callback failed: %s", self.name, e)
+                return []
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_fmt_labels(self.labelnames, k)} {_fmt_value(v)}" for k, v in items
+        ]
+
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # key → [bucket counts..., sum, count]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        with self._lock:
+            key = self._key(labels, self._values)
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            row[-2] += value
+            row[-1] += 1
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines: List[str] = []
+        for key, row in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                le = f'le="{_fmt_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le)} {_fmt_value(cumulative)}"
+                )
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labelnames, key)} {_fmt_value(row[-2])}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labelnames, key)} {_fmt_value(row[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.header())
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ── Pipeline metrics ─────────────────────────────────────────────────────────
+
+REQUESTS = registry.register(
+    Counter("guardrail_requests_total", "Workflow runs by planner route.", ["route"])
+)
+OVERALL_STATUS = registry.register(
+    Counter("guardrail_overall_status_total", "Workflow runs by overall_status.", ["status"])
+)
+REQUEST_LATENCY = registry.register(
+    Histogram("guardrail_request_latency_seconds", "End-to-end workflow latency.", ["route"])
+)
+NODE_LATENCY = registry.register(
+    Histogram("guardrail_node_latency_seconds", "Latency of each graph node.", ["node"])
+)
+LLM_CALLS = registry.register(
+    Counter("guardrail_llm_calls_total", "Chat-model attempts by model and outcome.", ["model", "outcome"])
+)
+LLM_FALLBACKS = registry.register(
+    Counter(
+        "guardrail_llm_fallback_activations_total",
+        "Successful LLM answers served by a fallback model (not the first tried).",
+        ["model"],
+    )
+)
+MODEL_CIRCUIT_TRIPS = registry.register(
+    Counter("guardrail_model_circuit_trips_total", "Router circuit-breaker trips by model and reason.",
+            ["model", "reason"])
+)
+MODEL_LATENCY_EWMA = registry.register(
+    Gauge("guardrail_model_latency_ewma_seconds", "Router latency EWMA per model.", ["model"])
+)
+LLM_HEDGES = registry.register(
+    Counter("guardrail_llm_hedges_total",
+            "Hedged LLM requests: fired, hedge_won, primary_won, budget_exhausted.", ["outcome"])
+)
+RATE_LIMIT_WAIT = registry.register(
+    Histogram("guardrail_rate_limit_wait_seconds", "Time calls queued for a model's local budget.", ["model"])
+)
+RATE_LIMIT_REJECTIONS = registry.register(
+    Counter("guardrail_rate_limit_rejections_total",
+            "Calls refused locally because the model's budget exceeded max_wait_s.", ["model"])
+)
+COALESCED_CALLS = registry.register(
+    Counter("guardrail_coalesced_calls_total",
+            "Calls that awaited an identical in-flight call instead of running.", ["level"])
+)
+CACHE_LOOKUPS = registry.register(
+    Counter("guardrail_cache_lookups_total", "Cache lookups by cache and result (hit/miss).", ["cache", "result"])
+)
+REVIEW_QUEUE_DEPTH = registry.register(
+    Gauge("guardrail_review_queue_depth", "Items waiting in the human review queue.")
+)
+
+
+def _count_review_queue() -> float:
+    from src.storage.review_queue import get_review_queue
+
+    return float(get_review_queue().count())
+
+
+REVIEW_QUEUE_DEPTH.set_function(_count_review_queue)
+
+
+# ── HTTP endpoint ────────────────────────────────────────────────────────────
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802 (http.server API)
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # keep scrapes out of the app log
+        logger.debug("metrics: " + format, *args)
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(host: Optional[str] = None, port: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    """Serve ``/metrics`` from a daemon thread (idempotent, once per process)."""
+    global _server
+    cfg = settings.get("metrics", {})
+    with _server_lock:
+        if _server is not None:
+            return _server
+        host = host or cfg.get("host", "127.0.0.1")
+        port = int(port if port is not None else cfg.get("port", 9464))
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            # Another worker in this host already owns the port.
+            logger.warning("Metrics server not started on %s:%d: %s", host, port, e)
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info("Metrics endpoint on http://%s:%d/metrics", host, port)
+        return _server
@@ -0,0 +1,248 @@
+"""
+Per-node latency and LLM usage instrumentation.
+
+Every node registered in ``create_workflow`` is wrapped with
+``instrument_node``. The wrapper times the node and, through a context
+variable, lets the shared ``LLMUsageCallback`` (attached to every chat
+model built by ``get_llm``) attribute LLM calls to the node that made
+them. The result is merged into ``state["metadata"]["nodes"]``:
+
+    {
+        "planner": {
+            "started_at": 1718000000.123, "ended_at": 1718000001.456,
+            "duration_s": 1.333, "model": "gemini-2.0-flash",
+            "fallback_index": 2, "retries": 2,
+            "prompt_tokens": 210, "completion_tokens": 48, "llm_calls": 3,
+            "cache_hits": 0,
+        },
+        ...
+    }
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.agents.utils import question_hash
+from src.observability.metrics import LLM_CALLS, LLM_FALLBACKS, NODE_LATENCY
+from src.observability.tracing import end_span, get_tracer, start_span
+
+logger = logging.getLogger(__name__)
+
+NodeFn = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class NodeStats:
+    """Timing and LLM usage collected while a single node runs."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.ended_at: Optional[float] = None
+        self._t0 = time.perf_counter()
+        self.duration_s = 0.0
+        self.calls: List[Dict[str, Any]] = []
+        self.cache_hits = 0
+        self._open: Dict[UUID, Dict[str, Any]] = {}
+
+    # ── LLM call bookkeeping (driven by LLMUsageCallback) ────────────────
+
+    def start_call(self, run_id: UUID, model: Optional[str]) -> None:
+        call = {
+            "model": model,
+            "fallback_index": len(self.calls),
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "duration_s": 0.0,
+            "error": None,
+            "_t0": time.perf_counter(),
+        }
+        self.calls.append(call)
+        self._open[run_id] = call
+
+    def end_call(
+        self,
+        run_id: UUID,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        model: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        call = self._open.pop(run_id, None)
+        if call is None:
+            return
+        call["duration_s"] = round(time.perf_counter() - call.pop("_t0"), 4)
+        call["prompt_tokens"] = prompt_tokens
+        call["completion_tokens"] = completion_tokens
+        call["error"] = error
+        if model:
+            call["model"] = model
+
+    def finish(self) -> None:
+        self.ended_at = time.time()
+        self.duration_s = time.perf_counter() - self._t0
+
+    # ── Serialisation ────────────────────────────────────────────────────
+
+    def to_dict(self) -> Dict[str, Any]:
+        succeeded = [c for c in self.calls if c["error"] is None and "_t0" not in c]
+        last = succeeded[-1] if succeeded else None
+        return {
+            "started_at": round(self.started_at, 3),
+            "ended_at": round(self.ended_at or time.time(), 3),
+            "duration_s": round(self.duration_s, 4),
+            "model": last["model"] if last else None,
+            "fallback_index": last["fallback_index"] if last else None,
+            "retries": sum(1 for c in self.calls if c["error"] not in (None, "CancelledError")),
+            "hedged": sum(1 for c in self.calls if c["error"] == "CancelledError"),
+            "prompt_tokens": sum(c["prompt_tokens"] for c in self.calls),
+            "completion_tokens": sum(c["completion_tokens"] for c in self.calls),
+            "llm_calls": len(self.calls),
+            "cache_hits": self.cache_hits,
+        }
+
+
+_current_node: ContextVar[Optional[NodeStats]] = ContextVar("current_node", default=None)
+
+
+def current_node() -> Optional[NodeStats]:
+    """Return the stats of the node currently executing, if any."""
+    return _current_node.get()
+
+
+class LLMUsageCallback(BaseCallbackHandler):
+    """
+    Attributes chat-model calls to the currently running node.
+
+    A single instance is shared by all models. Outside an instrumented node
+    it only emits ``llm.call`` spans. ``run_inline`` keeps it in the
+    caller's context so the ``ContextVar`` lookup sees the right node and
+    spans nest under the node span.
+    """
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._spans: Dict[UUID, Any] = {}
+        self._models: Dict[UUID, Tuple[str, int]] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        stats = _current_node.get()
+        model = (metadata or {}).get("ls_model_name") or (
+            kwargs.get("invocation_params") or {}
+        ).get("model")
+        fallback_index = len(stats.calls) if stats is not None else 0
+        self._models[run_id] = (model or "unknown", fallback_index)
+        self._spans[run_id] = get_tracer().start_span(
+            "llm.call",
+            attributes={
+                "llm.model": model or "unknown",
+                "llm.fallback_index": fallback_index,
+                "guardrail.node": stats.name if stats is not None else "",
+            },
+        )
+        if stats is not None:
+            stats.start_call(run_id, model)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        stats = _current_node.get()
+        prompt_tokens = completion_tokens = 0
+        model = None
+        for generations in response.generations:
+            for gen in generations:
+                message = getattr(gen, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                prompt_tokens += int(usage.get("input_tokens", 0) or 0)
+                completion_tokens += int(usage.get("output_tokens", 0) or 0)
+                meta = getattr(message, "response_metadata", None) or {}
+                model = model or meta.get("model_name")
+        requested, fallback_index = self._models.pop(run_id, ("unknown", 0))
+        LLM_CALLS.inc(model=requested, outcome="ok")
+        if fallback_index > 0:
+            LLM_FALLBACKS.inc(model=requested)
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            span.set_attribute("llm.prompt_tokens", prompt_tokens)
+            span.set_attribute("llm.completion_tokens", completion_tokens)
+            end_span(span)
+        if stats is not None:
+            stats.end_call(run_id, prompt_tokens, completion_tokens, model=model)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        stats = _current_node.get()
+        requested, _ = self._models.pop(run_id, ("unknown", 0))
+        quota = "429" in str(error) or "RESOURCE_EXHAUSTED" in str(error)
+        if isinstance(error, asyncio.CancelledError):
+            outcome = "cancelled"  # loser of a hedged request
+        else:
+            outcome = "quota" if quota else "error"
+        LLM_CALLS.inc(model=requested, outcome=outcome)
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            end_span(span, error)
+        if stats is not None:
+            stats.end_call(run_id, error=type(error).__name__)
+
+
+usage_callback = LLMUsageCallback()
+
+
+def instrument_node(name: str, fn: NodeFn) -> NodeFn:
+    """Wrap a graph node so its timing and LLM usage land in ``metadata``."""
+
+    @functools.wraps(fn)
+    async def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+        stats = NodeStats(name)
+        token = _current_node.set(stats)
+        attributes = {
+            "guardrail.node": name,
+            "guardrail.question_hash": question_hash(state.get("question", "")),
+            "guardrail.claim_count": len(state.get("claims") or []),
+        }
+        try:
+            with start_span(f"node.{name}", attributes) as span:
+                update = await fn(state)
+                if update and "claims" in update:
+                    span.set_attribute("guardrail.claim_count", len(update["claims"]))
+        finally:
+            _current_node.reset(token)
+            stats.finish()
+            NODE_LATENCY.observe(stats.duration_s, node=name)
+            logger.debug("Node %s finished in %.3fs", name, stats.duration_s)
+
+        update = dict(update or {})
+        metadata = dict(update.get("metadata") or {})
+        metadata["nodes"] = {**metadata.get("nodes", {}), name: stats.to_dict()}
+        update["metadata"] = metadata
+        return update
+
+    return wrapper
+
+
+def summarize_nodes(nodes: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Collapse per-node figures into run-level totals for logging."""
+    if not nodes:
+        return {}
+    start = min(n["started_at"] for n in nodes.values())
+    end = max(n["ended_at"] for n in nodes.values())
+    return {
+        "wall_s": round(end - start, 4),
+        "prompt_tokens": sum(n.get("prompt_tokens", 0) for n in nodes.values()),
+        "completion_tokens": sum(n.get("completion_tokens", 0) for n in nodes.values()),
+        "retries": sum(n.get("retries", 0) for n in nodes.values()),
+        "slowest_node": max(nodes, key=lambda k: nodes[k]["duration_s"]),
+    }
@@ -0,0 +1,135 @@
+"""
+OpenTelemetry tracing for the verification pipeline.
+
+Configured from the ``tracing`` block in ``settings.yaml``:
+
+    tracing:
+      enabled: true
+      exporter: "file"          # "otlp", "console" or "file"
+      endpoint: "http://localhost:4317"
+      file_path: "logs/traces.jsonl"
+      service_name: "hallucination-guardrail"
+
+When tracing is disabled the OpenTelemetry API hands out no-op spans, so
+call sites never need to check whether it is on.
+
+Span layout for one request:
+
+    workflow.run
+    ├── node.planner ── llm.call (fallback_index=0, 1, …)
+    ├── node.primary_llm ── llm.call
+    ├── node.claim_extractor ── llm.call
+    ├── node.verifier ── sql.lookup, embedding.embed_query, chroma.query, …
+    ├── node.human_validation
+    └── node.evaluation
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.trace import Span, Status, StatusCode
+
+from src.config import paths, settings
+
+logger = logging.getLogger(__name__)
+
+_TRACER_NAME = "guardrail"
+_init_lock = threading.Lock()
+_initialized = False
+
+
+class _JsonlFileExporter:
+    """Minimal span exporter that appends one JSON object per span to a file."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Any]):
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        lines = [span.to_json(indent=None) + "\n" for span in spans]
+        with self._lock, open(self.file_path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+def _make_exporter(cfg: Dict[str, Any]):
+    kind = cfg.get("exporter", "console")
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=cfg.get("endpoint"), insecure=cfg.get("insecure", True))
+    if kind == "file":
+        file_path = cfg.get("file_path", "logs/traces.jsonl")
+        if not os.path.isabs(file_path):
+            file_path = os.path.join(paths.ROOT, file_path)
+        return _JsonlFileExporter(file_path)
+    if kind == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    raise ValueError(f"Unknown tracing exporter: {kind}")
+
+
+def init_tracing() -> None:
+    """Install the global tracer provider once, if tracing is enabled."""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        _initialized = True
+
+        cfg = settings.get("tracing", {})
+        if not cfg.get("enabled", False):
+            return
+
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        provider = TracerProvider(
+            resource=Resource.create(
+                {"service.name": cfg.get("service_name", "hallucination-guardrail")}
+            )
+        )
+        provider.add_span_processor(BatchSpanProcessor(_make_exporter(cfg)))
+        trace.set_tracer_provider(provider)
+        logger.info("Tracing enabled (exporter=%s)", cfg.get("exporter", "console"))
+
+
+def get_tracer() -> trace.Tracer:
+    return trace.get_tracer(_TRACER_NAME)
+
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+    """Start a span as the current span; exceptions mark it as errored."""
+    with get_tracer().start_as_current_span(
+        name,
+        attributes={k: v for k, v in (attributes or {}).items() if v is not None},
+        record_exception=True,
+        set_status_on_exception=True,
+    ) as span:
+        yield span
+
+
+def end_span(span: Span, error: Optional[BaseException] = None) -> None:
+    """End a span started with ``get_tracer().start_span`` (callback style)."""
+    if error is not None:
+        span.record_exception(error)
+        span.set_status(Status(StatusCode.ERROR, type(error).__name__))
+    span.end()
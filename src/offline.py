@@ -0,0 +1,187 @@
+"""
+Deterministic offline stand-ins for the chat model and embeddings.
+
+``ScriptedChatModel`` is what ``get_llm`` returns for the ``offline``
+provider. It recognises the three prompts the graph sends (planner,
+primary answer, claim extraction) by their system message and answers
+each in the shape the node expects: planner JSON, a short answer built
+from a small IPC → BNS script, and a numbered claim list. Output depends
+only on the input messages and ``seed``, so runs are reproducible; an
+optional (seeded) latency makes it usable for benchmarks.
+
+``HashingEmbeddings`` is a feature-hashing bag-of-words embedding: texts
+sharing words land close together, which is enough for the vector store
+to return plausible neighbours without an API key.
+
+Usage:
+    from src.offline import HashingEmbeddings, ScriptedChatModel
+
+    llm = ScriptedChatModel(latency_s=0.05, jitter_s=0.01)
+    vector = IPCBNSVectorStore(persist_dir=tmp, embeddings=HashingEmbeddings())
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# Mirrors src/rag/seed_db.py so answers exercise every verifier path:
+# seeded sections are "supported", 304B/498A are not in the table
+# ("uncertain") and 420 is deliberately wrong ("contradicted").
+DEFAULT_SCRIPT: Dict[str, str] = {
+    "302": "101",
+    "307": "109",
+    "376": "64",
+    "379": "303",
+    "420": "316",
+    "499": "356",
+    "120B": "61",
+    "143": "189",
+    "304B": "80",
+    "498A": "85",
+}
+
+_SECTION_RE = re.compile(r"\b(\d{2,3}[A-Z]?)\b")
+_LEGAL_RE = re.compile(r"\b(ipc|bns|section|penal|sanhita|offence|punish\w*|crime|law)\b", re.I)
+_WORD_RE = re.compile(r"\w+")
+
+
+def _stable_hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text.split()))
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that answers the graph's prompts from a fixed script."""
+
+    model: str = "offline-scripted"
+    temperature: float = 0.0
+    latency_s: float = 0.0
+    jitter_s: float = 0.0
+    seed: int = 0
+    script: Dict[str, str] = DEFAULT_SCRIPT
+
+    @property
+    def _llm_type(self) -> str:
+        return "offline-scripted"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "latency_s": self.latency_s, "seed": self.seed}
+
+    # ── Scripted responses ───────────────────────────────────────────────
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        system = next((str(m.content) for m in messages if m.type == "system"), "")
+        user = str(messages[-1].content) if messages else ""
+
+        if "planner" in system:
+            legal = bool(_LEGAL_RE.search(user))
+            return json.dumps(
+                {
+                    "plan": "Answer, extract claims, verify against the IPC/BNS store."
+                    if legal else "Answer directly; not a criminal-law question.",
+                    "route": "verify" if legal else "direct",
+                }
+            )
+
+        if "extract atomic factual claims" in system:
+            answer = user.split("Answer:", 1)[-1].split("Extract atomic claims.", 1)[0]
+            sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", answer) if len(s.strip()) > 5]
+            return "\n".join(f"{i}. {s}" for i, s in enumerate(sentences, 1))
+
+        sections = _SECTION_RE.findall(user.upper())
+        lines = [
+            f"IPC Section {ipc} corresponds to BNS Section {self.script[ipc]}."
+            for ipc in dict.fromkeys(sections)
+            if ipc in self.script
+        ]
+        if not lines:
+            lines = ["I am not certain which IPC or BNS section applies here."]
+        lines.append("The BNS replaced the IPC with effect from 1 July 2024.")
+        return " ".join(lines)
+
+    def _delay(self, messages: List[BaseMessage]) -> float:
+        if self.latency_s <= 0 and self.jitter_s <= 0:
+            return 0.0
+        key = f"{self.seed}|" + "|".join(str(m.content) for m in messages)
+        rng = random.Random(_stable_hash(key))
+        return max(0.0, self.latency_s + rng.uniform(-self.jitter_s, self.jitter_s))
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        text = self._respond(messages)
+        prompt_tokens = sum(_approx_tokens(str(m.content)) for m in messages)
+        completion_tokens = _approx_tokens(text)
+        message = AIMessage(
+            content=text,
+            response_metadata={"model_name": self.model},
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay = self._delay(messages)
+        if delay:
+            time.sleep(delay)
+        return self._result(messages)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay = self._delay(messages)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._result(messages)
+
+
+class HashingEmbeddings(Embeddings):
+    """Feature-hashed, L2-normalised bag-of-words vectors."""
+
+    def __init__(self, dim: int = 256, latency_s: float = 0.0):
+        self.dim = dim
+        self.latency_s = latency_s
+
+    def _embed(self, text: str) -> List[float]:
+        vec = [0.0] * self.dim
+        for word in _WORD_RE.findall(text.lower()):
+            h = _stable_hash(word)
+            vec[h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return self._embed(text)
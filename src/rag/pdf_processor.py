@@ -1,13 +1,12 @@
+import hashlib
 import json
-import re
 from pathlib import Path
 from typing import Any, Dict, List
 
 import fitz  # PyMuPDF
 
 from src.config import paths
-
-SECTION_RE = re.compile(r"^\s*(Section\s+)?(\d+[A-Z]?)\b")
+from src.rag.sections import extract_sections, heading_section
 
 
 def load_pdf_pages(pdf_path: Path) -> List[Dict[str, Any]]:
@@ -32,11 +31,16 @@ def structure_aware_chunk(
     Simple structure-aware chunking:
 
     - Split text into paragraphs by double newlines.
-    - Detect headings like 'Section 302 ...'.
-    - Track (page, section) metadata for each chunk.
+    - Detect headings like 'Section 302 ...' (any alias ``sections`` knows).
+    - Track (page, section) metadata for each chunk; every chunk gets its
+      own metadata dict, since ids and section tags are written into it.
     """
     chunks: List[Dict[str, Any]] = []
 
+    def emit(text: str, meta: Dict[str, Any]) -> None:
+        if text.strip():
+            chunks.append({"text": text.strip(), "metadata": dict(meta)})
+
     for page in pages:
         text = page["text"]
         paras = [p.strip() for p in text.split("\n\n") if p.strip()]
@@ -44,23 +48,56 @@ def structure_aware_chunk(
         current_meta = {"page": page["page"], "section": None}
 
         for para in paras:
-            m = SECTION_RE.match(para)
-            if m:
-                if current:
-                    chunks.append({"text": current.strip(), "metadata": current_meta})
-                sec = m.group(2)
+            sec = heading_section(para)
+            if sec is not None:
+                emit(current, current_meta)
                 current = para + "\n"
                 current_meta = {"page": page["page"], "section": sec}
             else:
                 if len(current) + len(para) + 2 <= max_chars:
                     current += para + "\n"
                 else:
-                    chunks.append({"text": current.strip(), "metadata": current_meta})
+                    emit(current, current_meta)
                     current = para + "\n"
 
-        if current:
-            chunks.append({"text": current.strip(), "metadata": current_meta})
+        emit(current, current_meta)
+
+    return chunks
+
+
+def tag_sections(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Record the canonical sections each chunk cites in ``metadata["sections"]`` (vector filter key)."""
+    for chunk in chunks:
+        sections = extract_sections(chunk["text"])
+        if sections:
+            chunk["metadata"]["sections"] = sections
+    return chunks
 
+
+def chunk_id(source: str, chunk: Dict[str, Any]) -> str:
+    """Stable id: a content hash of source, page, section and text."""
+    meta = chunk["metadata"]
+    key = "\x1f".join([source, str(meta.get("page")), str(meta.get("section")), chunk["text"]])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def assign_chunk_ids(source: str, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Give every chunk an ``id`` (mirrored into ``metadata["chunk_id"]``).
+
+    Re-ingesting an unchanged PDF yields the same ids, so evidence
+    references stored in results and logs stay resolvable; exact
+    duplicates get an ordinal suffix.
+    """
+    seen: Dict[str, int] = {}
+    for chunk in chunks:
+        cid = chunk_id(source, chunk)
+        n = seen.get(cid, 0)
+        seen[cid] = n + 1
+        if n:
+            cid = f"{cid}-{n}"
+        chunk["id"] = cid
+        chunk["metadata"]["chunk_id"] = cid
     return chunks
 
 
@@ -70,7 +107,7 @@ def main():
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     pages = load_pdf_pages(pdf_path)
-    chunks = structure_aware_chunk(pages)
+    chunks = tag_sections(assign_chunk_ids(pdf_path.name, structure_aware_chunk(pages)))
 
     data = {
         "source": pdf_path.name,
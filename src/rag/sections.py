@@ -0,0 +1,143 @@
+"""
+Section-number normalization for IPC / BNS references.
+
+Answers and source text cite sections in many shapes — "Section 302",
+"s. 302", "u/s 302", "§302", "302 IPC", "Sec. 120-B", "IPC 420",
+"Section 103 of the Bharatiya Nyaya Sanhita", "धारा ३०२" — and every
+consumer needs the same canonical key ("302", "120B"): the relational
+mapping table, chunk metadata written at ingestion, and the vector
+store's section filter.
+
+All shapes go through one compiled pattern. The words around the number
+are looked up in ``ALIASES``, a table precomputed once from the surface
+forms below (lower-cased, dots and spaces removed), which also tells
+whether a mention names the IPC or the BNS. Devanagari digits are
+translated to ASCII.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+IPC = "IPC"
+BNS = "BNS"
+
+# Surface forms → code (None: a section marker that names no code). In
+# markers a dot is required ("s." but not the "s" of "IPC's 511"); in code
+# names dots are optional ("I.P.C." and "IPC").
+_SECTION_MARKERS = ["section", "sections", "sec", "secs", "s.", "ss.", "u/s", "§", "§§", "धारा", "धाराओं"]
+_CODE_NAMES = {
+    IPC: ["IPC", "I.P.C.", "Indian Penal Code", "आईपीसी", "भा.द.वि.", "भादंवि", "भारतीय दंड संहिता"],
+    BNS: ["BNS", "B.N.S.", "Bharatiya Nyaya Sanhita", "बीएनएस", "भारतीय न्याय संहिता"],
+}
+
+
+def _alias_key(form: str) -> str:
+    return re.sub(r"[\s.]+", "", form).lower()
+
+
+ALIASES: Dict[str, Optional[str]] = {
+    **{_alias_key(m): None for m in _SECTION_MARKERS},
+    **{_alias_key(name): code for code, names in _CODE_NAMES.items() for name in names},
+}
+
+_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+_CANONICAL_RE = re.compile(r"\d{1,4}[A-Z]?")
+
+
+def _alternation(forms: List[str], optional_dots: bool) -> str:
+    # Longest first so "Sections" wins over "Section", "u/s" over "s.".
+    parts = []
+    for form in sorted(forms, key=len, reverse=True):
+        words = [re.escape(w) for w in form.split()]
+        if optional_dots:
+            words = [w.replace(r"\.", r"\.?") for w in words]
+        parts.append(r"\s+".join(words))
+    return "|".join(parts)
+
+
+def _numbers(digits: str) -> Tuple[str, str]:
+    num = rf"[0-9०-९]{{{digits}}}(?:[-–]?[A-Za-z](?![A-Za-z]))?(?![0-9०-९]|\.[0-9])"
+    return num, rf"{num}(?:\s*(?:,?\s*(?:\band\b|\bor\b|और|तथा)|,|&|/)\s*{num})*"
+
+
+# After an explicit marker any number is a section; next to a bare code
+# name four digits are a year ("IPC 1860", "2023 BNS"), so cap at three.
+_NUM, _NUMS = _numbers("1,4")
+_, _CODE_NUMS = _numbers("1,3")
+_MARKER = rf"(?<![A-Za-z'’])(?:{_alternation(_SECTION_MARKERS, False)})\.?"
+_CODE = rf"(?<![A-Za-z])(?:{_alternation([n for names in _CODE_NAMES.values() for n in names], True)})(?![A-Za-z])"
+_OF_CODE = rf"[ \t*_,]*(?:of\s+(?:the\s+)?|की\s+|के\s+)?(?P<after>{_CODE})"
+
+# Every mention starts with a digit or the first letter of an alias; test
+# that before trying the alternatives (about 3x faster on long answers).
+_FIRSTS = {form[0].lower() for form in ALIASES}
+_START = (
+    "(?=[0-9०-९" + "".join(re.escape(c) for c in sorted(_FIRSTS) if not c.isascii()) + "]"
+    + "|(?<![A-Za-z])[" + "".join(sorted(c for c in _FIRSTS if c.isascii() and c.isalpha())) + "]"
+    + "".join("|" + re.escape(c) for c in sorted(c for c in _FIRSTS if c.isascii() and not c.isalpha()))
+    + ")"
+)
+
+_SHAPES = [
+    # [code] marker numbers [of code]: "IPC Section 302", "u/s 302 IPC", "धारा 302"
+    rf"(?:(?P<before>{_CODE})\s*,?\s*(?:की\s+|के\s+)?)?(?P<marker>{_MARKER})\s*(?P<nums>{_NUMS})(?:{_OF_CODE})?",
+    # code numbers: "IPC 302", "BNS 101"
+    rf"(?P<code>{_CODE})[ \t]*(?P<code_nums>{_CODE_NUMS})",
+    # numbers code: "302 IPC", "420 of the Indian Penal Code"
+    rf"(?<![\w/.])(?P<bare_nums>{_CODE_NUMS})(?:{_OF_CODE.replace('after', 'bare_code')})",
+]
+MENTION_RE = re.compile(_START + "(?:" + "|".join(_SHAPES) + ")", re.IGNORECASE)
+_NUM_RE = re.compile(_NUM)
+HEADING_RE = re.compile(rf"^\s*(?:{_MARKER}\s*)?(?P<num>{_NUM})\b", re.IGNORECASE)
+
+
+class Mention(NamedTuple):
+    section: str  # canonical key
+    code: Optional[str]  # IPC, BNS, or None when the text does not say
+
+
+@lru_cache(maxsize=4096)
+def canonical_section(raw: str) -> Optional[str]:
+    """Canonical key for one section number ("120-b" → "120B", "३०२" → "302"), or None."""
+    key = re.sub(r"[\s\-–.]+", "", raw.translate(_DIGITS)).upper()
+    return key if _CANONICAL_RE.fullmatch(key) else None
+
+
+@lru_cache(maxsize=256)
+def _code(form: Optional[str]) -> Optional[str]:
+    return ALIASES.get(_alias_key(form)) if form else None
+
+
+def find_mentions(text: str) -> List[Mention]:
+    """Every section reference in *text*, in order of appearance (repeats kept)."""
+    mentions = []
+    for m in MENTION_RE.finditer(text):
+        nums = next(filter(None, m.group("nums", "code_nums", "bare_nums")))
+        code = _code(next(filter(None, m.group("before", "after", "code", "bare_code")), None))
+        for n in _NUM_RE.findall(nums):
+            section = canonical_section(n)
+            if section is not None:
+                mentions.append(Mention(section, code))
+    return mentions
+
+
+def extract_sections(text: str, code: Optional[str] = None) -> List[str]:
+    """
+    Distinct canonical sections in order of appearance.
+
+    With *code*, mentions explicitly naming the other code are skipped and
+    those naming *code* come first; untagged ones are kept after them
+    ("Section 302" in an IPC answer is an IPC section).
+    """
+    mentions = find_mentions(text)
+    if code is None:
+        return list(dict.fromkeys(m.section for m in mentions))
+    tagged = [m.section for m in mentions if m.code == code]
+    return list(dict.fromkeys(tagged + [m.section for m in mentions if m.code is None]))
+
+
+def heading_section(paragraph: str) -> Optional[str]:
+    """Section a paragraph opens with ("Section 302 …", "§ 120-B …", "302. …"), if any."""
+    m = HEADING_RE.match(paragraph)
+    return canonical_section(m.group("num")) if m else None
@@ -1,35 +1,56 @@
 """
 Singleton store manager for all database operations.
 
-Provides thread-safe, lazily-initialized singleton access to the
-relational (SQLite) and vector (Chroma) stores used by the verification
-pipeline.
+Provides thread-safe singleton access to the relational (SQLite) and
+vector (Chroma) stores used by the verification pipeline, with an
+explicit warm-up / close lifecycle.
 
 Usage:
     from src.rag.store_manager import StoreManager
 
     stores = StoreManager()       # always returns the same instance
+    stores.warmup()               # build/load both stores (blocking)
     result = stores.relational.get_by_ipc("302")
     hits   = stores.vector.query("murder", k=3)
+
+    stores.warmup(background=True)  # or: load the vector store off-thread
+    stores.readiness()              # {"state": "warming", ...}
 """
 
 import logging
 import threading
+import time
+from typing import Any, Dict, Optional
 
-from src.config import paths
+from src.config import paths, settings
 from src.rag.vectorstore import IPCBNSRelationalStore, IPCBNSVectorStore
 
 logger = logging.getLogger(__name__)
 
+# Lifecycle states reported by ``StoreManager.readiness()``.
+STATE_COLD = "cold"
+STATE_WARMING = "warming"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+STATE_CLOSED = "closed"
+
 
 class StoreManager:
     """
     Singleton that owns the relational and vector store instances.
 
-    * Thread-safe: uses a lock around first-time initialization.
-    * Lazy: stores are created only on first access.
-    * Eager vector build: ``load_or_build()`` is called immediately to
-      avoid ChromaDB tenant-connection errors under concurrency.
+    * Thread-safe: uses a lock around initialization and teardown.
+    * Explicit lifecycle: ``warmup()`` builds both stores, ``close()``
+      releases them. Nothing is built implicitly on attribute access.
+    * Non-blocking readiness: the relational store is cheap and is opened
+      synchronously; the vector store (which may need a full embedding
+      build when the Chroma dir is missing) can be loaded on a background
+      thread. Callers check ``vector_ready`` and degrade to relational-only
+      verification until it flips.
+    * Failure latch: after a failed warm-up, further ``warmup()`` calls are
+      no-ops until ``vectorstore.warmup_retry_s`` has passed (doubling per
+      consecutive failure up to ``warmup_retry_max_s``), so callers that
+      warm up per request do not rebuild against a failing API each time.
     """
 
     _instance = None
@@ -41,35 +62,173 @@ class StoreManager:
                 # Double-checked locking
                 if cls._instance is None:
                     cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
+                    cls._instance._reset()
         return cls._instance
 
-    def __init__(self):
-        if self._initialized:
+    def _reset(self) -> None:
+        self._relational: Optional[IPCBNSRelationalStore] = None
+        self._vector: Optional[IPCBNSVectorStore] = None
+        self._state = STATE_COLD
+        self._error: Optional[str] = None
+        self._timings: Dict[str, float] = {}
+        self._vector_thread: Optional[threading.Thread] = None
+        self._retry_s = 0.0
+        self._retry_at = 0.0
+
+    # ── Lifecycle ────────────────────────────────────────────────────────
+
+    def warmup(self, background: bool = False, force: bool = False) -> "StoreManager":
+        """
+        Open the relational store and load (or build) the vector store.
+
+        Idempotent: calling it while already warming or ready is a no-op.
+        A store that fails to open leaves the manager ``failed`` with the
+        error in ``readiness()``; ``warmup()`` retries once the backoff has
+        passed, or at once with ``force=True``.
+        With ``background=True`` the vector store is loaded on a daemon
+        thread and this method returns as soon as the relational store is
+        open. Returns ``self`` so it can be chained.
+        """
+        with self._lock:
+            if self._state in (STATE_WARMING, STATE_READY):
+                return self
+            if self._state == STATE_FAILED and not force and time.monotonic() < self._retry_at:
+                return self
+            self._state = STATE_WARMING
+            self._error = None
+
+            if self._relational is None:
+                t0 = time.perf_counter()
+                try:
+                    self._relational = IPCBNSRelationalStore(paths.SQLITE_DB)
+                except Exception as e:
+                    logger.error("StoreManager: relational store warm-up failed: %s", e, exc_info=True)
+                    self._fail(e)
+                    return self
+                self._timings["relational"] = time.perf_counter() - t0
+                logger.info(
+                    "StoreManager: relational store ready (%s) in %.2fs",
+                    paths.SQLITE_DB, self._timings["relational"],
+                )
+
+            if background:
+                self._vector_thread = threading.Thread(
+                    target=self._load_vector, name="store-warmup", daemon=True
+                )
+                self._vector_thread.start()
+                return self
+
+        self._load_vector()
+        return self
+
+    def _load_vector(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            vector = IPCBNSVectorStore()
+            vector.load_or_build()
+        except Exception as e:
+            logger.error("StoreManager: vector store warm-up failed: %s", e, exc_info=True)
+            with self._lock:
+                self._fail(e)
             return
+
         with self._lock:
-            if self._initialized:
+            if self._state != STATE_WARMING:
+                # close() was called while we were loading.
+                vector.close()
                 return
+            self._vector = vector
+            self._timings["vector"] = time.perf_counter() - t0
+            self._state = STATE_READY
+            self._retry_s = 0.0
+        logger.info("StoreManager: vector store ready in %.2fs", self._timings["vector"])
+
+    def _fail(self, error: BaseException) -> None:
+        """Record a failed warm-up and push back the next retry (lock held)."""
+        cfg = settings.get("vectorstore", {})
+        base = float(cfg.get("warmup_retry_s", 30.0))
+        self._retry_s = min(float(cfg.get("warmup_retry_max_s", 600.0)), max(base, self._retry_s * 2))
+        self._retry_at = time.monotonic() + self._retry_s
+        self._error = str(error)
+        self._state = STATE_FAILED
+
+    def install(
+        self,
+        relational: Optional[IPCBNSRelationalStore] = None,
+        vector: Optional[IPCBNSVectorStore] = None,
+    ) -> "StoreManager":
+        """
+        Use pre-built stores instead of the configured ones (benchmarks,
+        offline runs). The manager is ``ready`` once both are present.
+        """
+        with self._lock:
+            if relational is not None:
+                self._relational = relational
+            if vector is not None:
+                self._vector = vector
+            if self._relational is not None and self._vector is not None:
+                self._state = STATE_READY
+                self._error = None
+        return self
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until a background warm-up finishes; return ``vector_ready``."""
+        thread = self._vector_thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.vector_ready
+
+    def close(self) -> None:
+        """Release both stores. A later ``warmup()`` starts from scratch."""
+        with self._lock:
+            if self._relational is not None:
+                self._relational.close()
+            if self._vector is not None:
+                self._vector.close()
+            self._reset()
+            self._state = STATE_CLOSED
+        logger.info("StoreManager: closed")
 
-            # Relational store (SQLite)
-            self._relational = IPCBNSRelationalStore(paths.SQLITE_DB)
-            logger.info("StoreManager: relational store ready (%s)", paths.SQLITE_DB)
+    # ── Readiness ────────────────────────────────────────────────────────
 
-            # Vector store (Chroma) – eagerly build/load index
-            self._vector = IPCBNSVectorStore()
-            self._vector.load_or_build()
-            logger.info("StoreManager: vector store ready")
+    @property
+    def relational_ready(self) -> bool:
+        return self._relational is not None
 
-            self._initialized = True
+    @property
+    def vector_ready(self) -> bool:
+        return self._vector is not None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._state == STATE_READY
+
+    def readiness(self) -> Dict[str, Any]:
+        """Readiness probe: lifecycle state, per-store status and load timings."""
+        return {
+            "state": self._state,
+            "ready": self.is_ready,
+            "relational": self.relational_ready,
+            "vector": self.vector_ready,
+            "timings": {k: round(v, 3) for k, v in self._timings.items()},
+            "error": self._error,
+            "retry_in_s": (
+                round(max(0.0, self._retry_at - time.monotonic()), 1) if self._state == STATE_FAILED else None
+            ),
+        }
 
     # ── Public accessors ─────────────────────────────────────────────────
 
     @property
     def relational(self) -> IPCBNSRelationalStore:
         """Return the singleton relational (SQLite) store."""
+        if self._relational is None:
+            if self._state == STATE_FAILED:
+                raise RuntimeError(f"Relational store failed to open: {self._error}")
+            raise RuntimeError("StoreManager.warmup() has not been called.")
         return self._relational
 
     @property
-    def vector(self) -> IPCBNSVectorStore:
-        """Return the singleton vector (Chroma) store."""
+    def vector(self) -> Optional[IPCBNSVectorStore]:
+        """Return the singleton vector (Chroma) store, or None while warming."""
         return self._vector
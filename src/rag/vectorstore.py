@@ -1,26 +1,64 @@
 import json
+import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from sqlalchemy import Column, MetaData, String, Table, create_engine, select
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
 
+from langchain_core.embeddings import Embeddings
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_chroma import Chroma
 
 from src.config import paths, EMBEDDING_MODEL
+from src.observability.tracing import start_span
+from src.rag.sections import canonical_section
+from src.singleflight import SingleFlight, run_coalesced
+
+logger = logging.getLogger(__name__)
+
+# Identical concurrent queries (same claim across requests) embed once.
+_embed_flight = SingleFlight("embeddings")
+
+
+def _key(section: str) -> str:
+    """Canonical section key ("120-B" → "120B"); unparseable keys pass through."""
+    return canonical_section(section) or section
+
+
+def _section_filter(sections: Sequence[str]) -> Dict[str, Any]:
+    """Chroma ``where`` matching chunks that cite any of *sections* (``metadata["sections"]``)."""
+    clauses = [{"sections": {"$contains": _key(s)}} for s in dict.fromkeys(sections)]
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def _with_chunk_id(metadata: Optional[Dict[str, Any]], chunk_id: Optional[str]) -> Dict[str, Any]:
+    """Hit metadata carrying the Chroma id as ``chunk_id`` (the verifier's evidence key)."""
+    metadata = metadata or {}
+    if not chunk_id or "chunk_id" in metadata:
+        return metadata
+    return {**metadata, "chunk_id": chunk_id}
 
 
 class IPCBNSRelationalStore:
     """
     Structured IPC → BNS mapping in SQLite.
 
-    This is the authoritative layer for section mappings.
+    This is the authoritative layer for section mappings. Section keys
+    are stored and looked up in canonical form (``src.rag.sections``), so
+    "120-B", "120b" and "१२०B" all find the 120B row.
     """
 
     def __init__(self, db_path: str):
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self.engine: Engine = create_engine(f"sqlite:///{db_path}")
+        if db_path == ":memory:":
+            # One shared connection so every thread sees the same database.
+            self.engine: Engine = create_engine(
+                "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+            )
+        else:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.engine = create_engine(f"sqlite:///{db_path}")
         self.meta = MetaData()
         self.mapping = Table(
             "ipcbns_mapping",
@@ -35,76 +73,222 @@ class IPCBNSRelationalStore:
         with self.engine.begin() as conn:
             conn.execute(
                 self.mapping.insert()
-                .values(ipc_section=ipc, bns_section=bns, notes=notes)
+                .values(ipc_section=_key(ipc), bns_section=_key(bns), notes=notes)
                 .prefix_with("OR REPLACE")
             )
 
     def get_by_ipc(self, ipc: str) -> Optional[Dict[str, str]]:
-        with self.engine.begin() as conn:
+        span_attrs = {"db.table": "ipcbns_mapping", "db.key": "ipc_section"}
+        with start_span("sql.lookup", span_attrs), self.engine.begin() as conn:
             row = conn.execute(
-                select(self.mapping).where(self.mapping.c.ipc_section == ipc)
+                select(self.mapping).where(self.mapping.c.ipc_section == _key(ipc))
             ).fetchone()
             if not row:
                 return None
             return dict(row._mapping)
 
+    def get_many_by_ipc(self, ipcs: List[str], chunk_size: int = 500) -> Dict[str, Dict[str, str]]:
+        """Batched ``get_by_ipc``: one ``IN`` query per *chunk_size* keys, keyed by canonical IPC section."""
+        keys = list(dict.fromkeys(_key(ipc) for ipc in ipcs))
+        found: Dict[str, Dict[str, str]] = {}
+        span_attrs = {"db.table": "ipcbns_mapping", "db.key": "ipc_section", "db.batch": len(keys)}
+        with start_span("sql.lookup_many", span_attrs), self.engine.begin() as conn:
+            for i in range(0, len(keys), chunk_size):
+                rows = conn.execute(
+                    select(self.mapping).where(self.mapping.c.ipc_section.in_(keys[i:i + chunk_size]))
+                ).fetchall()
+                for row in rows:
+                    found[row.ipc_section] = dict(row._mapping)
+        return found
+
     def get_by_bns(self, bns: str) -> Optional[Dict[str, str]]:
-        with self.engine.begin() as conn:
+        span_attrs = {"db.table": "ipcbns_mapping", "db.key": "bns_section"}
+        with start_span("sql.lookup", span_attrs), self.engine.begin() as conn:
             row = conn.execute(
-                select(self.mapping).where(self.mapping.c.bns_section == bns)
+                select(self.mapping).where(self.mapping.c.bns_section == _key(bns))
             ).fetchone()
             if not row:
                 return None
             return dict(row._mapping)
 
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+# Written into the persist dir once every chunk is in the index. A build
+# killed part-way (e.g. a daemon warm-up at exit) leaves no marker, and the
+# next ``load_or_build`` finishes it instead of serving a partial index.
+BUILD_MARKER = ".build_complete"
+
+
+def _read_chunks(json_path: str) -> Tuple[List[str], List[Dict[str, Any]], Optional[List[str]]]:
+    p = Path(json_path)
+    if not p.exists():
+        raise FileNotFoundError(
+            f"Chunks JSON not found at {p}. "
+            "Please run 'python src/rag/pdf_processor.py' to generate it."
+        )
+    data = json.loads(p.read_text(encoding="utf-8"))
+    texts = [c["text"] for c in data["chunks"]]
+    metas = [c["metadata"] for c in data["chunks"]]
+    # Stable ids from pdf_processor; older chunk files fall back to Chroma's.
+    ids = [c["id"] for c in data["chunks"]] if all("id" in c for c in data["chunks"]) else None
+    return texts, metas, ids
+
 
 class IPCBNSVectorStore:
     """
     Semantic store over processed PDF chunks, backed by Chroma.
     """
 
-    def __init__(self, persist_dir: Optional[str] = None):
+    def __init__(self, persist_dir: Optional[str] = None, embeddings: Optional[Embeddings] = None):
         if persist_dir is None:
             persist_dir = paths.CHROMA_DIR
         self.persist_dir = persist_dir
         Path(self.persist_dir).parent.mkdir(parents=True, exist_ok=True)
-        self.embeddings = GoogleGenerativeAIEmbeddings(
+        # Any LangChain Embeddings works (benchmarks pass src.offline.HashingEmbeddings).
+        self.embeddings = embeddings or GoogleGenerativeAIEmbeddings(
             model=EMBEDDING_MODEL,
         )
         self.store: Optional[Chroma] = None
 
     def build_from_json(self, json_path: str) -> None:
-        p = Path(json_path)
-        if not p.exists():
-            raise FileNotFoundError(
-                f"Chunks JSON not found at {p}. "
-                "Please run 'python src/rag/pdf_processor.py' to generate it."
-            )
-        data = json.loads(p.read_text(encoding="utf-8"))
-
-        texts = [c["text"] for c in data["chunks"]]
-        metas = [c["metadata"] for c in data["chunks"]]
-
+        texts, metas, ids = _read_chunks(json_path)
+        marker = Path(self.persist_dir) / BUILD_MARKER
+        marker.unlink(missing_ok=True)
+        # Chunks are upserted by id, so building over a partial index completes it.
         self.store = Chroma.from_texts(
             texts=texts,
             embedding=self.embeddings,
             metadatas=metas,
+            ids=ids,
             persist_directory=self.persist_dir,
         )
+        marker.write_text(f"{len(texts)}\n", encoding="utf-8")
 
     def load_or_build(self) -> None:
-        if Path(self.persist_dir).exists():
-            self.store = Chroma(
-                embedding_function=self.embeddings,
-                persist_directory=self.persist_dir,
+        """Load a completed index, or build (or finish building) it from the processed chunks."""
+        persist = Path(self.persist_dir)
+        if (persist / BUILD_MARKER).exists():
+            self.store = Chroma(embedding_function=self.embeddings, persist_directory=self.persist_dir)
+            return
+        if persist.exists():
+            # No marker: an interrupted build, or one made before markers.
+            # Keep it only if every chunk is already there.
+            texts, _, ids = _read_chunks(paths.PROCESSED_CHUNKS)
+            store = Chroma(embedding_function=self.embeddings, persist_directory=self.persist_dir)
+            present = store.get(ids=ids, include=[])["ids"] if ids else []
+            if ids and len(present) == len(ids):
+                (persist / BUILD_MARKER).write_text(f"{len(texts)}\n", encoding="utf-8")
+                self.store = store
+                return
+            logger.warning(
+                "Vector store at %s is incomplete (%d/%d chunks); finishing the build",
+                self.persist_dir, len(present), len(texts),
             )
-        else:
-            self.build_from_json(paths.PROCESSED_CHUNKS)
+        self.build_from_json(paths.PROCESSED_CHUNKS)
 
     def query(
-        self, query: str, k: int = 5
+        self, query: str, k: int = 5, sections: Optional[Sequence[str]] = None
     ) -> List[Tuple[str, Dict[str, Any], float]]:
+        """
+        Top-*k* chunks for *query*. With *sections*, only chunks citing one
+        of them are searched, falling back to all chunks when none do.
+        """
+        if self.store is None:
+            self.load_or_build()
+        with start_span("embedding.embed_query", {"embedding.model": EMBEDDING_MODEL}):
+            vector = run_coalesced(
+                _embed_flight, (EMBEDDING_MODEL, query), lambda: self.embeddings.embed_query(query)
+            )
+        with start_span("chroma.query", {"chroma.k": k, "chroma.filtered": bool(sections)}) as span:
+            docs = []
+            if sections:
+                docs = self.store.similarity_search_by_vector_with_relevance_scores(
+                    vector, k=k, filter=_section_filter(sections)
+                )
+            if not docs:
+                docs = self.store.similarity_search_by_vector_with_relevance_scores(vector, k=k)
+            span.set_attribute("chroma.hits", len(docs))
+        return [(d.page_content, _with_chunk_id(d.metadata, d.id), float(score)) for d, score in docs]
+
+    def query_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        sections: Optional[Sequence[Optional[Sequence[str]]]] = None,
+    ) -> List[List[Tuple[str, Dict[str, Any], float]]]:
+        """
+        Batched ``query``: *queries* embedded with query semantics (one
+        request for Gemini, see ``_embed_queries``), and one Chroma query
+        per distinct section filter (``sections[i]`` for
+        ``queries[i]``) plus one for the unfiltered queries and fallbacks.
+        """
+        if not queries:
+            return []
         if self.store is None:
             self.load_or_build()
-        docs = self.store.similarity_search_with_score(query, k=k)
-        return [(d.page_content, d.metadata, float(score)) for d, score in docs]
+        span_attrs = {"embedding.model": EMBEDDING_MODEL, "embedding.batch": len(queries)}
+        with start_span("embedding.embed_queries", span_attrs):
+            vectors = self._embed_queries(queries)
+
+        hits: List[List[Tuple[str, Dict[str, Any], float]]] = [[] for _ in queries]
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for i, secs in enumerate(sections or [None] * len(queries)):
+            groups.setdefault(tuple(dict.fromkeys(secs or ())), []).append(i)
+        with start_span("chroma.query", {"chroma.k": k, "chroma.batch": len(queries)}) as span:
+            for secs, idx in groups.items():
+                if secs:
+                    for i, h in zip(idx, self._query_vectors([vectors[i] for i in idx], k, _section_filter(secs))):
+                        hits[i] = h
+            unfiltered = [i for i in range(len(queries)) if not hits[i]]
+            if unfiltered:
+                for i, h in zip(unfiltered, self._query_vectors([vectors[i] for i in unfiltered], k)):
+                    hits[i] = h
+            span.set_attribute("chroma.filters", sum(1 for secs in groups if secs))
+            span.set_attribute("chroma.hits", sum(len(h) for h in hits))
+        return hits
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Query-side vectors, identical to what ``query`` computes per text.
+
+        ``embed_documents`` embeds for storage (Gemini: ``RETRIEVAL_DOCUMENT``),
+        so Gemini gets one batch request with ``embed_query``'s task type;
+        other embeddings go through ``embed_query`` one text at a time.
+        """
+        if isinstance(self.embeddings, GoogleGenerativeAIEmbeddings):
+            task_type = self.embeddings.task_type or "RETRIEVAL_QUERY"
+            return self.embeddings.embed_documents(queries, task_type=task_type)
+        return [
+            run_coalesced(_embed_flight, (EMBEDDING_MODEL, q), lambda q=q: self.embeddings.embed_query(q))
+            for q in queries
+        ]
+
+    def _query_vectors(
+        self, vectors: List[List[float]], k: int, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[str, Dict[str, Any], float]]]:
+        res = self.store._collection.query(
+            query_embeddings=vectors, n_results=k, where=where, include=["documents", "metadatas", "distances"]
+        )
+        return [
+            [
+                (text, _with_chunk_id(meta, chunk_id), float(dist))
+                for chunk_id, text, meta, dist in zip(ids, docs, metas, dists)
+                if text is not None
+            ]
+            for ids, docs, metas, dists in zip(res["ids"], res["documents"], res["metadatas"], res["distances"])
+        ]
+
+    def get_chunks(self, chunk_ids: List[str]) -> Dict[str, str]:
+        """Chunk text by id, for resolving evidence references (unknown ids are omitted)."""
+        if not chunk_ids:
+            return {}
+        if self.store is None:
+            self.load_or_build()
+        with start_span("chroma.get", {"chroma.ids": len(chunk_ids)}):
+            res = self.store.get(ids=list(dict.fromkeys(chunk_ids)), include=["documents"])
+        return {cid: text for cid, text in zip(res["ids"], res["documents"]) if text is not None}
+
+    def close(self) -> None:
+        self.store = None
@@ -0,0 +1,134 @@
+"""
+Single-flight request coalescing.
+
+Concurrent calls with the same key share one execution: the first caller
+(the leader) runs the work, everyone arriving while it is in flight
+awaits the same result. Nothing is cached — once the call finishes the
+key is free again.
+
+Waiters may live on different event loops or threads (``run_workflow``
+starts a fresh loop per call, Streamlit runs sessions on threads), so
+the shared result is a ``concurrent.futures.Future`` guarded by a
+threading lock; async callers await it through ``asyncio.wrap_future``.
+
+    flight = SingleFlight("workflow")
+    state = await flight.do(key, lambda: run(question))
+    vector = embed_flight.do_sync(key, lambda: embeddings.embed_query(text))
+
+Followers are counted in ``guardrail_coalesced_calls_total{level}``.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from src.config import settings
+from src.observability.metrics import COALESCED_CALLS
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("future", "waiters", "task", "loop")
+
+    def __init__(self) -> None:
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.waiters = 0
+        self.task: Optional[asyncio.Future] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls per key (see module docstring)."""
+
+    def __init__(self, level: str):
+        self.level = level
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> "tuple[_Call, bool]":
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            call.waiters += 1
+        if not leader:
+            COALESCED_CALLS.inc(level=self.level)
+        return call, leader
+
+    def _finish(self, key: Hashable, call: _Call) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()``, or the identical call already in flight for ``key``."""
+        call, leader = self._join(key)
+        if leader:
+            call.loop = asyncio.get_running_loop()
+            # The work runs as its own task so a cancelled leader does not
+            # take its followers down with it; it is cancelled only once
+            # nobody is waiting any more.
+            call.task = asyncio.ensure_future(self._run(key, call, fn))
+        try:
+            return await asyncio.shield(asyncio.wrap_future(call.future))
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0 and not call.future.done()
+            if abandoned and call.task is not None and call.loop is not None:
+                call.loop.call_soon_threadsafe(call.task.cancel)
+
+    async def _run(self, key: Hashable, call: _Call, fn: Callable[[], Awaitable[T]]) -> None:
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._finish(key, call)
+            call.future.cancel()
+            raise
+        except BaseException as e:
+            self._finish(key, call)
+            call.future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            self._finish(key, call)
+            call.future.set_result(result)
+
+    def do_sync(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Blocking variant: the leader runs ``fn`` inline, followers wait for it."""
+        call, leader = self._join(key)
+        try:
+            if not leader:
+                return call.future.result()
+            try:
+                result = fn()
+            except BaseException as e:
+                self._finish(key, call)
+                call.future.set_exception(e)
+                raise
+            self._finish(key, call)
+            call.future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                call.waiters -= 1
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def coalescing_enabled(level: str) -> bool:
+    """``coalescing.enabled`` and the per-level switch (``workflow``, ``embeddings``, ``llm``)."""
+    cfg = settings.get("coalescing", {})
+    return bool(cfg.get("enabled", True)) and bool(cfg.get(level, True))
+
+
+def run_coalesced(flight: SingleFlight, key: Hashable, fn: Callable[[], Any]) -> Any:
+    """``flight.do_sync`` when its level is enabled, else just ``fn()``."""
+    if not coalescing_enabled(flight.level):
+        return fn()
+    return flight.do_sync(key, fn)
@@ -0,0 +1 @@
+# Persistence: buffered JSONL sinks and review-queue storage.
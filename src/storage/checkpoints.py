@@ -0,0 +1,292 @@
+"""
+SQLite checkpointer for the LangGraph workflow.
+
+With ``checkpointing.enabled`` the graph is compiled with
+``SQLiteCheckpointSaver`` and every run gets a ``thread_id``. LangGraph
+saves a checkpoint after each super-step, so a run that dies late
+(verifier error, process restart) can be resumed from the last completed
+node instead of repeating the primary LLM call, and an old run can be
+forked from just before ``verifier`` to re-check its claims against an
+updated knowledge base (see ``workflow.resume_workflow``).
+
+One row per checkpoint (the full serialised checkpoint, like the upstream
+``langgraph-checkpoint-sqlite`` saver, which is not a dependency here)
+plus one row per pending write. Rows older than
+``checkpointing.retention_days`` are dropped when the saver opens.
+"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from src.config import paths, settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE INDEX IF NOT EXISTS checkpoints_created ON checkpoints (created_at);
+"""
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[str]):
+    """``BaseCheckpointSaver`` on a single SQLite file (thread-safe, loop-agnostic)."""
+
+    def __init__(self, db_path: str, retention_days: Optional[float] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        if retention_days:
+            removed = self.prune(retention_days * 86400)
+            if removed:
+                logger.info("Checkpoints: pruned %d threads older than %g days", removed, retention_days)
+
+    # ── Helpers ──────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _ids(config: RunnableConfig) -> Tuple[str, str]:
+        configurable = config["configurable"]
+        return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+    def _tuple(self, thread_id: str, ns: str, row: Tuple[Any, ...]) -> CheckpointTuple:
+        checkpoint_id, parent_id, ctype, cblob, mtype, mblob = row
+        with self._lock:
+            writes = self._conn.execute(
+                "SELECT task_id, channel, type, value FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                (thread_id, ns, checkpoint_id),
+            ).fetchall()
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint_id}},
+            checkpoint=self.serde.loads_typed((ctype, cblob)),
+            metadata=self.serde.loads_typed((mtype, mblob)),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": parent_id}}
+                if parent_id
+                else None
+            ),
+            pending_writes=[(task, channel, self.serde.loads_typed((t, v))) for task, channel, t, v in writes],
+        )
+
+    # ── BaseCheckpointSaver ──────────────────────────────────────────────
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id, ns = self._ids(config)
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+            "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            if checkpoint_id:
+                row = self._conn.execute(query + " AND checkpoint_id = ?", (thread_id, ns, checkpoint_id)).fetchone()
+            else:
+                row = self._conn.execute(query + " ORDER BY checkpoint_id DESC LIMIT 1", (thread_id, ns)).fetchone()
+        return self._tuple(thread_id, ns, row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config is not None:
+            clauses.append("thread_id = ?")
+            params.append(str(config["configurable"]["thread_id"]))
+            if config["configurable"].get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(config["configurable"]["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(get_checkpoint_id(config))
+        if before is not None and get_checkpoint_id(before):
+            clauses.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                f"metadata_type, metadata FROM checkpoints {where} ORDER BY checkpoint_id DESC",
+                params,
+            ).fetchall()
+        for thread_id, ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            item = self._tuple(thread_id, ns, tuple(row))
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield item
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id, ns = self._ids(config)
+        ctype, cblob = self.serde.dumps_typed(checkpoint)
+        mtype, mblob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                 ctype, cblob, mtype, mblob, time.time()),
+            )
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id, ns = self._ids(config)
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # Special channels (errors, interrupts) overwrite; regular writes are first-wins.
+        verb = "INSERT OR REPLACE" if all(c in WRITES_IDX_MAP for c, _ in writes) else "INSERT OR IGNORE"
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            vtype, vblob = self.serde.dumps_typed(value)
+            rows.append((thread_id, ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx),
+                         channel, vtype, vblob, task_path))
+        with self._lock:
+            self._conn.executemany(f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (str(thread_id),))
+            self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (str(thread_id),))
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ── Async (SQLite work off the event loop) ───────────────────────────
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # ── Maintenance ──────────────────────────────────────────────────────
+
+    def prune(self, older_than_s: float) -> int:
+        """Delete threads whose newest checkpoint is older than ``older_than_s``."""
+        cutoff = time.time() - older_than_s
+        with self._lock:
+            stale = [r[0] for r in self._conn.execute(
+                "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?", (cutoff,)
+            )]
+            for thread_id in stale:
+                self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+        return len(stale)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_saver: Optional[SQLiteCheckpointSaver] = None
+_saver_lock = threading.Lock()
+
+
+def get_checkpointer() -> SQLiteCheckpointSaver:
+    """Return the process-wide checkpointer built from ``settings["checkpointing"]``."""
+    global _saver
+    if _saver is None:
+        with _saver_lock:
+            if _saver is None:
+                cfg = settings.get("checkpointing", {})
+                _saver = SQLiteCheckpointSaver(
+                    str(Path(paths.ROOT) / cfg.get("path", "data/db/checkpoints.db")),
+                    retention_days=cfg.get("retention_days"),
+                )
+    return _saver
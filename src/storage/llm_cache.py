@@ -0,0 +1,165 @@
+"""
+Prompt-level LLM response cache.
+
+Entries map an opaque key (built by ``src.llm.cache.CachedModel`` from the
+model, temperature and rendered prompt) to a serialised response. A
+size-bounded in-process LRU sits in front of an SQLite table so repeated
+prompts in one process never touch disk, and other processes (API
+workers, Streamlit) share the table. Every entry expires after
+``llm_cache.ttl_s``; the table is trimmed to ``max_disk_entries`` now
+and then.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from sqlalchemy import Column, Float, MetaData, String, Table, Text, create_engine, delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+
+from src.config import paths, settings
+
+logger = logging.getLogger(__name__)
+
+_PRUNE_EVERY = 256  # writes between disk trims
+
+
+class LLMResponseCache:
+    """LRU front + optional SQLite backend; values are opaque strings."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl_s: float = 86400.0,
+        max_entries: int = 1024,
+        max_disk_entries: int = 100_000,
+    ):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._lru: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.engine: Optional[Engine] = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.engine = create_engine(f"sqlite:///{db_path}", connect_args={"timeout": 30})
+            self.meta = MetaData()
+            self.entries = Table(
+                "llm_cache",
+                self.meta,
+                Column("key", String, primary_key=True),
+                Column("model", String),
+                Column("payload", Text, nullable=False),
+                Column("created_at", Float, nullable=False),
+                Column("expires_at", Float, nullable=False, index=True),
+            )
+            self.meta.create_all(self.engine)
+
+    # ── Memory front ─────────────────────────────────────────────────────
+
+    def get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            return entry[1]
+
+    def _remember(self, key: str, expires_at: float, payload: str) -> None:
+        with self._lock:
+            self._lru[key] = (expires_at, payload)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    # ── Public API ───────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[str]:
+        """Memory first, then disk (promoting disk hits into memory)."""
+        payload = self.get_memory(key)
+        if payload is not None or self.engine is None:
+            return payload
+        t = self.entries
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                select(t.c.payload, t.c.expires_at).where(t.c.key == key, t.c.expires_at > time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        self._remember(key, row.expires_at, row.payload)
+        return row.payload
+
+    def set(self, key: str, payload: str, model: str = "") -> None:
+        now = time.time()
+        expires_at = now + self.ttl_s
+        self._remember(key, expires_at, payload)
+        if self.engine is None:
+            return
+        values = {"key": key, "model": model, "payload": payload, "created_at": now, "expires_at": expires_at}
+        stmt = insert(self.entries).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.entries.c.key],
+            set_={k: stmt.excluded[k] for k in values if k != "key"},
+        )
+        with self.engine.begin() as conn:
+            conn.execute(stmt)
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % _PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop expired rows and trim the table to ``max_disk_entries`` (oldest first)."""
+        if self.engine is None:
+            return 0
+        t = self.entries
+        with self.engine.begin() as conn:
+            removed = conn.execute(delete(t).where(t.c.expires_at <= time.time())).rowcount
+            excess = conn.execute(select(func.count()).select_from(t)).scalar_one() - self.max_disk_entries
+            if excess > 0:
+                oldest = select(t.c.key).order_by(t.c.created_at).limit(excess).scalar_subquery()
+                removed += conn.execute(delete(t).where(t.c.key.in_(oldest))).rowcount
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+        if self.engine is not None:
+            with self.engine.begin() as conn:
+                conn.execute(delete(self.entries))
+
+    def close(self) -> None:
+        if self.engine is not None:
+            self.engine.dispose()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache built from ``settings["llm_cache"]``."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                cfg = settings.get("llm_cache", {})
+                db_path = None
+                if cfg.get("backend", "sqlite") == "sqlite":
+                    db_path = str(Path(paths.ROOT) / cfg.get("path", "data/db/llm_cache.db"))
+                _cache = LLMResponseCache(
+                    db_path,
+                    ttl_s=float(cfg.get("ttl_s", 86400)),
+                    max_entries=int(cfg.get("max_entries", 1024)),
+                    max_disk_entries=int(cfg.get("max_disk_entries", 100_000)),
+                )
+    return _cache
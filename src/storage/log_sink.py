@@ -0,0 +1,183 @@
+"""
+Buffered, process-safe JSONL writer shared by the evaluation log and the
+human-review queue.
+
+Nodes call ``get_sink(path).write(record)``, which only enqueues the
+record; it never touches the disk on the event loop. One writer thread per
+file drains the queue in batches, serialises with orjson and appends each
+batch with a single ``write`` while holding an inter-process file lock, so
+concurrent requests and processes never interleave partial lines. Files
+are rotated by size (``eval_log.jsonl`` → ``eval_log.jsonl.1`` …).
+
+Usage:
+    from src.storage.log_sink import get_sink
+
+    get_sink(paths.EVAL_LOG).write({"question": "...", ...})
+    get_sink(paths.EVAL_LOG).flush()     # block until everything is on disk
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+import orjson
+from filelock import FileLock
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SINK_DEFAULTS: Dict[str, Any] = {
+    "batch_size": 64,
+    "flush_interval_s": 0.5,
+    "max_bytes": 50 * 1024 * 1024,
+    "backup_count": 5,
+}
+
+
+class _FlushMarker:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class JsonlSink:
+    """Append-only JSONL file fed through a queue by a single writer thread."""
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = _SINK_DEFAULTS["batch_size"],
+        flush_interval_s: float = _SINK_DEFAULTS["flush_interval_s"],
+        max_bytes: int = _SINK_DEFAULTS["max_bytes"],
+        backup_count: int = _SINK_DEFAULTS["backup_count"],
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = FileLock(path + ".lock")
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    # ── Producer side ────────────────────────────────────────────────────
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Enqueue *record*; returns immediately."""
+        self._ensure_started()
+        self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until every record enqueued so far has been written."""
+        if self._thread is None:
+            return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=10.0)
+        self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._thread = threading.Thread(
+                    target=self._run, name=f"jsonl-sink:{os.path.basename(self.path)}", daemon=True
+                )
+                self._thread.start()
+
+    # ── Writer thread ────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[bytes] = []
+            markers: List[_FlushMarker] = []
+            stop = False
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _FlushMarker):
+                    markers.append(item)
+                else:
+                    try:
+                        batch.append(orjson.dumps(item, default=str, option=orjson.OPT_NON_STR_KEYS))
+                    except TypeError as e:
+                        logger.error("Dropping unserialisable record for %s: %s", self.path, e)
+                if stop or markers or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=self.flush_interval_s)
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._append(b"\n".join(batch) + b"\n")
+                except OSError as e:
+                    logger.error("Failed to write %d records to %s: %s", len(batch), self.path, e)
+            for marker in markers:
+                marker.done.set()
+            if stop:
+                return
+
+    def _append(self, data: bytes) -> None:
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if self.max_bytes and size and size + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "ab") as f:
+                f.write(data)
+
+    def _rotate(self) -> None:
+        """Shift ``path.N-1`` → ``path.N`` … ``path`` → ``path.1`` (lock held)."""
+        for i in range(self.backup_count - 1, 0, -1):
+            src, dst = f"{self.path}.{i}", f"{self.path}.{i + 1}"
+            if os.path.exists(src):
+                os.replace(src, dst)
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            open(self.path, "wb").close()
+        logger.info("Rotated %s", self.path)
+
+
+_sinks: Dict[str, JsonlSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_sink(path: str) -> JsonlSink:
+    """Return the process-wide sink for *path*, creating it on first use."""
+    path = os.path.abspath(path)
+    sink = _sinks.get(path)
+    if sink is None:
+        with _sinks_lock:
+            sink = _sinks.get(path)
+            if sink is None:
+                cfg = {**_SINK_DEFAULTS, **settings.get("logging", {}).get("sink", {})}
+                sink = _sinks[path] = JsonlSink(path, **cfg)
+    return sink
+
+
+@atexit.register
+def close_all() -> None:
+    """Flush and stop every sink (runs at interpreter exit)."""
+    for sink in list(_sinks.values()):
+        sink.close()
@@ -0,0 +1,491 @@
+"""
+Indexed SQLite store for cases flagged by ``human_validation_node``.
+
+Replaces the append-only ``human_review_queue.jsonl``: every item has a
+status (``pending`` → ``claimed`` → ``resolved``), timestamp,
+overall_status and question hash column, each indexed, so reviewer tools
+can filter and page through large queues without loading them.
+
+Identical cases are collapsed: each item carries a fingerprint of the
+normalised question, the answer and the per-claim verification statuses
+under a UNIQUE index, so re-enqueueing a case someone already queued is
+an indexed upsert that bumps ``occurrences`` / ``last_seen_at`` instead of
+adding a row. This applies even after the item is resolved; the
+reviewer's verdict already covers the repeat.
+
+Claiming is a single ``UPDATE … RETURNING`` statement, which SQLite
+executes atomically, so concurrent reviewers never receive the same item.
+Claims carry a lease; an item whose reviewer disappears becomes claimable
+again once the lease expires.
+
+``migrate`` imports a legacy JSONL file in one transaction together with a
+``review_migrations`` row keyed by the file's content hash, so running it
+again on the same file is a no-op rather than bumping ``occurrences``.
+
+CLI:
+    python -m src.storage.review_queue migrate [data/human_review_queue.jsonl]
+    python -m src.storage.review_queue list --status pending --limit 20
+    python -m src.storage.review_queue claim alice
+    python -m src.storage.review_queue resolve 42 alice approved --notes "ok"
+"""
+
+import argparse
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    event,
+    func,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+
+from src.agents.utils import extract_text, normalize_question, question_hash
+from src.config import paths
+from src.storage.verified_answers import get_verified_answers
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_CLAIMED = "claimed"
+STATUS_RESOLVED = "resolved"
+
+VERDICTS = ("approved", "corrected", "rejected")
+
+DEFAULT_LEASE_S = 15 * 60
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def review_fingerprint(question: str, llm_answer: str, verifications: List[Dict[str, Any]]) -> str:
+    """Identity of a review case: normalised question + answer + claim statuses."""
+    answer = " ".join((llm_answer or "").split())
+    statuses = ",".join(str(v.get("status", "")) for v in verifications)
+    key = "\x1f".join((normalize_question(question), answer, statuses))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class ReviewQueue:
+    """SQLite-backed human review queue."""
+
+    def __init__(self, db_path: str = paths.REVIEW_DB):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.engine: Engine = create_engine(
+            f"sqlite:///{db_path}", connect_args={"timeout": 30}
+        )
+
+        @event.listens_for(self.engine, "connect")
+        def _sqlite_pragmas(dbapi_conn, _record):
+            # WAL lets reviewers read while the pipeline is enqueueing.
+            cur = dbapi_conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.close()
+
+        self.meta = MetaData()
+        self.items = Table(
+            "review_items",
+            self.meta,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("created_at", String, nullable=False),
+            Column("updated_at", String, nullable=False),
+            Column("status", String, nullable=False, default=STATUS_PENDING),
+            Column("overall_status", String),
+            Column("average_confidence", Float),
+            Column("question_hash", String),
+            Column("question", Text),
+            Column("llm_answer", Text),
+            Column("payload", Text),  # JSON: verifications + evidence + final_result
+            Column("claimed_by", String),
+            Column("claimed_at", Float),  # epoch seconds, for lease expiry
+            Column("verdict", String),
+            Column("corrected_answer", Text),
+            Column("reviewer_notes", Text),
+            Column("resolved_at", String),
+            Column("fingerprint", String),
+            Column("occurrences", Integer, nullable=False, default=1),
+            Column("last_seen_at", String),
+            Index("ix_review_status_id", "status", "id"),
+            Index("ix_review_created_at", "created_at"),
+            Index("ix_review_overall_status", "overall_status", "id"),
+            Index("ix_review_question_hash", "question_hash"),
+            Index("ux_review_fingerprint", "fingerprint", unique=True),
+        )
+        self.migrations = Table(
+            "review_migrations",
+            self.meta,
+            Column("source_hash", String, primary_key=True),  # sha256 of the JSONL
+            Column("source_path", String),
+            Column("records", Integer, nullable=False),
+            Column("migrated_at", String, nullable=False),
+        )
+        self.meta.create_all(self.engine)
+        self._upgrade_schema()
+
+    def _upgrade_schema(self) -> None:
+        """Add dedup columns/index to queues created before fingerprinting."""
+        with self.engine.begin() as conn:
+            cols = {row[1] for row in conn.execute(text("PRAGMA table_info(review_items)"))}
+            if "fingerprint" not in cols:
+                conn.execute(text("ALTER TABLE review_items ADD COLUMN fingerprint VARCHAR"))
+                conn.execute(text(
+                    "ALTER TABLE review_items ADD COLUMN occurrences INTEGER NOT NULL DEFAULT 1"
+                ))
+                conn.execute(text("ALTER TABLE review_items ADD COLUMN last_seen_at VARCHAR"))
+                conn.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS ux_review_fingerprint "
+                    "ON review_items (fingerprint)"
+                ))
+
+    # ── Producer side ────────────────────────────────────────────────────
+
+    def _row_values(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        final = record.get("final_result") or {}
+        created = record.get("timestamp") or _now_iso()
+        question = record.get("question") or ""
+        answer = record.get("llm_answer")
+        if answer is not None and not isinstance(answer, str):
+            # Older queue entries stored the raw list-of-parts message content.
+            answer = extract_text(answer)
+        verifications = record.get("verifications", [])
+        return {
+            "created_at": created,
+            "updated_at": created,
+            "last_seen_at": created,
+            "fingerprint": review_fingerprint(question, answer or "", verifications),
+            "occurrences": 1,
+            "status": STATUS_PENDING,
+            "overall_status": final.get("overall_status"),
+            "average_confidence": final.get("average_confidence"),
+            "question_hash": question_hash(question),
+            "question": question,
+            "llm_answer": answer,
+            "payload": orjson.dumps(
+                {
+                    "verifications": verifications,
+                    "evidence": record.get("evidence", {}),
+                    "final_result": final,
+                },
+                default=str,
+            ).decode("utf-8"),
+        }
+
+    def _upsert(self):
+        """INSERT that collapses onto an existing item with the same fingerprint."""
+        stmt = insert(self.items)
+        return stmt.on_conflict_do_update(
+            index_elements=[self.items.c.fingerprint],
+            set_={
+                "occurrences": self.items.c.occurrences + 1,
+                "last_seen_at": stmt.excluded.last_seen_at,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+
+    def enqueue(self, record: Dict[str, Any]) -> Tuple[int, int]:
+        """Insert (or collapse) a flagged case; returns ``(item_id, occurrences)``."""
+        stmt = self._upsert().values(**self._row_values(record)).returning(
+            self.items.c.id, self.items.c.occurrences
+        )
+        with self.engine.begin() as conn:
+            item_id, occurrences = conn.execute(stmt).one()
+        return int(item_id), int(occurrences)
+
+    def migrate_from_jsonl(self, jsonl_path: str = paths.HUMAN_REVIEW_QUEUE, batch_size: int = 1000) -> int:
+        """Stream a legacy JSONL queue into the table; returns records imported.
+
+        Duplicates in the file collapse onto one item, as with ``enqueue``.
+        A file already migrated (same content hash) is skipped and returns 0;
+        a run that fails part-way commits nothing, so it can simply be rerun.
+        """
+        p = Path(jsonl_path)
+        if not p.exists():
+            return 0
+        digest = hashlib.sha256()
+        with p.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        source_hash = digest.hexdigest()
+
+        inserted = 0
+        with self.engine.begin() as conn:
+            done = conn.execute(
+                select(self.migrations.c.migrated_at).where(self.migrations.c.source_hash == source_hash)
+            ).scalar()
+            if done is not None:
+                logger.info("Skipping %s: already migrated at %s", p, done)
+                return 0
+            batch: List[Dict[str, Any]] = []
+            with p.open("rb") as f:
+                for lineno, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        batch.append(self._row_values(orjson.loads(line)))
+                    except orjson.JSONDecodeError:
+                        logger.warning("Skipping malformed line %d in %s", lineno, p)
+                        continue
+                    if len(batch) >= batch_size:
+                        conn.execute(self._upsert(), batch)
+                        inserted += len(batch)
+                        batch = []
+            if batch:
+                conn.execute(self._upsert(), batch)
+                inserted += len(batch)
+            conn.execute(insert(self.migrations).values(
+                source_hash=source_hash,
+                source_path=str(p.resolve()),
+                records=inserted,
+                migrated_at=_now_iso(),
+            ))
+        logger.info("Migrated %d review records from %s", inserted, p)
+        return inserted
+
+    # ── Reviewer side ────────────────────────────────────────────────────
+
+    def claim(self, reviewer: str, lease_s: float = DEFAULT_LEASE_S) -> Optional[Dict[str, Any]]:
+        """Atomically claim the oldest pending (or lease-expired) item."""
+        now = time.time()
+        t = self.items
+        next_id = (
+            select(t.c.id)
+            .where(
+                or_(
+                    t.c.status == STATUS_PENDING,
+                    (t.c.status == STATUS_CLAIMED) & (t.c.claimed_at < now - lease_s),
+                )
+            )
+            .order_by(t.c.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(t)
+            .where(t.c.id == next_id)
+            .values(
+                status=STATUS_CLAIMED,
+                claimed_by=reviewer,
+                claimed_at=now,
+                updated_at=_now_iso(),
+            )
+            .returning(*t.c)
+        )
+        with self.engine.begin() as conn:
+            row = conn.execute(stmt).fetchone()
+        return self._to_dict(row) if row else None
+
+    def release(self, item_id: int, reviewer: str) -> bool:
+        """Give a claimed item back to the pending pool."""
+        t = self.items
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                update(t)
+                .where((t.c.id == item_id) & (t.c.status == STATUS_CLAIMED) & (t.c.claimed_by == reviewer))
+                .values(status=STATUS_PENDING, claimed_by=None, claimed_at=None, updated_at=_now_iso())
+            )
+        return result.rowcount == 1
+
+    def resolve(
+        self,
+        item_id: int,
+        reviewer: str,
+        verdict: str,
+        corrected_answer: Optional[str] = None,
+        notes: Optional[str] = None,
+    ) -> bool:
+        """
+        Record a verdict on an item claimed by *reviewer* (or unclaimed).
+
+        Approved and corrected answers are published to the verified-answer
+        store, so later runs of the same question skip the LLM entirely. A
+        rejection withdraws the verified answer only if it is the answer
+        being rejected.
+        """
+        if verdict not in VERDICTS:
+            raise ValueError(f"verdict must be one of {VERDICTS}, got {verdict!r}")
+        if verdict == "corrected" and not corrected_answer:
+            raise ValueError("A 'corrected' verdict needs corrected_answer.")
+        t = self.items
+        now = _now_iso()
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                update(t)
+                .where(
+                    (t.c.id == item_id)
+                    & (
+                        (t.c.status == STATUS_PENDING)
+                        | ((t.c.status == STATUS_CLAIMED) & (t.c.claimed_by == reviewer))
+                    )
+                )
+                .values(
+                    status=STATUS_RESOLVED,
+                    claimed_by=reviewer,
+                    verdict=verdict,
+                    corrected_answer=corrected_answer,
+                    reviewer_notes=notes,
+                    resolved_at=now,
+                    updated_at=now,
+                )
+                .returning(t.c.question, t.c.llm_answer)
+            )
+            row = result.fetchone()
+        if row is None:
+            return False
+
+        if verdict in ("approved", "corrected"):
+            get_verified_answers().upsert(
+                row.question,
+                corrected_answer if verdict == "corrected" else row.llm_answer,
+                verdict,
+                review_item_id=item_id,
+                reviewer=reviewer,
+                notes=notes,
+            )
+        elif row.llm_answer and get_verified_answers().remove(row.question, row.llm_answer):
+            logger.info("Review %d rejected: verified answer withdrawn", item_id)
+        return True
+
+    # ── Queries ──────────────────────────────────────────────────────────
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        with self.engine.begin() as conn:
+            row = conn.execute(select(self.items).where(self.items.c.id == item_id)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def page(
+        self,
+        status: Optional[str] = None,
+        overall_status: Optional[str] = None,
+        qhash: Optional[str] = None,
+        after_id: int = 0,
+        limit: int = 100,
+        include_payload: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Keyset-paginated listing ordered by id (pass the last id as *after_id*)."""
+        t = self.items
+        cols = list(t.c) if include_payload else [c for c in t.c if c.name != "payload"]
+        stmt = select(*cols).where(t.c.id > after_id)
+        if status:
+            stmt = stmt.where(t.c.status == status)
+        if overall_status:
+            stmt = stmt.where(t.c.overall_status == overall_status)
+        if qhash:
+            stmt = stmt.where(t.c.question_hash == qhash)
+        stmt = stmt.order_by(t.c.id).limit(limit)
+        with self.engine.begin() as conn:
+            rows = conn.execute(stmt).fetchall()
+        return [self._to_dict(r) for r in rows]
+
+    def iter_items(self, page_size: int = 500, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Iterate over all matching items, one page in memory at a time."""
+        after_id = 0
+        while True:
+            rows = self.page(after_id=after_id, limit=page_size, **filters)
+            if not rows:
+                return
+            yield from rows
+            after_id = rows[-1]["id"]
+
+    def count(self, status: Optional[str] = STATUS_PENDING) -> int:
+        stmt = select(func.count()).select_from(self.items)
+        if status:
+            stmt = stmt.where(self.items.c.status == status)
+        with self.engine.begin() as conn:
+            return int(conn.execute(stmt).scalar_one())
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+    @staticmethod
+    def _to_dict(row) -> Dict[str, Any]:
+        item = dict(row._mapping)
+        payload = item.pop("payload", None)
+        if payload:
+            item.update(orjson.loads(payload))
+        return item
+
+
+_queue: Optional[ReviewQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_review_queue() -> ReviewQueue:
+    """Return the process-wide review queue."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ReviewQueue()
+    return _queue
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Human review queue tools.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_mig = sub.add_parser("migrate", help="Import a legacy JSONL queue.")
+    p_mig.add_argument("path", nargs="?", default=paths.HUMAN_REVIEW_QUEUE)
+
+    p_list = sub.add_parser("list", help="Page through items.")
+    p_list.add_argument("--status")
+    p_list.add_argument("--overall-status")
+    p_list.add_argument("--after-id", type=int, default=0)
+    p_list.add_argument("--limit", type=int, default=20)
+
+    p_claim = sub.add_parser("claim", help="Claim the next item.")
+    p_claim.add_argument("reviewer")
+
+    p_res = sub.add_parser("resolve", help="Record a verdict.")
+    p_res.add_argument("item_id", type=int)
+    p_res.add_argument("reviewer")
+    p_res.add_argument("verdict", choices=VERDICTS)
+    p_res.add_argument("--corrected-answer")
+    p_res.add_argument("--notes")
+
+    sub.add_parser("count", help="Number of pending items.")
+
+    args = parser.parse_args(argv)
+    q = get_review_queue()
+
+    if args.cmd == "migrate":
+        print(f"[review_queue] Migrated {q.migrate_from_jsonl(args.path)} records")
+    elif args.cmd == "list":
+        for item in q.page(args.status, args.overall_status, after_id=args.after_id, limit=args.limit):
+            print(
+                f"{item['id']:>7}  {item['status']:<9} {item['overall_status'] or '-':<11} "
+                f"x{item['occurrences']:<4} "
+                f"{item['created_at'][:19]}  {(item['question'] or '')[:70]}"
+            )
+    elif args.cmd == "claim":
+        item = q.claim(args.reviewer)
+        print(orjson.dumps(item, option=orjson.OPT_INDENT_2).decode() if item else "Queue is empty.")
+    elif args.cmd == "resolve":
+        ok = q.resolve(args.item_id, args.reviewer, args.verdict, args.corrected_answer, args.notes)
+        print("Resolved." if ok else "Not resolved (unknown id, or claimed by someone else).")
+    elif args.cmd == "count":
+        print(q.count())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Verified-answer store fed by human review verdicts.
+
+When a reviewer approves a queued answer (or supplies a correction),
+``ReviewQueue.resolve`` records it here keyed by the normalised question.
+``run_workflow`` looks questions up before invoking any LLM, and a hit is
+answered immediately with the reviewer's provenance attached.
+
+An entry only stands for the knowledge base it was reviewed against: each
+row stores ``knowledge_base_version()`` (a hash of the processed chunks
+and the mapping DB) and lookups ignore rows from another version. A
+``rejected`` verdict on the stored answer itself removes the entry;
+rejecting some other answer to the question leaves it in place.
+
+Lives in the same SQLite file as the review queue.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    delete,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+
+from src.agents.utils import question_hash
+from src.config import paths
+
+logger = logging.getLogger(__name__)
+
+_kb_version: Optional[Tuple[Tuple[Any, ...], str]] = None
+_kb_lock = threading.Lock()
+
+
+def knowledge_base_version() -> str:
+    """Hash of the processed chunks and the mapping DB; recomputed only when either file changes."""
+    global _kb_version
+    files = [paths.PROCESSED_CHUNKS, paths.SQLITE_DB]
+    stamp = tuple(_stamp(f) for f in files)
+    with _kb_lock:
+        if _kb_version is not None and _kb_version[0] == stamp:
+            return _kb_version[1]
+        digest = hashlib.sha256()
+        for f in files:
+            if os.path.exists(f):
+                with open(f, "rb") as fh:
+                    for block in iter(lambda: fh.read(1 << 20), b""):
+                        digest.update(block)
+            digest.update(b"\x00")
+        _kb_version = (stamp, digest.hexdigest()[:16])
+        return _kb_version[1]
+
+
+def _normalize_answer(answer: str) -> str:
+    return " ".join(answer.split())
+
+
+def _stamp(path: str) -> Tuple[Any, ...]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return (path, None, None)
+    return (path, st.st_size, st.st_mtime_ns)
+
+
+class VerifiedAnswerStore:
+    """Human-confirmed answers keyed by normalised-question hash."""
+
+    def __init__(self, db_path: str = paths.REVIEW_DB):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.engine: Engine = create_engine(
+            f"sqlite:///{db_path}", connect_args={"timeout": 30}
+        )
+        self.meta = MetaData()
+        self.answers = Table(
+            "verified_answers",
+            self.meta,
+            Column("question_hash", String, primary_key=True),
+            Column("question", Text),
+            Column("answer", Text, nullable=False),
+            Column("verdict", String, nullable=False),  # "approved" | "corrected"
+            Column("review_item_id", Integer),
+            Column("reviewer", String),
+            Column("reviewer_notes", Text),
+            Column("verified_at", String, nullable=False),
+            Column("hits", Integer, nullable=False, default=0),
+            Column("kb_version", String),
+        )
+        self.meta.create_all(self.engine)
+        self._upgrade_schema()
+
+    def _upgrade_schema(self) -> None:
+        """Add ``kb_version`` to stores created before it; their rows never match."""
+        with self.engine.begin() as conn:
+            cols = {row[1] for row in conn.execute(text("PRAGMA table_info(verified_answers)"))}
+            if "kb_version" not in cols:
+                conn.execute(text("ALTER TABLE verified_answers ADD COLUMN kb_version VARCHAR"))
+
+    def upsert(
+        self,
+        question: str,
+        answer: str,
+        verdict: str,
+        review_item_id: Optional[int] = None,
+        reviewer: Optional[str] = None,
+        notes: Optional[str] = None,
+    ) -> None:
+        """Record (or replace) the verified answer for *question*."""
+        values = {
+            "question_hash": question_hash(question),
+            "question": question,
+            "answer": answer,
+            "verdict": verdict,
+            "review_item_id": review_item_id,
+            "reviewer": reviewer,
+            "reviewer_notes": notes,
+            "verified_at": datetime.now(timezone.utc).isoformat(),
+            "hits": 0,
+            "kb_version": knowledge_base_version(),
+        }
+        stmt = insert(self.answers).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.answers.c.question_hash],
+            set_={k: stmt.excluded[k] for k in values if k != "question_hash"},
+        )
+        with self.engine.begin() as conn:
+            conn.execute(stmt)
+        logger.info("Verified answer recorded for question %s (%s)", values["question_hash"], verdict)
+
+    def lookup(self, question: str) -> Optional[Dict[str, Any]]:
+        """Return the verified answer and its provenance, or None (also when reviewed against another knowledge base)."""
+        qhash = question_hash(question)
+        t = self.answers
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                select(t).where((t.c.question_hash == qhash) & (t.c.kb_version == knowledge_base_version()))
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(update(t).where(t.c.question_hash == qhash).values(hits=t.c.hits + 1))
+        return dict(row._mapping)
+
+    def remove(self, question: str, answer: Optional[str] = None) -> bool:
+        """Delete the entry for *question*; with *answer*, only if it is the stored answer (whitespace-normalised)."""
+        t = self.answers
+        qhash = question_hash(question)
+        with self.engine.begin() as conn:
+            if answer is not None:
+                stored = conn.execute(select(t.c.answer).where(t.c.question_hash == qhash)).scalar()
+                if stored is None or _normalize_answer(stored) != _normalize_answer(answer):
+                    return False
+            result = conn.execute(delete(t).where(t.c.question_hash == qhash))
+        return result.rowcount == 1
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+_store: Optional[VerifiedAnswerStore] = None
+_store_lock = threading.Lock()
+
+
+def get_verified_answers() -> VerifiedAnswerStore:
+    """Return the process-wide verified-answer store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = VerifiedAnswerStore()
+    return _store
@@ -0,0 +1,51 @@
+"""
+Calibration thresholds are checked out of sample, and an artifact that misses
+its recall target on held-out answers is never saved.
+"""
+
+import numpy as np
+import pytest
+
+from src.agents import calibration
+from src.agents.calibration import FEATURES, Calibrator, save, train
+
+
+def _examples(n, separation, seed=0):
+    """*n* reviewed answers, each seen twice in the eval log (same group)."""
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n) < 0.7).astype(np.float64)
+    conf = np.clip(0.6 + separation * (y - 0.5) + rng.normal(0, 0.15, n), 0, 1)
+    X = np.zeros((n, len(FEATURES)))
+    X[:, FEATURES.index("bias")] = 1.0
+    X[:, FEATURES.index("mean_confidence")] = conf
+    X[:, FEATURES.index("min_confidence")] = conf
+    X[:, FEATURES.index("supported_share")] = conf
+    X[:, FEATURES.index("log_claims")] = np.log1p(3)
+    groups = np.repeat(np.arange(n), 2)
+    return X[groups], y[groups], groups, {"reviewed_items": n, "eval_log_runs": 2 * n}
+
+
+def test_noisy_model_is_refused_on_held_out_recall(tmp_path, monkeypatch):
+    X, y, groups, stats = _examples(60, separation=0.1)
+    monkeypatch.setattr(calibration, "labelled_examples", lambda eval_log=None: (X, y, groups, stats))
+    artifact = train(target_recall=0.99)
+
+    # A threshold fit to 99 % recall on the data it was picked on does not hold
+    # on answers the model and threshold never saw, so nothing is written.
+    assert artifact["training"]["heldout_bad_recall"] < 0.99
+    with pytest.raises(ValueError, match="Held-out"):
+        save(artifact, str(tmp_path / "calibration.json"))
+    assert not (tmp_path / "calibration.json").exists()
+
+
+@pytest.mark.parametrize("method", ["logistic", "isotonic"])
+def test_separable_model_is_saved_with_held_out_metrics(tmp_path, monkeypatch, method):
+    X, y, groups, stats = _examples(200, separation=1.0)
+    monkeypatch.setattr(calibration, "labelled_examples", lambda eval_log=None: (X, y, groups, stats))
+    artifact = train(method, target_recall=0.9)
+
+    t = artifact["training"]
+    assert t["folds"] == 5 and t["heldout_bad_recall"] >= 0.9
+    assert t["heldout_reliable_precision"] is None or 0 <= t["heldout_reliable_precision"] <= 1
+    save(artifact, str(tmp_path / "calibration.json"))
+    assert Calibrator.load(str(tmp_path / "calibration.json")).review_below == artifact["review_below"]
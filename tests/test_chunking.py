@@ -0,0 +1,52 @@
+"""
+Chunk ids and section tags belong to the chunk they are written on.
+
+Chunks of one heading used to share a metadata dict, so the last chunk's
+``chunk_id`` / ``sections`` overwrote the earlier ones'.
+"""
+
+import json
+
+from src.config import paths
+from src.rag.pdf_processor import assign_chunk_ids, structure_aware_chunk, tag_sections
+from src.rag.sections import extract_sections
+
+_PAGES = [
+    {
+        "page": 1,
+        "text": "\n\n".join([
+            "Section 302 Murder",
+            "IPC Section 302 maps to BNS Section 103. " * 10,
+            "Attempt to murder was IPC Section 307. " * 10,
+            "Cheating under s. 420 IPC is now BNS 318. " * 10,
+            "X" * 1300,
+            "Section 120-B Criminal conspiracy",
+            "Now BNS Section 61.",
+        ]),
+    },
+    {"page": 2, "text": "No sections cited here.\n\nStill none."},
+]
+
+
+def _chunks():
+    return tag_sections(assign_chunk_ids("test.pdf", structure_aware_chunk(_PAGES, max_chars=500)))
+
+
+def _check(chunks):
+    assert chunks
+    for chunk in chunks:
+        assert chunk["text"]
+        assert chunk["id"] == chunk["metadata"]["chunk_id"]
+        assert chunk["metadata"].get("sections", []) == extract_sections(chunk["text"])
+    assert len({id(c["metadata"]) for c in chunks}) == len(chunks)
+
+
+def test_chunk_metadata_is_per_chunk():
+    chunks = _chunks()
+    _check(chunks)
+    assert len({c["metadata"]["section"] for c in chunks if c["metadata"]["page"] == 1}) == 2
+
+
+def test_processed_chunks_file():
+    with open(paths.PROCESSED_CHUNKS, encoding="utf-8") as f:
+        _check(json.load(f)["chunks"])
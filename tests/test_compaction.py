@@ -0,0 +1,76 @@
+"""
+Compaction keeps the fields re-verification reads and never writes a segment twice.
+"""
+
+import glob
+import json
+import os
+
+from src.agents.reverify import iter_eval_entries
+from src.analytics import compaction
+from src.analytics.compaction import compact_eval_log
+
+
+def _write(path, ids, day):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in ids:
+            f.write(json.dumps({
+                "timestamp": f"2026-10-{day:02d}T12:00:00+00:00",
+                "question": f"q{i}",
+                "llm_answer": [{"type": "text", "text": f"a{i}"}],
+                "claims": [f"claim {i}"],
+                "verifications": [{"claim": f"claim {i}", "status": "supported", "confidence": 0.9, "source": "mixed"}],
+                "overall_status": "reliable",
+            }) + "\n")
+
+
+def _entries(log, dest):
+    return sorted((e["question"], e["llm_answer"], tuple(e["claims"])) for e in iter_eval_entries(log, dest))
+
+
+def test_compaction_round_trip_and_crash_rerun(tmp_path):
+    log, dest = str(tmp_path / "eval_log.jsonl"), str(tmp_path / "parquet")
+    _write(log + ".2", range(4), 17)
+    _write(log + ".1", range(4, 6), 18)
+    before = _entries(log, dest)
+
+    # A run that dies after writing Parquet but before deleting the segments…
+    assert compact_eval_log(log, dest, keep_source=True) == 6
+    # …is not written again by the next run, which only deletes them.
+    assert compact_eval_log(log, dest) == 0
+    assert not glob.glob(log + ".[0-9]*") and not glob.glob(log + ".compacting-*")
+    assert _entries(log, dest) == before
+    assert before[0][1] == "a0"
+
+    # Crash between the partition renames and the marker: rewritten in place.
+    _write(log + ".1", range(6, 8), 19)
+    compact_eval_log(log, dest, keep_source=True)
+    for marker in glob.glob(os.path.join(dest, "_segments", "*")):
+        os.remove(marker)
+    compact_eval_log(log, dest)
+    assert len(_entries(log, dest)) == 8
+
+
+def test_rotation_during_compaction_keeps_new_segment(tmp_path, monkeypatch):
+    log, dest = str(tmp_path / "eval_log.jsonl"), str(tmp_path / "parquet")
+    _write(log + ".2", range(3), 17)
+    _write(log + ".1", range(3, 5), 18)
+    write_segment = compaction._write_segment
+    rotated = []
+
+    def rotate_midway(segment, *args):
+        # The sink rotates (.2 → .3, .1 → .2, active → .1) mid-compaction.
+        if not rotated:
+            for i in (2, 1):
+                if os.path.exists(f"{log}.{i}"):
+                    os.replace(f"{log}.{i}", f"{log}.{i + 1}")
+            _write(log + ".1", range(5, 7), 19)
+            rotated.append(True)
+        return write_segment(segment, *args)
+
+    monkeypatch.setattr(compaction, "_write_segment", rotate_midway)
+    assert compact_eval_log(log, dest) == 5
+    assert glob.glob(log + ".[0-9]*") == [log + ".1"]
+    monkeypatch.undo()
+    assert compact_eval_log(log, dest) == 2
+    assert len(_entries(log, dest)) == 7
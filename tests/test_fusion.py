@@ -0,0 +1,169 @@
+"""
+Property test: the vectorized verifier path matches the per-claim path.
+
+Batched retrieval (``query_many``) is also checked against ``query`` on a
+real Chroma index built with deterministic hashing embeddings.
+
+Random inputs (seeded) are mixed with values sitting exactly on the
+scoring thresholds and confidences a hair away from a 3-decimal rounding
+tie; every array result must equal the scalar one bit for bit.
+"""
+
+import numpy as np
+
+from src.agents.verifier import (
+    _fuse,
+    _relational_only,
+    _vector_verdict,
+    _verify_single_claim,
+    fuse_arrays,
+    summarize_arrays,
+    summarize_verifications,
+    vector_arrays,
+    verify_claims,
+)
+from src.config import paths
+from src.graph.records import ClaimVerdict, Score, Source, Status
+from src.offline import HashingEmbeddings
+from src.rag.vectorstore import IPCBNSRelationalStore, IPCBNSVectorStore
+
+SEED = 20240701
+N = 20_000
+
+REL_CONFS = np.array([0.0, 0.4, 0.7, 0.9])
+EDGE_VALUES = np.array([0.0, 0.25, 0.45, 0.55, 0.7, 0.75, 1.0, 0.0005, 0.1235, 0.6665, 0.7004999999999999])
+
+
+def _confidences(rng: np.random.Generator, n: int) -> np.ndarray:
+    values = rng.random(n)
+    edge = rng.random(n) < 0.3
+    values[edge] = rng.choice(EDGE_VALUES, edge.sum())
+    near_tie = rng.random(n) < 0.1
+    values[near_tie] = (np.floor(values[near_tie] * 1000) + 0.5) / 1000 + rng.normal(0, 1e-15, near_tie.sum())
+    return np.clip(values, 0.0, 1.0)
+
+
+def test_vector_arrays_match_vector_verdict():
+    rng = np.random.default_rng(SEED)
+    dists = 1.0 - _confidences(rng, N)
+    dists[rng.random(N) < 0.05] = np.nan  # no hit
+    dists[rng.random(N) < 0.05] = 1.7  # beyond the clip
+
+    status, sim = vector_arrays(dists)
+    for i, d in enumerate(dists.tolist()):
+        expected = _vector_verdict([] if np.isnan(d) else [("text", {}, d)])
+        assert (Status(int(status[i])), float(sim[i])) == (expected.status, expected.confidence)
+
+
+def test_fuse_arrays_match_fuse():
+    rng = np.random.default_rng(SEED + 1)
+    rel_status = rng.integers(0, 3, N).astype(np.int8)
+    rel_conf = rng.choice(REL_CONFS, N)
+    free = rng.random(N) < 0.5  # relational confidences are fixed in practice; stress anyway
+    rel_conf[free] = _confidences(rng, int(free.sum()))
+    vec_conf = _confidences(rng, N)
+    vec_status = rng.integers(0, 3, N).astype(np.int8)
+
+    status, conf, source = fuse_arrays(rel_status, rel_conf, vec_status, vec_conf)
+    for i in range(N):
+        expected = _fuse(
+            Score(Status(int(rel_status[i])), float(rel_conf[i]), Source.RELATIONAL),
+            Score(Status(int(vec_status[i])), float(vec_conf[i]), Source.VECTOR),
+        )
+        assert (Status(int(status[i])), float(conf[i]), Source(int(source[i]))) == (
+            expected.status, expected.confidence, expected.source
+        ), i
+
+
+def test_round3_matches_relational_only_rounding():
+    rng = np.random.default_rng(SEED + 2)
+    conf = _confidences(rng, N)
+    _, rounded, _ = fuse_arrays(
+        np.full(N, Status.UNCERTAIN, dtype=np.int8), np.zeros(N), np.full(N, Status.UNCERTAIN, dtype=np.int8), conf
+    )
+    for c, r in zip(conf.tolist(), rounded.tolist()):
+        assert r == _relational_only(Score(Status.UNCERTAIN, c, Source.RELATIONAL)).confidence
+
+
+def test_summarize_arrays_match_summarize_verifications():
+    rng = np.random.default_rng(SEED + 3)
+    n_groups = 2_000
+    sizes = rng.integers(0, 12, n_groups)
+    groups = np.repeat(np.arange(n_groups), sizes)
+    status = rng.choice(3, groups.size, p=[0.75, 0.05, 0.2]).astype(np.int8)
+    conf = np.round(_confidences(rng, groups.size), 3)
+
+    finals = summarize_arrays(status, conf, groups, n_groups)
+    start = 0
+    for g, size in enumerate(sizes.tolist()):
+        verdicts = [
+            ClaimVerdict("", Status(int(s)), float(c), Source.MIXED)
+            for s, c in zip(status[start:start + size], conf[start:start + size])
+        ]
+        start += size
+        assert finals[g] == summarize_verifications(verdicts), g
+
+
+class _FakeVectorStore:
+    """Deterministic best-hit distance per claim; no embeddings."""
+
+    def _hits(self, claim: str):
+        h = sum(claim.encode()) % 101
+        if h == 0:
+            return []
+        return [(f"chunk text {h % 7}", {"chunk_id": f"c{h % 7}"}, h / 80.0)]
+
+    def query(self, claim: str, k: int = 5):
+        return self._hits(claim)
+
+    def query_many(self, claims, k: int = 5):
+        return [self._hits(c) for c in claims]
+
+
+class _AsymmetricEmbeddings(HashingEmbeddings):
+    """Documents and queries embed differently, as Gemini's task types do."""
+
+    def embed_documents(self, texts):
+        return super().embed_documents([f"passage {t}" for t in texts])
+
+
+def _real_vector_store(tmp_path):
+    vec = IPCBNSVectorStore(persist_dir=str(tmp_path / "chroma"), embeddings=_AsymmetricEmbeddings())
+    vec.build_from_json(paths.PROCESSED_CHUNKS)
+    return vec
+
+
+def test_query_many_matches_query(tmp_path):
+    vec = _real_vector_store(tmp_path)
+    queries = [
+        "IPC Section 302 corresponds to BNS Section 103.",
+        "Cheating under IPC 420 is now BNS 318.",
+        "The BNS replaced the IPC.",
+        "Criminal conspiracy, IPC 120B.",
+        "Dowry death under IPC 304B.",
+    ]
+    sections = [["302"], ["420"], None, ["120B"], ["9999"]]  # the last matches no chunk: fallback
+    assert vec.query_many(queries, k=3) == [vec.query(q, k=3) for q in queries]
+    assert vec.query_many(queries, k=3, sections=sections) == [
+        vec.query(q, k=3, sections=s) for q, s in zip(queries, sections)
+    ]
+    vec.close()
+
+
+def test_verify_claims_matches_single_claim_path(tmp_path):
+    rel = IPCBNSRelationalStore(":memory:")
+    for ipc, bns in [("302", "101"), ("420", "318"), ("379", "303"), ("120B", "61")]:
+        rel.upsert_mapping(ipc, bns, "")
+    templates = [
+        "IPC Section {ipc} corresponds to BNS Section {bns}.",
+        "IPC Section {ipc} is now BNS Section 999.",
+        "IPC Section 9{ipc} has no direct BNS counterpart ({n}).",
+        "The BNS replaced the IPC ({n}).",
+    ]
+    claims = [
+        templates[i % 4].format(ipc=ipc, bns=bns, n=i)
+        for i, (ipc, bns) in enumerate([("302", "101"), ("420", "318"), ("379", "303"), ("120B", "61")] * 150)
+    ]
+    for vec in (_FakeVectorStore(), _real_vector_store(tmp_path), None):
+        assert verify_claims(claims, rel, vec) == [_verify_single_claim(c, rel, vec) for c in claims]
+    rel.close()
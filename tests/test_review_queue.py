@@ -0,0 +1,25 @@
+"""
+Migrating a legacy JSONL queue twice does not duplicate or re-count items.
+"""
+
+import json
+
+from src.storage.review_queue import ReviewQueue
+
+
+def test_migrate_from_jsonl_is_idempotent(tmp_path):
+    jsonl = tmp_path / "human_review_queue.jsonl"
+    records = [
+        {"question": f"q{i % 3}", "llm_answer": "a", "verifications": [{"status": "unverified"}]}
+        for i in range(5)
+    ]
+    jsonl.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    queue = ReviewQueue(str(tmp_path / "review_queue.db"))
+    try:
+        assert queue.migrate_from_jsonl(str(jsonl)) == 5
+        assert queue.migrate_from_jsonl(str(jsonl)) == 0
+        items = list(queue.iter_items())
+        assert len(items) == 3
+        assert sorted(i["occurrences"] for i in items) == [1, 2, 2]
+    finally:
+        queue.close()
@@ -0,0 +1,46 @@
+"""
+Verified answers are withdrawn when that answer is rejected and tied to the knowledge base they were reviewed against.
+"""
+
+from src.config import paths
+from src.storage import verified_answers
+from src.storage.review_queue import ReviewQueue
+
+_QUESTION = "What is the BNS equivalent of IPC Section 302?"
+
+
+def _enqueue(queue, answer, status="uncertain"):
+    record = {"question": _QUESTION, "llm_answer": answer, "verifications": [{"status": status}]}
+    item_id, _ = queue.enqueue(record)
+    return item_id
+
+
+def test_rejection_and_kb_version(tmp_path, monkeypatch):
+    chunks, mapping = tmp_path / "chunks.json", tmp_path / "mapping.db"
+    chunks.write_text('{"chunks": []}', encoding="utf-8")
+    mapping.write_bytes(b"v1")
+    monkeypatch.setattr(paths, "PROCESSED_CHUNKS", str(chunks))
+    monkeypatch.setattr(paths, "SQLITE_DB", str(mapping))
+    db = str(tmp_path / "review_queue.db")
+    store = verified_answers.VerifiedAnswerStore(db)
+    monkeypatch.setattr(verified_answers, "_store", store)
+    queue = ReviewQueue(db)
+    try:
+        assert queue.resolve(_enqueue(queue, "BNS 103"), "alice", "approved")
+        assert store.lookup(_QUESTION)["answer"] == "BNS 103"
+
+        # Rejecting a different (wrong) answer keeps the approved one.
+        assert queue.resolve(_enqueue(queue, "BNS 101"), "bob", "rejected")
+        assert store.lookup(_QUESTION)["answer"] == "BNS 103"
+
+        # Rejecting the stored answer itself (a new case for it) withdraws it.
+        assert queue.resolve(_enqueue(queue, "BNS  103", "contradicted"), "carol", "rejected")
+        assert store.lookup(_QUESTION) is None
+
+        queue.resolve(_enqueue(queue, "BNS 103."), "alice", "approved")
+        assert store.lookup(_QUESTION) is not None
+        mapping.write_bytes(b"v2, a different size")
+        assert store.lookup(_QUESTION) is None
+    finally:
+        queue.close()
+        store.close()
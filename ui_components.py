@@ -6,6 +6,9 @@ All render functions and custom CSS live here. app.py orchestrates them.
 import json
 import streamlit as st
 
+from src.graph.records import render_evidence
+from src.rag.store_manager import StoreManager
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CSS
@@ -624,6 +627,33 @@ def render_config(settings: dict) -> tuple[str, str]:
     return provider, model or default_model
 
 
+def render_store_status(readiness: dict):
+    """Render the knowledge-base readiness probe in the sidebar."""
+    state = readiness.get("state", "cold")
+    color = {"ready": "#34c759", "warming": "#f2c94c", "failed": "#eb5757"}.get(state, "#7c8091")
+    timings = readiness.get("timings", {})
+    rows = "".join(
+        f"<b>{name.title()}:</b> {'ready' if readiness.get(name) else 'loading…'}"
+        + (f" ({timings[name]:.2f}s)" if name in timings else "")
+        + "<br>"
+        for name in ("relational", "vector")
+    )
+    with st.sidebar:
+        st.markdown(f"""
+        <div style="margin-top:16px;">
+            <div class="section-label">Knowledge Base</div>
+            <div style="font-size:0.75rem; color:#7c8091; line-height:1.8;">
+                <span style="color:{color}; font-weight:600;">{state.upper()}</span><br>
+                {rows}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        if state == "warming":
+            st.caption("Vector index still loading — verification runs relational-only until it is ready.")
+        elif state == "failed":
+            st.caption(f"Vector index failed to load: {readiness.get('error')}")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # PREDEFINED PROMPTS
 # ─────────────────────────────────────────────────────────────────────────────
@@ -807,7 +837,7 @@ def render_metrics(final: dict):
     contradicted = final.get("contradicted_claims", 0)
 
     # Overall verdict badge
-    if overall in ("RELIABLE", "SUPPORTED"):
+    if overall in ("RELIABLE", "SUPPORTED", "HUMAN_VERIFIED"):
         verdict_cls = "verdict-reliable"
         badge_cls = "badge-reliable"
     elif overall in ("UNRELIABLE", "CONTRADICTED"):
@@ -859,12 +889,19 @@ def render_metrics(final: dict):
 # RESULTS TABS
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _fetch_chunks(chunk_ids: list) -> dict:
+    """Chunk text from the vector store for evidence ids missing from the result."""
+    vec = StoreManager().vector
+    return vec.get_chunks(chunk_ids) if vec is not None else {}
+
+
 def render_tabs(result: dict):
-    """Render Summary · Claims · Evidence · Debug tabs."""
+    """Render Summary · Claims · Evidence · Performance · Debug tabs."""
     final = result.get("final_result", {})
+    evidence_table = result.get("evidence") or {}
 
-    tab_summary, tab_claims, tab_evidence, tab_debug = st.tabs(
-        ["Summary", "Claims Breakdown", "Evidence", "Debug Logs"]
+    tab_summary, tab_claims, tab_evidence, tab_perf, tab_debug = st.tabs(
+        ["Summary", "Claims Breakdown", "Evidence", "Performance", "Debug Logs"]
     )
 
     # ── Summary ──────────────────────────────────────────
@@ -934,7 +971,9 @@ def render_tabs(result: dict):
                 """, unsafe_allow_html=True)
 
                 with st.expander(f"View evidence — Claim {i}", expanded=False):
-                    st.markdown(v.get("evidence", "_No evidence available._"))
+                    # Records reference evidence by id; resolve only for display.
+                    text = render_evidence(v, evidence_table, _fetch_chunks)
+                    st.markdown(text or "_No evidence available._")
 
     # ── Evidence / Evaluation ────────────────────────────
     with tab_evidence:
@@ -947,6 +986,7 @@ def render_tabs(result: dict):
             "route": result.get("route"),
             "needs_human": result.get("needs_human"),
             "human_feedback": result.get("human_feedback"),
+            "verified_answer": result.get("metadata", {}).get("verified_answer"),
             "evaluation": result.get("evaluation"),
         }
 
@@ -959,7 +999,107 @@ def render_tabs(result: dict):
                         st.markdown(str(val))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    # ── Performance ──────────────────────────────────────
+    with tab_perf:
+        nodes = result.get("metadata", {}).get("nodes", {})
+        if not nodes:
+            st.markdown("""
+            <div class="ui-card-compact">
+                <span style="font-size:0.82rem; color:#7c8091;">
+                    No timing data recorded for this run.
+                </span>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            ordered = sorted(nodes.items(), key=lambda kv: kv[1].get("started_at", 0))
+            run_start = ordered[0][1].get("started_at", 0)
+            rows = [
+                {
+                    "node": name,
+                    "start (s)": round(n.get("started_at", 0) - run_start, 3),
+                    "duration (s)": n.get("duration_s"),
+                    "model": n.get("model") or "—",
+                    "fallback #": n.get("fallback_index"),
+                    "retries": n.get("retries", 0),
+                    "prompt tokens": n.get("prompt_tokens", 0),
+                    "completion tokens": n.get("completion_tokens", 0),
+                }
+                for name, n in ordered
+            ]
+            st.markdown('<div class="section-label">Per-node latency</div>',
+                        unsafe_allow_html=True)
+            st.bar_chart(rows, x="node", y="duration (s)", horizontal=True)
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+
     # ── Debug Logs ───────────────────────────────────────
     with tab_debug:
         with st.expander("Raw State (JSON)", expanded=False):
             st.json(result)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ANALYTICS DASHBOARD
+# ─────────────────────────────────────────────────────────────────────────────
+
+def render_dashboard(stats: dict):
+    """Render aggregate route/status/confidence/latency stats over the eval log."""
+    rows = stats.get("rows", 0)
+    if not rows:
+        st.markdown("""
+        <div class="ui-card-compact">
+            <span style="font-size:0.82rem; color:#7c8091;">
+                No evaluation records yet — run a few queries first.
+            </span>
+        </div>
+        """, unsafe_allow_html=True)
+        return
+
+    latency = stats.get("latency", {})
+    total = latency.get("total", {})
+    c1, c2, c3, c4 = st.columns(4)
+    for col, label, value in (
+        (c1, "Runs", f"{rows:,}"),
+        (c2, "p50 latency", f"{total['p50']:.1f}s" if total.get("p50") else "—"),
+        (c3, "p95 latency", f"{total['p95']:.1f}s" if total.get("p95") else "—"),
+        (c4, "LLM retries", f"{stats.get('total_retries', 0):,}"),
+    ):
+        with col:
+            st.markdown(f"""
+            <div class="ui-card-compact" style="text-align:center;">
+                <div class="section-label">{label}</div>
+                <div style="font-size:1.5rem; font-weight:700; color:#e8eaed;">{value}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    left, right = st.columns(2)
+    with left:
+        st.markdown('<div class="section-label">Route mix</div>', unsafe_allow_html=True)
+        st.bar_chart(
+            [{"route": k, "runs": v["count"]} for k, v in stats.get("route_mix", {}).items()],
+            x="route", y="runs",
+        )
+    with right:
+        st.markdown('<div class="section-label">Overall status</div>', unsafe_allow_html=True)
+        st.bar_chart(
+            [{"status": k, "runs": v["count"]} for k, v in stats.get("status_distribution", {}).items()],
+            x="status", y="runs",
+        )
+
+    hist = stats.get("confidence_histogram", {})
+    edges, counts = hist.get("edges", []), hist.get("counts", [])
+    st.markdown('<div class="section-label">Average confidence</div>', unsafe_allow_html=True)
+    st.bar_chart(
+        [{"confidence": f"{lo:.2f}", "runs": n} for lo, n in zip(edges, counts)],
+        x="confidence", y="runs",
+    )
+
+    st.markdown('<div class="section-label">Latency percentiles (s)</div>', unsafe_allow_html=True)
+    st.dataframe(
+        [
+            {"stage": name, "samples": v.get("count", 0),
+             **{q: (round(v[q], 3) if v.get(q) is not None else None) for q in ("p50", "p90", "p95", "p99")}}
+            for name, v in latency.items()
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )